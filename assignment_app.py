@@ -4,24 +4,215 @@ Note: the cars are currently approximated by rectangles or circles.
 """
 
 from src import car
-from src import shapes_2d, overlaps_detection
+from src import aabb_tree, broad_phase, collision_stats, parallel
+from src import continuous_detection
+from src import shapes_2d, static_scene, overlaps_detection, union_find
+from src import tiling
 
 
-def get_intersections(cars):
+def get_intersections(cars, method="sweep_and_prune", cell_size=None,
+                      vectorized=False, workers=None, stats=None):
     """
+    The pairs are first filtered by a broad phase on the cars bounding boxes;
+    only the surviving candidates are tested shape by shape.
     :param cars: The list of cars to be tested
-    :return: A list of intersecting cars pairs
+    :param method: The broad phase, either "sweep_and_prune",
+                   "spatial_hash_grid" or "aabb_tree"
+    :param cell_size: The cell size of the spatial hash grid; if not given,
+                      it is chosen from the median car size
+    :param vectorized: If True, the candidate pairs are tested all at once by
+                       the NumPy kernels of shape_store (requires NumPy, and
+                       cars made of circles and rectangles only)
+    :param workers: If greater than one, the candidate pairs are tested by
+                    this many worker processes (cars made of circles and
+                    rectangles only)
+    :param stats: If given, a CollisionStats updated with the time spent in
+                  the bounding boxes (broad phase) and in the narrow phase,
+                  and with the counters of the single-process narrow phase
+    :return: A list of intersecting cars pairs, ordered by the cars indices
     """
+    if vectorized and workers is not None and workers > 1:
+        raise ValueError("The vectorized narrow phase runs on one process")
+
+    if stats is None:
+        return _test_candidate_pairs(
+            cars, _find_candidate_pairs(cars, method, cell_size), vectorized,
+            workers)
+
+    with stats.time_bounding_boxes():
+        candidate_pairs = _find_candidate_pairs(cars, method, cell_size)
+    with collision_stats.collect(stats), stats.time_narrow_phase():
+        return _test_candidate_pairs(cars, candidate_pairs, vectorized,
+                                     workers)
+
+
+def _find_candidate_pairs(cars, method, cell_size):
+    """
+    :return: the sorted index pairs of the cars whose bounding boxes overlap
+    """
+    if method == "sweep_and_prune":
+        return broad_phase.sweep_and_prune(
+            [a_car.bounding_box for a_car in cars])
+    if method == "spatial_hash_grid":
+        return broad_phase.SpatialHashGrid(cars, cell_size).candidate_pairs()
+    if method == "aabb_tree":
+        # Proxy ids are assigned in insertion order, i.e. they match the cars
+        # indices
+        tree = aabb_tree.DynamicAABBTree()
+        for a_car in cars:
+            tree.insert(a_car.bounding_box, a_car)
+        return tree.query_pairs()
+    raise ValueError("Unknown broad phase method: " + str(method))
+
+
+def _test_candidate_pairs(cars, candidate_pairs, vectorized, workers):
+    """
+    :return: the pairs of cars, among the candidate ones, which collide
+    """
+    if workers is not None and workers > 1:
+        return [(cars[i], cars[j]) for i, j in
+                parallel.find_colliding_pairs(cars, candidate_pairs, workers)]
+
+    if vectorized:
+        # NumPy is only needed by the vectorized narrow phase
+        from src import shape_store
+
+        store = shape_store.ShapeStore.from_cars(cars)
+        collide = store.do_these_cars_collide(
+            [pair[0] for pair in candidate_pairs],
+            [pair[1] for pair in candidate_pairs])
+        return [(cars[i], cars[j])
+                for (i, j), do_collide in zip(candidate_pairs, collide)
+                if do_collide]
+
     result = []
+    for i, j in candidate_pairs:
+        if overlaps_detection.do_these_cars_collide(cars[i], cars[j]):
+            result.append((cars[i], cars[j]))
+    return result
+
+
+def iter_intersections(cars, max_pairs=None):
+    """
+    Streaming variant of get_intersections: the intersecting pairs are yielded
+    as soon as the sweep-and-prune finds them, so no list of pairs is ever
+    built. The pairs come in sweep order, not ordered by the cars indices.
+    :param cars: The list of cars to be tested
+    :param max_pairs: If given, stop after yielding this many pairs
+    :return: A generator of intersecting cars pairs
+    """
+    if max_pairs is not None and max_pairs <= 0:
+        return
+
+    found_pairs = 0
+    for i, j in broad_phase.iter_sweep_and_prune(
+            [a_car.bounding_box for a_car in cars]):
+        if overlaps_detection.do_these_cars_collide(cars[i], cars[j]):
+            yield cars[i], cars[j]
+            found_pairs += 1
+            if found_pairs == max_pairs:
+                return
+
+
+def any_collision(cars):
+    """
+    :param cars: The list of cars to be tested
+    :return: True as soon as one intersecting pair is found; False otherwise
+    """
+    return next(iter_intersections(cars, max_pairs=1), None) is not None
+
+
+def get_tiled_intersections(cars, tiles_per_side=2, processes=None,
+                            verify=False):
+    """
+    Variant of get_intersections splitting the scene into spatial tiles, each
+    one handled by an independent job run as a local subprocess; the jobs
+    communicate through files only (see the tiling module)
+    :param cars: The list of cars to be tested, made of circles, rectangles
+                 and oriented rectangles
+    :param tiles_per_side: The number of tiles along x and along y
+    :param processes: The maximum number of jobs running at the same time
+    :param verify: If True, the result is checked against get_intersections
+    :return: A list of intersecting cars pairs, ordered by the cars indices
+    :raise RuntimeError: if a job fails, or if the verification fails
+    """
+    pairs = tiling.find_colliding_pairs(cars, tiles_per_side,
+                                        processes=processes)
+    if verify:
+        car_indices = {id(a_car): index for index, a_car in enumerate(cars)}
+        expected_pairs = [(car_indices[id(first_car)],
+                           car_indices[id(second_car)])
+                          for first_car, second_car in get_intersections(cars)]
+        if pairs != expected_pairs:
+            raise RuntimeError("The tiled result differs from the "
+                               "single-process one")
+    return [(cars[i], cars[j]) for i, j in pairs]
+
+
+def get_collision_clusters(cars, min_size=2):
+    """
+    Group the cars into connected clusters of colliding cars (pile-ups): two
+    cars belong to the same cluster if a chain of colliding pairs links them.
+    The pairs streamed by iter_intersections are merged on the fly, so the
+    list of pairs is never built.
+    :param cars: The list of cars to be tested
+    :param min_size: The minimum number of cars of the returned clusters; by
+                     default, the cars colliding with no other are left out
+    :return: A list of clusters, i.e. lists of cars ordered by the cars
+             indices; the clusters are ordered by their first car
+    """
+    car_indices = {id(a_car): index for index, a_car in enumerate(cars)}
+    clusters = union_find.UnionFind(len(cars))
+    for first_car, second_car in iter_intersections(cars):
+        clusters.union(car_indices[id(first_car)],
+                       car_indices[id(second_car)])
+    return [[cars[index] for index in group]
+            for group in clusters.get_groups(min_size)]
 
-    for i in range(len(cars)):
-        for j in range(len(cars)):
-            if i < j and overlaps_detection.do_these_cars_collide(cars[i],
-                                                                  cars[j]):
-                result.append((cars[i], cars[j]))
+
+def get_proximities(cars, margin):
+    """
+    Margin-aware variant of get_intersections, e.g. for safety alerts: the
+    bounding boxes are inflated by half the margin in the broad phase, and
+    every candidate pair stops at its first pair of shapes closer than margin
+    :param cars: The list of cars to be tested
+    :param margin: The safety distance; with a zero margin, the pairs are
+                   those of get_intersections
+    :return: A list of (car, car, distance) triplets, ordered by the cars
+             indices, for the cars closer than margin; the distance is the
+             one of the first pair of shapes found closer than margin,
+             negative if they overlap
+    """
+    if margin < 0:
+        raise ValueError("Please provide a non-negative margin value")
+
+    result = []
+    for i, j in broad_phase.sweep_and_prune(
+            [aabb_tree.fatten(a_car.bounding_box, margin / 2)
+             for a_car in cars]):
+        distance = overlaps_detection.get_cars_distance_within(
+            cars[i], cars[j], margin)
+        if distance is not None:
+            result.append((cars[i], cars[j], distance))
     return result
 
 
+def get_swept_intersections(cars, displacements):
+    """
+    Continuous variant of get_intersections: the cars move along straight
+    lines during the time step, and the pairs colliding at any time of the
+    step are reported, even if they do not overlap at its start or end
+    :param cars: The list of cars to be tested, at their start position
+    :param displacements: The list of the (x, y) translations of the cars
+                          over the step
+    :return: A list of (car, car, time_of_impact) triplets, ordered by the
+             cars indices; the time of impact is normalized to [0, 1]
+    """
+    return [(cars[i], cars[j], time_of_impact)
+            for i, j, time_of_impact in
+            continuous_detection.get_swept_intersections(cars, displacements)]
+
+
 def print_colliding_cars(cars_pairs):
     """
     :param cars_pairs: The list of cars pairs to be printed
@@ -36,14 +227,43 @@ def print_colliding_cars(cars_pairs):
                   str(intersecting_pair[1].name))
 
 
-def make_cars(cars_specs):
+def make_shapes(shapes_specs):
     """
-    Builds a set of cars as specified in the input parameter:
-        * cars_specs[i] = (car_name, car_shapes_specs)
-        * car_shapes_specs[i] = (shape_type, shape_specs)
+    Builds the shapes of a car:
+        * shapes_specs[i] = (shape_type, shape_specs)
             - shape_type: rectangle => shape_specs: ((center_x, center_y),
                                                       half_width, half_height)
             - shape_type: circle => shape_specs: ((center_x, center_y), radius)
+            - shape_type: oriented_rectangle => shape_specs: ((center_x,
+                  center_y), half_width, half_height, angle), the angle
+                  being in radians
+    :param shapes_specs: The specifications for building the shapes
+    :return: A list of shapes
+    """
+    shapes = []
+    for shape in shapes_specs:
+        if shape[0].lower() == "rectangle":
+            shapes.append(shapes_2d.Rectangle(shape[1][0],
+                                              shape[1][1],
+                                              shape[1][2]))
+        elif shape[0].lower() == "circle":
+            shapes.append(shapes_2d.Circle(shape[1][0],
+                                           shape[1][1]))
+        elif shape[0].lower() == "oriented_rectangle":
+            shapes.append(shapes_2d.OrientedRectangle(shape[1][0],
+                                                      shape[1][1],
+                                                      shape[1][2],
+                                                      shape[1][3]))
+        else:
+            print("Could not determine the type of shape")
+    return shapes
+
+
+def make_cars(cars_specs):
+    """
+    Builds a set of cars as specified in the input parameter:
+        * cars_specs[i] = (car_name, car_shapes_specs)
+        * car_shapes_specs[i] = (shape_type, shape_specs), see make_shapes
     :param cars_specs: The specifications for building the cars
     :return: A list of cars
     """
@@ -53,57 +273,74 @@ def make_cars(cars_specs):
         print("The given specifications do not contain data!")
     else:
         for car_specs in cars_specs:
-            car_name = car_specs[0]
-            car_shapes = []
-            for i in range(1, len(car_specs)):
-                shape = car_specs[i]
-                if shape[0].lower() == "rectangle":
-                    car_shapes.append(shapes_2d.Rectangle(shape[1][0],
-                                                          shape[1][1],
-                                                          shape[1][2]))
-                elif shape[0].lower() == "circle":
-                    car_shapes.append(shapes_2d.Circle(shape[1][0],
-                                                       shape[1][1]))
-                else:
-                    print("Could not determine the type of shape")
-            cars.append(car.Car(car_name, car_shapes))
+            cars.append(car.Car(car_specs[0], make_shapes(car_specs[1:])))
     return cars
 
 
+def make_model_cars(models_specs, cars_placements):
+    """
+    Builds a set of cars sharing the shapes of a few car models:
+        * models_specs[i] = (model_name, model_shapes_specs), with the shapes
+          given in local coordinates as in make_cars
+        * cars_placements[i] = (car_name, model_name, (offset_x, offset_y))
+    :param models_specs: The specifications for building the car models
+    :param cars_placements: The model and position of every car
+    :return: A list of cars
+    """
+    models = {}
+    for model_specs in models_specs:
+        models[model_specs[0]] = car.CarModel(model_specs[0],
+                                              make_shapes(model_specs[1:]))
+
+    return [car.ModelCar(car_name, models[model_name], offset)
+            for car_name, model_name, offset in cars_placements]
+
+
+def make_static_scene(cars_specs):
+    """
+    Builds the static part of a scene (walls, pillars, parked cars), compiled
+    once and then queried every frame with the moving cars only
+    :param cars_specs: The specifications of the static cars, see make_cars
+    :return: A StaticScene
+    """
+    return static_scene.StaticScene(make_cars(cars_specs))
+
+
 # ============================================================================
 # EXAMPLE: Here three cars are constructed from the user specifications given
 #          in the_cars_specs. Later, the collision state for these cars is
 #          checked and the possible colliding cars names are printed.
 
-# Get a bunch of cars
-the_cars_specs = [
-    ("Fiat",
-     ("rectangle", ((2, 2), 1, 1)),
-     ("rectangle", ((3, 1), 3, 1)),
-     ("circle", ((0, 0), 1)),
-     ("circle", ((5, 0), 1))),
-    ("Maserati",
-     ("rectangle", ((10, 2), 1, 1)),
-     ("rectangle", ((11, 1), 3, 1)),
-     ("circle", ((8, 0), 1)),
-     ("circle", ((13, 0), 1))),
-    ("Ferrari",
-     ("rectangle", ((13, 2), 1, 1)),
-     ("rectangle", ((14, 1), 3, 1)),
-     ("circle", ((11, 0), 1)),
-     ("circle", ((17, 0), 1))),
-    ("Lamborghini",
-     ("rectangle", ((19, 2), 1, 1)),
-     ("rectangle", ((20, 1), 3, 1)),
-     ("circle", ((17, 0), 1)),
-     ("circle", ((23, 0), 1))),
-                 ]
-
-# Make the cars
-the_cars = make_cars(the_cars_specs)
-
-# Get colliding cars
-intersecting_cars = get_intersections(the_cars)
-
-# Print colliding cars
-print_colliding_cars(intersecting_cars)
+if __name__ == "__main__":
+    # Get a bunch of cars
+    the_cars_specs = [
+        ("Fiat",
+         ("rectangle", ((2, 2), 1, 1)),
+         ("rectangle", ((3, 1), 3, 1)),
+         ("circle", ((0, 0), 1)),
+         ("circle", ((5, 0), 1))),
+        ("Maserati",
+         ("rectangle", ((10, 2), 1, 1)),
+         ("rectangle", ((11, 1), 3, 1)),
+         ("circle", ((8, 0), 1)),
+         ("circle", ((13, 0), 1))),
+        ("Ferrari",
+         ("rectangle", ((13, 2), 1, 1)),
+         ("rectangle", ((14, 1), 3, 1)),
+         ("circle", ((11, 0), 1)),
+         ("circle", ((17, 0), 1))),
+        ("Lamborghini",
+         ("rectangle", ((19, 2), 1, 1)),
+         ("rectangle", ((20, 1), 3, 1)),
+         ("circle", ((17, 0), 1)),
+         ("circle", ((23, 0), 1))),
+                     ]
+
+    # Make the cars
+    the_cars = make_cars(the_cars_specs)
+
+    # Get colliding cars
+    intersecting_cars = get_intersections(the_cars)
+
+    # Print colliding cars
+    print_colliding_cars(intersecting_cars)
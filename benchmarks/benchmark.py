@@ -0,0 +1,211 @@
+"""
+Reproducible benchmarks for the collision detection. Synthetic scenes are
+generated from a seed in the specification format accepted by make_cars, then
+make_cars, get_intersections and the OverlappingShapesDetector kernels are
+timed, and the memory held by the cars is measured. The results are printed as
+JSON, e.g.:
+
+    $ python3 -m benchmarks.benchmark --cars 2000 --density 0.05
+"""
+
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import assignment_app
+from src import shapes_2d, overlaps_detection
+
+
+def generate_scene_specs(number_of_cars, density=0.05, shapes_per_car=4,
+                         circle_fraction=0.5, seed=0):
+    """
+    Cars are placed uniformly at random over a square lot; each car is made of
+    shapes scattered within a 5 x 2.5 footprint around its position.
+    :param number_of_cars: the number of cars in the scene
+    :param density: the number of cars per unit area of the lot
+    :param shapes_per_car: the number of shapes of every car
+    :param circle_fraction: the probability of a shape being a circle
+    :param seed: the seed of the random generator
+    :return: the cars specifications, see assignment_app.make_cars
+    """
+    if density <= 0:
+        raise ValueError("Please provide a positive density value")
+    random_generator = random.Random(seed)
+    lot_side = math.sqrt(number_of_cars / density)
+
+    cars_specs = []
+    for car_index in range(number_of_cars):
+        x = random_generator.uniform(0, lot_side)
+        y = random_generator.uniform(0, lot_side)
+        car_specs = ["car_" + str(car_index)]
+        for _ in range(shapes_per_car):
+            center = (x + random_generator.uniform(-1.5, 1.5),
+                      y + random_generator.uniform(-0.5, 0.5))
+            if random_generator.random() < circle_fraction:
+                car_specs.append(("circle", (center,
+                                             random_generator.uniform(0.3,
+                                                                      0.8))))
+            else:
+                car_specs.append(("rectangle",
+                                  (center, random_generator.uniform(0.5, 1.0),
+                                   random_generator.uniform(0.3, 0.75))))
+        cars_specs.append(tuple(car_specs))
+    return cars_specs
+
+
+def time_function(function, repeat):
+    """
+    :return: the best wall time, in seconds, of the given number of calls
+    """
+    best_time = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best_time = min(best_time, time.perf_counter() - start)
+    return best_time
+
+
+def measure_memory(cars_specs):
+    """
+    Measure the memory allocated by make_cars and still held by the cars, i.e.
+    the cars, their shapes and the coordinates of the shapes
+    :return: a dictionary with the bytes per car and per shape
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        cars = assignment_app.make_cars(cars_specs)
+        allocated_bytes = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    number_of_shapes = sum(len(a_car.shapes) for a_car in cars)
+    return {"bytes_per_car": allocated_bytes / max(len(cars), 1),
+            "bytes_per_shape": allocated_bytes / max(number_of_shapes, 1)}
+
+
+def get_intersections_exhaustively(cars):
+    """
+    Baseline: the quadratic loop over every pair of cars
+    """
+    return [(cars[i], cars[j])
+            for i in range(len(cars)) for j in range(i + 1, len(cars))
+            if overlaps_detection.do_these_cars_collide(cars[i], cars[j])]
+
+
+def time_kernels(cars, number_of_pairs, repeat, seed):
+    """
+    Time do_these_two_shapes_overlap on random shape pairs of every kind
+    :return: a dictionary with the time per call, in seconds, by pair kind
+    """
+    random_generator = random.Random(seed)
+    circles = [shape for a_car in cars for shape in a_car.shapes
+               if type(shape) == shapes_2d.Circle]
+    rectangles = [shape for a_car in cars for shape in a_car.shapes
+                  if type(shape) == shapes_2d.Rectangle]
+    shapes_by_kind = {"circle/circle": (circles, circles),
+                      "rectangle/rectangle": (rectangles, rectangles),
+                      "circle/rectangle": (circles, rectangles)}
+
+    result = {}
+    for kind, (first_shapes, second_shapes) in shapes_by_kind.items():
+        if len(first_shapes) == 0 or len(second_shapes) == 0:
+            continue
+        pairs = [(random_generator.choice(first_shapes),
+                  random_generator.choice(second_shapes))
+                 for _ in range(number_of_pairs)]
+
+        def run_kernel():
+            for first_shape, second_shape in pairs:
+                overlaps_detection.OverlappingShapesDetector.\
+                    do_these_two_shapes_overlap(first_shape, second_shape)
+
+        result[kind] = time_function(run_kernel, repeat) / number_of_pairs
+    return result
+
+
+def run_benchmarks(number_of_cars, density=0.05, shapes_per_car=4,
+                   circle_fraction=0.5, seed=0, repeat=3,
+                   methods=("sweep_and_prune",), vectorized=False,
+                   kernel_pairs=10000):
+    """
+    :param methods: the broad phase methods of get_intersections to be timed;
+                    "exhaustive" times the quadratic baseline loop
+    :param vectorized: if True, every method is also timed with the NumPy
+                       narrow phase
+    :return: a JSON-serializable dictionary with the scene parameters and the
+             measured times, in seconds
+    """
+    cars_specs = generate_scene_specs(number_of_cars, density, shapes_per_car,
+                                      circle_fraction, seed)
+    cars = assignment_app.make_cars(cars_specs)
+
+    engines = {}
+    for method in methods:
+        if method == "exhaustive":
+            engines[method] = lambda: get_intersections_exhaustively(cars)
+            continue
+        engines[method] = (lambda method=method: assignment_app.
+                           get_intersections(cars, method=method))
+        if vectorized:
+            engines[method + "+vectorized"] = (
+                lambda method=method: assignment_app.get_intersections(
+                    cars, method=method, vectorized=True))
+
+    intersections = {}
+    for engine, get_pairs in engines.items():
+        intersections[engine] = {"seconds": time_function(get_pairs, repeat),
+                                 "pairs": len(get_pairs())}
+
+    return {"scene": {"cars": number_of_cars, "density": density,
+                      "shapes_per_car": shapes_per_car,
+                      "circle_fraction": circle_fraction, "seed": seed},
+            "environment": {"python": platform.python_version(),
+                            "machine": platform.machine()},
+            "make_cars": {"seconds": time_function(
+                lambda: assignment_app.make_cars(cars_specs), repeat)},
+            "memory": measure_memory(cars_specs),
+            "get_intersections": intersections,
+            "kernels": {"seconds_per_call": time_kernels(
+                cars, kernel_pairs, repeat, seed)}}
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cars", type=int, default=1000)
+    parser.add_argument("--density", type=float, default=0.05)
+    parser.add_argument("--shapes-per-car", type=int, default=4)
+    parser.add_argument("--circle-fraction", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--kernel-pairs", type=int, default=10000)
+    parser.add_argument("--methods", nargs="+", default=["sweep_and_prune"],
+                        choices=["exhaustive", "sweep_and_prune",
+                                 "spatial_hash_grid", "aabb_tree"])
+    parser.add_argument("--vectorized", action="store_true",
+                        help="also time the NumPy narrow phase")
+    parser.add_argument("--output", help="write the JSON results to a file")
+    arguments = parser.parse_args(arguments)
+
+    results = run_benchmarks(arguments.cars, arguments.density,
+                             arguments.shapes_per_car,
+                             arguments.circle_fraction, arguments.seed,
+                             arguments.repeat, arguments.methods,
+                             arguments.vectorized, arguments.kernel_pairs)
+    if arguments.output:
+        with open(arguments.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+"""
+This module provides a dynamic bounding volume hierarchy of axis aligned
+bounding boxes. Every leaf stores a box fattened by a margin, so that a moving
+item needs to be re-inserted only when it leaves its fat box. The tree is kept
+balanced by rotations, which keeps insertions, removals and moves O(log n).
+"""
+
+from src import broad_phase
+
+
+def get_union(first_box, second_box):
+    """
+    :return: the smallest bounding box enclosing both the given boxes
+    """
+    return ((min(first_box[0][0], second_box[0][0]),
+             min(first_box[0][1], second_box[0][1])),
+            (max(first_box[1][0], second_box[1][0]),
+             max(first_box[1][1], second_box[1][1])))
+
+
+def get_perimeter(box):
+    """
+    :return: the perimeter of the given bounding box
+    """
+    return 2 * ((box[1][0] - box[0][0]) + (box[1][1] - box[0][1]))
+
+
+def does_the_box_contain(outer_box, inner_box):
+    """
+    :return: True if the first given bounding box encloses the second one
+    """
+    return (outer_box[0][0] <= inner_box[0][0] and
+            outer_box[0][1] <= inner_box[0][1] and
+            inner_box[1][0] <= outer_box[1][0] and
+            inner_box[1][1] <= outer_box[1][1])
+
+
+def fatten(box, margin):
+    """
+    :return: the given bounding box enlarged by margin on every side
+    """
+    return ((box[0][0] - margin, box[0][1] - margin),
+            (box[1][0] + margin, box[1][1] + margin))
+
+
+class _TreeNode:
+    """
+    Node of the tree. Leaves carry a proxy id; internal nodes have exactly two
+    children and a box enclosing the boxes of both.
+    """
+
+    def __init__(self, box, proxy_id=None):
+        self.box = box
+        self.proxy_id = proxy_id
+        self.parent = None
+        self.left = None
+        self.right = None
+        self.height = 0
+
+    @property
+    def is_leaf(self):
+        return self.left is None
+
+
+class DynamicAABBTree:
+    """
+    Class defining a dynamic AABB tree. Items are referred to by the proxy id
+    returned on insertion.
+    """
+
+    def __init__(self, margin=0.0):
+        """
+        :param margin: the amount each bounding box is fattened by when stored
+                       in the tree
+        """
+        if margin < 0:
+            raise ValueError("Please provide a non-negative margin value")
+        self._margin = margin
+        self._root = None
+        self._leaves = {}
+        self._items = {}
+        self._boxes = {}
+        self._next_proxy_id = 0
+
+    @property
+    def margin(self):
+        return self._margin
+
+    @property
+    def height(self):
+        return -1 if self._root is None else self._root.height
+
+    def __len__(self):
+        return len(self._leaves)
+
+    def __contains__(self, proxy_id):
+        return proxy_id in self._leaves
+
+    def insert(self, bounding_box, item=None):
+        """
+        :param bounding_box: the tight bounding box ((min_x, min_y),
+                             (max_x, max_y)) of the item
+        :param item: the object to be associated with the box, e.g. a car
+        :return: the proxy id of the inserted item
+        """
+        proxy_id = self._next_proxy_id
+        self._next_proxy_id += 1
+
+        leaf = _TreeNode(fatten(bounding_box, self._margin), proxy_id)
+        self._leaves[proxy_id] = leaf
+        self._items[proxy_id] = item
+        self._boxes[proxy_id] = bounding_box
+        self.__insert_leaf(leaf)
+        return proxy_id
+
+    def remove(self, proxy_id):
+        """
+        :param proxy_id: the proxy id of the item to be removed
+        """
+        leaf = self._leaves.pop(proxy_id)
+        del self._items[proxy_id]
+        del self._boxes[proxy_id]
+        self.__remove_leaf(leaf)
+
+    def move(self, proxy_id, bounding_box):
+        """
+        :param proxy_id: the proxy id of the moved item
+        :param bounding_box: the new tight bounding box of the item
+        :return: True if the item left its fat box and was re-inserted
+        """
+        self._boxes[proxy_id] = bounding_box
+        leaf = self._leaves[proxy_id]
+        if does_the_box_contain(leaf.box, bounding_box):
+            return False
+
+        self.__remove_leaf(leaf)
+        leaf.box = fatten(bounding_box, self._margin)
+        self.__insert_leaf(leaf)
+        return True
+
+    def get_item(self, proxy_id):
+        return self._items[proxy_id]
+
+    def get_bounding_box(self, proxy_id):
+        """
+        :return: the tight bounding box of the given item
+        """
+        return self._boxes[proxy_id]
+
+    def get_fat_bounding_box(self, proxy_id):
+        return self._leaves[proxy_id].box
+
+    def query(self, bounding_box):
+        """
+        :return: the sorted proxy ids of the items whose tight bounding box
+                 overlaps (or touches) the given one
+        """
+        result = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            if not broad_phase.do_these_bounding_boxes_overlap(node.box,
+                                                               bounding_box):
+                continue
+            if node.is_leaf:
+                if broad_phase.do_these_bounding_boxes_overlap(
+                        self._boxes[node.proxy_id], bounding_box):
+                    result.append(node.proxy_id)
+            else:
+                stack.append(node.left)
+                stack.append(node.right)
+        result.sort()
+        return result
+
+    def query_pairs(self, proxy_ids=None):
+        """
+        :param proxy_ids: if given, only the pairs involving at least one of
+                          these items are returned, e.g. the moved ones
+        :return: the sorted list of proxy id pairs (i, j), with i < j, whose
+                 tight bounding boxes overlap (or touch)
+        """
+        if proxy_ids is None:
+            proxy_ids = self._leaves.keys()
+            only_larger_ids = True
+        else:
+            only_larger_ids = False
+
+        pairs = set()
+        for proxy_id in proxy_ids:
+            for other_id in self.query(self._boxes[proxy_id]):
+                if other_id == proxy_id or (only_larger_ids and
+                                            other_id < proxy_id):
+                    continue
+                pairs.add((min(proxy_id, other_id), max(proxy_id, other_id)))
+        return sorted(pairs)
+
+    def __insert_leaf(self, leaf):
+        if self._root is None:
+            self._root = leaf
+            leaf.parent = None
+            return
+
+        # Find the best sibling by descending the tree with the perimeter
+        # heuristic: stop where creating a new parent is cheaper than going
+        # down any child.
+        sibling = self._root
+        while not sibling.is_leaf:
+            combined_perimeter = get_perimeter(get_union(sibling.box,
+                                                         leaf.box))
+            cost = 2 * combined_perimeter
+            inheritance_cost = 2 * (combined_perimeter -
+                                    get_perimeter(sibling.box))
+
+            left_cost = self.__get_descent_cost(sibling.left, leaf.box,
+                                                inheritance_cost)
+            right_cost = self.__get_descent_cost(sibling.right, leaf.box,
+                                                 inheritance_cost)
+            if cost < left_cost and cost < right_cost:
+                break
+            sibling = sibling.left if left_cost < right_cost else \
+                sibling.right
+
+        old_parent = sibling.parent
+        new_parent = _TreeNode(get_union(sibling.box, leaf.box))
+        new_parent.parent = old_parent
+        new_parent.height = sibling.height + 1
+        new_parent.left = sibling
+        new_parent.right = leaf
+        sibling.parent = new_parent
+        leaf.parent = new_parent
+
+        if old_parent is None:
+            self._root = new_parent
+        elif old_parent.left is sibling:
+            old_parent.left = new_parent
+        else:
+            old_parent.right = new_parent
+
+        self.__refit(new_parent.parent)
+
+    @staticmethod
+    def __get_descent_cost(child, box, inheritance_cost):
+        union_perimeter = get_perimeter(get_union(child.box, box))
+        if child.is_leaf:
+            return union_perimeter + inheritance_cost
+        return (union_perimeter - get_perimeter(child.box) +
+                inheritance_cost)
+
+    def __remove_leaf(self, leaf):
+        if leaf is self._root:
+            self._root = None
+            return
+
+        parent = leaf.parent
+        grandparent = parent.parent
+        sibling = parent.right if parent.left is leaf else parent.left
+
+        if grandparent is None:
+            self._root = sibling
+            sibling.parent = None
+        else:
+            if grandparent.left is parent:
+                grandparent.left = sibling
+            else:
+                grandparent.right = sibling
+            sibling.parent = grandparent
+            self.__refit(grandparent)
+        leaf.parent = None
+
+    def __refit(self, node):
+        """
+        Walk back to the root rebalancing and updating boxes and heights
+        """
+        while node is not None:
+            node = self.__balance(node)
+            node.height = 1 + max(node.left.height, node.right.height)
+            node.box = get_union(node.left.box, node.right.box)
+            node = node.parent
+
+    def __balance(self, node):
+        """
+        Rotate the taller child up if the subtree under node is unbalanced
+        :return: the root of the (possibly rotated) subtree
+        """
+        if node.is_leaf or node.height < 2:
+            return node
+
+        balance = node.right.height - node.left.height
+        if balance > 1:
+            return self.__rotate(node, node.right)
+        if balance < -1:
+            return self.__rotate(node, node.left)
+        return node
+
+    def __rotate(self, node, child):
+        """
+        Swap node with its given child; the taller grandchild stays under
+        child while the shorter one replaces child under node.
+        """
+        first_grandchild = child.left
+        second_grandchild = child.right
+
+        child.parent = node.parent
+        node.parent = child
+        if child.parent is None:
+            self._root = child
+        elif child.parent.left is node:
+            child.parent.left = child
+        else:
+            child.parent.right = child
+
+        if first_grandchild.height > second_grandchild.height:
+            taller, shorter = first_grandchild, second_grandchild
+        else:
+            taller, shorter = second_grandchild, first_grandchild
+
+        if child is node.right:
+            child.left = node
+            child.right = taller
+            node.right = shorter
+        else:
+            child.right = node
+            child.left = taller
+            node.left = shorter
+        shorter.parent = node
+        taller.parent = child
+
+        node.box = get_union(node.left.box, node.right.box)
+        node.height = 1 + max(node.left.height, node.right.height)
+        child.box = get_union(child.left.box, child.right.box)
+        child.height = 1 + max(child.left.height, child.right.height)
+        return child
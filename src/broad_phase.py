@@ -0,0 +1,197 @@
+"""
+This module provides the broad phase of the collision detection. Given the axis
+aligned bounding boxes of a set of cars, it cheaply discards the pairs whose
+boxes cannot overlap, so that only the remaining candidate pairs need to be
+checked shape by shape (narrow phase).
+"""
+
+import math
+
+
+def do_these_bounding_boxes_overlap(first_box, second_box):
+    """
+    Bounding boxes are given as ((min_x, min_y), (max_x, max_y)). Touching
+    boxes are reported as overlapping: the broad phase must never discard a
+    pair which the narrow phase would accept.
+    :return: True if the two given bounding boxes overlap or touch
+    """
+    return (first_box[0][0] <= second_box[1][0] and
+            second_box[0][0] <= first_box[1][0] and
+            first_box[0][1] <= second_box[1][1] and
+            second_box[0][1] <= first_box[1][1])
+
+
+def iter_sweep_and_prune(bounding_boxes):
+    """
+    Sort-and-sweep along the x-axis: the boxes are visited by increasing min_x
+    while an active list keeps the boxes whose x-extent still reaches the
+    current one. Only the boxes in the active list are candidates. The pairs
+    are yielded as soon as they are found, hence in sweep order.
+    :param bounding_boxes: list of bounding boxes ((min_x, min_y),
+                           (max_x, max_y))
+    :return: a generator of index pairs (i, j), with i < j, whose bounding
+             boxes overlap
+    """
+    order = sorted(range(len(bounding_boxes)),
+                   key=lambda index: bounding_boxes[index][0][0])
+
+    active = []
+    for index in order:
+        box = bounding_boxes[index]
+        # Drop the boxes ending before the current one starts
+        active = [other for other in active
+                  if bounding_boxes[other][1][0] >= box[0][0]]
+        for other in active:
+            other_box = bounding_boxes[other]
+            if box[0][1] <= other_box[1][1] and other_box[0][1] <= box[1][1]:
+                yield (other, index) if other < index else (index, other)
+        active.append(index)
+
+
+def sweep_and_prune(bounding_boxes):
+    """
+    :param bounding_boxes: list of bounding boxes ((min_x, min_y),
+                           (max_x, max_y))
+    :return: the sorted list of index pairs (i, j), with i < j, whose bounding
+             boxes overlap
+    """
+    return sorted(iter_sweep_and_prune(bounding_boxes))
+
+
+class SpatialHashGrid:
+    """
+    Uniform grid index bucketing cars by the cells covered by their bounding
+    box. Two cars can only overlap if they share at least one cell, hence each
+    car is tested only against the cars stored in its own cells.
+
+    A car spanning more than max_cells_per_side columns or rows would fill
+    too many cells (a 10000x10000 static object covers millions of them): it
+    is kept in a separate list of oversized cars instead, whose bounding boxes
+    are tested against those of all the other cars.
+    """
+
+    max_cells_per_side = 16
+
+    def __init__(self, cars=(), cell_size=None):
+        """
+        :param cars: the cars to be indexed
+        :param cell_size: the edge length of the square cells; if not given,
+                          it is chosen from the median size of the given cars
+        """
+        cars = list(cars)
+        bounding_boxes = [a_car.bounding_box for a_car in cars]
+        if cell_size is None:
+            cell_size = SpatialHashGrid.choose_cell_size(bounding_boxes)
+        elif cell_size <= 0:
+            raise ValueError("Please provide a positive cell_size value")
+
+        self._cell_size = cell_size
+        self._cars = []
+        self._bounding_boxes = []
+        self._cells = {}
+        self._oversized_cars = []
+        for a_car, bounding_box in zip(cars, bounding_boxes):
+            self.__insert(a_car, bounding_box)
+
+    @staticmethod
+    def choose_cell_size(bounding_boxes):
+        """
+        :param bounding_boxes: list of bounding boxes ((min_x, min_y),
+                               (max_x, max_y))
+        :return: the median of the largest extent of the given boxes, so that
+                 a typical car covers a handful of cells
+        """
+        extents = sorted(max(box[1][0] - box[0][0], box[1][1] - box[0][1])
+                         for box in bounding_boxes
+                         if math.isfinite(box[0][0]))
+        if len(extents) == 0 or extents[len(extents) // 2] <= 0:
+            return 1.0
+        return extents[len(extents) // 2]
+
+    @property
+    def cell_size(self):
+        return self._cell_size
+
+    @property
+    def cars(self):
+        return self._cars
+
+    @property
+    def oversized_cars(self):
+        """
+        :return: the indices of the cars stored outside of the cells
+        """
+        return self._oversized_cars
+
+    def insert(self, a_car):
+        """
+        :param a_car: the car to be added to the index
+        :return: the index of the car within this grid
+        """
+        return self.__insert(a_car, a_car.bounding_box)
+
+    def get_cells(self, bounding_box):
+        """
+        :return: the list of the (column, row) cells covered by the given
+                 bounding box
+        """
+        if not math.isfinite(bounding_box[0][0]):
+            return []
+        min_column = math.floor(bounding_box[0][0] / self._cell_size)
+        min_row = math.floor(bounding_box[0][1] / self._cell_size)
+        max_column = math.floor(bounding_box[1][0] / self._cell_size)
+        max_row = math.floor(bounding_box[1][1] / self._cell_size)
+        return [(column, row)
+                for column in range(min_column, max_column + 1)
+                for row in range(min_row, max_row + 1)]
+
+    def get_cars_in_cell(self, cell):
+        """
+        :return: the indices of the cars covering the given cell, oversized
+                 cars excluded
+        """
+        return self._cells.get(cell, [])
+
+    def candidate_pairs(self):
+        """
+        :return: the sorted list of index pairs (i, j), with i < j, of the cars
+                 sharing at least one cell, and of the oversized cars and the
+                 cars whose bounding boxes overlap theirs
+        """
+        pairs = set()
+        for cars_in_cell in self._cells.values():
+            for i in range(len(cars_in_cell)):
+                for j in range(i + 1, len(cars_in_cell)):
+                    pairs.add((cars_in_cell[i], cars_in_cell[j]))
+
+        for oversized_index in self._oversized_cars:
+            oversized_box = self._bounding_boxes[oversized_index]
+            for car_index, bounding_box in enumerate(self._bounding_boxes):
+                if car_index != oversized_index and \
+                        do_these_bounding_boxes_overlap(oversized_box,
+                                                        bounding_box):
+                    pairs.add((min(car_index, oversized_index),
+                               max(car_index, oversized_index)))
+        return sorted(pairs)
+
+    def __insert(self, a_car, bounding_box):
+        car_index = len(self._cars)
+        self._cars.append(a_car)
+        self._bounding_boxes.append(bounding_box)
+        if self.__is_oversized(bounding_box):
+            self._oversized_cars.append(car_index)
+            return car_index
+        for cell in self.get_cells(bounding_box):
+            self._cells.setdefault(cell, []).append(car_index)
+        return car_index
+
+    def __is_oversized(self, bounding_box):
+        """
+        :return: True if the given bounding box spans more than
+                 max_cells_per_side columns or rows
+        """
+        if not math.isfinite(bounding_box[0][0]):
+            return False
+        return max(bounding_box[1][0] - bounding_box[0][0],
+                   bounding_box[1][1] - bounding_box[0][1]) > \
+            self.max_cells_per_side * self._cell_size
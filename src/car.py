@@ -2,16 +2,26 @@
 This module provides an implementation of a car class.
 """
 
+import math
+from src import shapes_2d
+
 
 class Car:
     """
     Class defining a car. Each car is composed by a bunch of 2D shapes. This
     class provides a method to detect if 'self' collides with another car.
+    The composite shape and the bounding box of the car are cached; they are
+    recomputed only after the shapes change, which also increments the car
+    version.
     """
 
+    __slots__ = ("_name", "_shapes", "_version", "_composite")
+
     def __init__(self, name, shapes):
         self._name = name
-        self._shapes = shapes
+        self._shapes = tuple(shapes)
+        self._version = 0
+        self._composite = None
 
     @property
     def shapes(self):
@@ -20,3 +30,206 @@ class Car:
     @property
     def name(self):
         return self._name
+
+    @property
+    def version(self):
+        """
+        :return: a counter incremented every time the shapes change
+        """
+        return self._version
+
+    @property
+    def offset(self):
+        """
+        :return: the translation from the local coordinates of local_composite
+                 to world coordinates; the shapes of a plain car are given in
+                 world coordinates
+        """
+        return 0, 0
+
+    @property
+    def local_composite(self):
+        """
+        :return: the composite shape of the car in local coordinates
+        """
+        return self.composite
+
+    @property
+    def composite(self):
+        """
+        :return: the composite shape made of the car shapes
+        """
+        if self._composite is None:
+            self._composite = shapes_2d.CompositeShape(self.shapes)
+        return self._composite
+
+    @property
+    def bounding_box(self):
+        """
+        :return: the axis aligned bounding box ((min_x, min_y), (max_x, max_y))
+                 of the car
+        """
+        return self.composite.get_bounding_box()
+
+    def set_shapes(self, shapes):
+        """
+        :param shapes: the new shapes of the car
+        """
+        self._shapes = tuple(shapes)
+        self._invalidate()
+
+    def add_shape(self, shape):
+        """
+        :param shape: the shape to be added to the car
+        """
+        self._shapes += (shape,)
+        self._invalidate()
+
+    def _invalidate(self):
+        self._version += 1
+        self._composite = None
+
+
+class CarModel:
+    """
+    Class defining a car model, i.e. a template of shapes given in local
+    coordinates and shared by all the cars of that model. The local bounding
+    box and bounding circle are computed once per model.
+    """
+
+    __slots__ = ("_name", "_composite", "_bounding_circle")
+
+    def __init__(self, name, shapes):
+        """
+        :param name: the name of the model
+        :param shapes: the shapes of the model, in local coordinates
+        """
+        self._name = name
+        self._composite = shapes_2d.CompositeShape(shapes)
+        self._bounding_circle = self.__compute_bounding_circle()
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def shapes(self):
+        return self._composite.shapes
+
+    @property
+    def composite(self):
+        return self._composite
+
+    @property
+    def bounding_box(self):
+        """
+        :return: the local bounding box ((min_x, min_y), (max_x, max_y))
+        """
+        return self._composite.get_bounding_box()
+
+    @property
+    def bounding_circle(self):
+        """
+        :return: the local bounding circle (center, radius), centered on the
+                 bounding box; overlaps_detection tests it before the shapes
+                 of two cars made from models
+        """
+        return self._bounding_circle
+
+    def __compute_bounding_circle(self):
+        if len(self.shapes) == 0:
+            return (0, 0), 0
+        box = self.bounding_box
+        center = ((box[0][0] + box[1][0]) / 2, (box[0][1] + box[1][1]) / 2)
+        radius = 0
+        for shape in self.shapes:
+            if isinstance(shape, shapes_2d.Circle):
+                radius = max(radius, math.hypot(shape.center[0] - center[0],
+                                                shape.center[1] - center[1]) +
+                             shape.radius)
+            else:
+                # Farthest corner of the shape bounding box
+                shape_box = shape.get_bounding_box()
+                radius = max(radius, math.hypot(
+                    max(abs(shape_box[0][0] - center[0]),
+                        abs(shape_box[1][0] - center[0])),
+                    max(abs(shape_box[0][1] - center[1]),
+                        abs(shape_box[1][1] - center[1]))))
+        return center, radius
+
+
+class ModelCar(Car):
+    """
+    Class defining a car instance of a CarModel. Only the model reference and
+    the offset of the car are stored: the collision detection works on the
+    model shapes translated on the fly, while the world-space shapes are built
+    anew, and not kept, every time the shapes property is accessed.
+    """
+
+    __slots__ = ("_model", "_offset", "_bounding_box")
+
+    def __init__(self, name, model, offset):
+        """
+        :param name: the name of the car
+        :param model: the CarModel of the car
+        :param offset: the (x, y) translation from model to world coordinates
+        """
+        super().__init__(name, ())
+        self._model = model
+        self._offset = offset
+        self._bounding_box = None
+
+    @property
+    def model(self):
+        return self._model
+
+    @property
+    def offset(self):
+        return self._offset
+
+    @property
+    def local_composite(self):
+        return self._model.composite
+
+    @property
+    def shapes(self):
+        return tuple(shape.translated(self._offset)
+                     for shape in self._model.shapes)
+
+    @property
+    def composite(self):
+        """
+        :return: the composite shape made of the world-space shapes, built
+                 anew as well
+        """
+        return shapes_2d.CompositeShape(self.shapes)
+
+    @property
+    def bounding_box(self):
+        if self._bounding_box is None:
+            box = self._model.bounding_box
+            self._bounding_box = ((box[0][0] + self._offset[0],
+                                   box[0][1] + self._offset[1]),
+                                  (box[1][0] + self._offset[0],
+                                   box[1][1] + self._offset[1]))
+        return self._bounding_box
+
+    def move_to(self, offset):
+        """
+        :param offset: the new (x, y) translation of the car
+        """
+        self._offset = offset
+        self._invalidate()
+
+    def set_shapes(self, shapes):
+        raise TypeError("The shapes of a car made from a model cannot be "
+                        "changed")
+
+    def add_shape(self, shape):
+        raise TypeError("The shapes of a car made from a model cannot be "
+                        "changed")
+
+    def _invalidate(self):
+        super()._invalidate()
+        self._bounding_box = None
+
@@ -0,0 +1,87 @@
+"""
+This module provides an index over a collection of cars, answering region,
+point and radius queries. Candidates are found in the dynamic AABB tree of the
+cars bounding boxes; the exact check reuses the OverlappingShapesDetector
+kernels.
+"""
+
+from src import aabb_tree, shapes_2d, overlaps_detection
+
+
+class CarIndex:
+    """
+    Class defining an indexed collection of cars
+    """
+
+    def __init__(self, cars=()):
+        """
+        :param cars: the cars to be indexed
+        """
+        self._tree = aabb_tree.DynamicAABBTree()
+        self._proxy_ids = {}
+        for a_car in cars:
+            self.add(a_car)
+
+    def __len__(self):
+        return len(self._proxy_ids)
+
+    def __contains__(self, a_car):
+        return id(a_car) in self._proxy_ids
+
+    def add(self, a_car):
+        """
+        :param a_car: the car to be added to the index
+        """
+        if a_car in self:
+            raise ValueError("The car is already indexed")
+        self._proxy_ids[id(a_car)] = self._tree.insert(a_car.bounding_box,
+                                                       a_car)
+
+    def remove(self, a_car):
+        """
+        :param a_car: the car to be removed from the index
+        """
+        self._tree.remove(self._proxy_ids.pop(id(a_car)))
+
+    def update(self, a_car):
+        """
+        Refresh the index after the given car moved or changed shapes
+        """
+        self._tree.move(self._proxy_ids[id(a_car)], a_car.bounding_box)
+
+    def query_shape(self, shape):
+        """
+        :param shape: any shapes_2d shape, composite shapes included
+        :return: the cars overlapping the given shape, in insertion order
+        """
+        result = []
+        for proxy_id in self._tree.query(shape.get_bounding_box()):
+            a_car = self._tree.get_item(proxy_id)
+            offset = a_car.offset
+            if overlaps_detection.OverlappingShapesDetector.\
+                    do_these_two_shapes_overlap(shape, a_car.local_composite,
+                                                offset):
+                result.append(a_car)
+        return result
+
+    def query_point(self, point):
+        """
+        :param point: the (x, y) coordinates of the point
+        :return: the cars containing the given point, in insertion order
+        """
+        return self.query_shape(shapes_2d.Point(point))
+
+    def query_radius(self, center, radius):
+        """
+        :return: the cars overlapping the circle of given center and radius,
+                 in insertion order
+        """
+        return self.query_shape(shapes_2d.Circle(center, radius))
+
+    def query_rectangle(self, min_point, max_point):
+        """
+        :return: the cars overlapping the rectangle of given min and max points,
+                 in insertion order
+        """
+        return self.query_shape(shapes_2d.Rectangle.from_min_max_points(
+            min_point, max_point))
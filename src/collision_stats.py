@@ -0,0 +1,84 @@
+"""
+This module provides opt-in instrumentation of the collision detection. While
+a CollisionStats object is being collected, overlaps_detection reports to it
+the car pairs, their bounding boxes tests and the kernel calls made by the
+current thread; when no stats are collected, the detector only checks that
+none is set.
+"""
+
+import contextlib
+import time
+from src import shapes_2d, overlaps_detection
+
+# Shape pair kinds of the counted kernels, by shape classes
+_KERNEL_KINDS = {
+    (shapes_2d.Circle, shapes_2d.Circle): "circle/circle",
+    (shapes_2d.Rectangle, shapes_2d.Rectangle): "rectangle/rectangle",
+    (shapes_2d.Circle, shapes_2d.Rectangle): "circle/rectangle",
+    (shapes_2d.Rectangle, shapes_2d.Circle): "circle/rectangle"}
+
+
+class CollisionStats:
+    """
+    Class gathering counters and timers of collision queries
+    """
+
+    def __init__(self):
+        self.car_pairs = 0
+        self.bounding_box_tests = 0
+        self.bounding_box_rejections = 0
+        self.kernel_calls = {kind: 0 for kind in _KERNEL_KINDS.values()}
+        self.bounding_box_seconds = 0.0
+        self.narrow_phase_seconds = 0.0
+
+    def as_dict(self):
+        """
+        :return: the stats as a JSON-serializable dictionary
+        """
+        return {"car_pairs": self.car_pairs,
+                "bounding_box_tests": self.bounding_box_tests,
+                "bounding_box_rejections": self.bounding_box_rejections,
+                "kernel_calls": dict(self.kernel_calls),
+                "bounding_box_seconds": self.bounding_box_seconds,
+                "narrow_phase_seconds": self.narrow_phase_seconds}
+
+    def count_kernel_call(self, first_class, second_class):
+        """
+        Count a kernel call, if its shape pair kind is counted
+        """
+        kind = _KERNEL_KINDS.get((first_class, second_class))
+        if kind is not None:
+            self.kernel_calls[kind] += 1
+
+    @contextlib.contextmanager
+    def time_bounding_boxes(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.bounding_box_seconds += time.perf_counter() - start
+
+    @contextlib.contextmanager
+    def time_narrow_phase(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.narrow_phase_seconds += time.perf_counter() - start
+
+
+@contextlib.contextmanager
+def collect(stats):
+    """
+    Count the car pairs, their bounding boxes tests and rejections, and the
+    kernel calls by shape pair kind made by overlaps_detection within this
+    context, in the current thread only.
+    :param stats: the CollisionStats to be updated
+    """
+    collection = overlaps_detection._collection
+    previous_stats = collection.stats
+    collection.stats = stats
+    try:
+        yield stats
+    finally:
+        collection.stats = previous_stats
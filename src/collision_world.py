@@ -0,0 +1,161 @@
+"""
+This module provides a world of moving cars which keeps the colliding pairs
+from one frame to the next. Each frame, only the pairs involving a car which
+moved (or was added) are evaluated again; the others are carried over, and
+only the pairs which started or ended colliding are reported.
+"""
+
+from src import aabb_tree, car, overlaps_detection
+
+
+class CollisionWorld:
+    """
+    Class defining a set of cars whose collisions are updated incrementally
+    """
+
+    def __init__(self, cars=(), margin=0.5):
+        """
+        :param cars: the initial cars of the world
+        :param margin: the margin by which the boxes stored in the AABB tree
+                       are fattened, so that small moves do not re-insert the
+                       cars in the tree
+        """
+        self._tree = aabb_tree.DynamicAABBTree(margin)
+        self._proxy_ids = {}
+        # Colliding partners of every proxy id, as of the last step
+        self._partners = {}
+        # Proxy ids of the cars added, moved or updated since the last step
+        self._dirty = set()
+        # Pairs of cars ended by removals since the last step
+        self._removed_pairs = []
+        for a_car in cars:
+            self.add_car(a_car)
+
+    def __len__(self):
+        return len(self._proxy_ids)
+
+    def __contains__(self, a_car):
+        return id(a_car) in self._proxy_ids
+
+    @property
+    def cars(self):
+        """
+        :return: the list of the cars of the world, in insertion order
+        """
+        return [self._tree.get_item(proxy_id)
+                for proxy_id in sorted(self._proxy_ids.values())]
+
+    @property
+    def colliding_pairs(self):
+        """
+        :return: the list of colliding car pairs as of the last step, ordered
+                 by insertion
+        """
+        return [(self._tree.get_item(proxy_id), self._tree.get_item(other_id))
+                for proxy_id, other_id in self.__get_pairs(self._partners)]
+
+    def add_car(self, a_car):
+        """
+        :param a_car: the car to be added; its collisions are reported by the
+                      next step
+        """
+        if a_car in self:
+            raise ValueError("The car is already in the world")
+        proxy_id = self._tree.insert(a_car.bounding_box, a_car)
+        self._proxy_ids[id(a_car)] = proxy_id
+        self._partners[proxy_id] = set()
+        self._dirty.add(proxy_id)
+
+    def remove_car(self, a_car):
+        """
+        :param a_car: the car to be removed; its collisions are reported as
+                      ended by the next step
+        """
+        proxy_id = self._proxy_ids.pop(id(a_car))
+        for other_id in sorted(self._partners.pop(proxy_id)):
+            self._partners[other_id].discard(proxy_id)
+            other_car = self._tree.get_item(other_id)
+            self._removed_pairs.append((a_car, other_car)
+                                       if proxy_id < other_id else
+                                       (other_car, a_car))
+        self._dirty.discard(proxy_id)
+        self._tree.remove(proxy_id)
+
+    def move_car(self, a_car, delta):
+        """
+        Translate the given car; the translation is taken into account by the
+        next step
+        :param delta: the (x, y) translation
+        """
+        if isinstance(a_car, car.ModelCar):
+            a_car.move_to((a_car.offset[0] + delta[0],
+                           a_car.offset[1] + delta[1]))
+        else:
+            a_car.set_shapes([shape.translated(delta)
+                              for shape in a_car.shapes])
+        self.update_car(a_car)
+
+    def update_car(self, a_car):
+        """
+        Mark the given car as changed, e.g. after it was moved or reshaped
+        outside of the world; it is evaluated again by the next step
+        """
+        self._dirty.add(self._proxy_ids[id(a_car)])
+
+    def step(self, deltas=()):
+        """
+        Apply the given translations, then update the colliding pairs. Only
+        the pairs involving a changed car are tested again.
+        :param deltas: a dictionary, or an iterable of pairs, mapping cars to
+                       their (x, y) translation for this frame
+        :return: the (started, ended) lists of car pairs, ordered by
+                 insertion
+        """
+        if isinstance(deltas, dict):
+            deltas = deltas.items()
+        for a_car, delta in deltas:
+            self.move_car(a_car, delta)
+
+        for proxy_id in self._dirty:
+            self._tree.move(proxy_id,
+                            self._tree.get_item(proxy_id).bounding_box)
+
+        old_pairs = set()
+        for proxy_id in self._dirty:
+            for other_id in self._partners[proxy_id]:
+                old_pairs.add((min(proxy_id, other_id),
+                               max(proxy_id, other_id)))
+
+        new_pairs = set()
+        for proxy_id, other_id in self._tree.query_pairs(self._dirty):
+            if overlaps_detection.do_these_cars_collide(
+                    self._tree.get_item(proxy_id),
+                    self._tree.get_item(other_id)):
+                new_pairs.add((proxy_id, other_id))
+
+        for proxy_id, other_id in old_pairs - new_pairs:
+            self._partners[proxy_id].discard(other_id)
+            self._partners[other_id].discard(proxy_id)
+        for proxy_id, other_id in new_pairs - old_pairs:
+            self._partners[proxy_id].add(other_id)
+            self._partners[other_id].add(proxy_id)
+
+        started = [(self._tree.get_item(proxy_id),
+                    self._tree.get_item(other_id))
+                   for proxy_id, other_id in sorted(new_pairs - old_pairs)]
+        ended = self._removed_pairs + [
+            (self._tree.get_item(proxy_id), self._tree.get_item(other_id))
+            for proxy_id, other_id in sorted(old_pairs - new_pairs)]
+
+        self._dirty = set()
+        self._removed_pairs = []
+        return started, ended
+
+    @staticmethod
+    def __get_pairs(partners):
+        """
+        :return: the sorted list of proxy id pairs (i, j), with i < j
+        """
+        return sorted((proxy_id, other_id)
+                      for proxy_id, other_ids in partners.items()
+                      for other_id in other_ids if proxy_id < other_id)
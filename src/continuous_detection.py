@@ -0,0 +1,357 @@
+"""
+This module provides the continuous (swept) collision detection of cars moving
+along straight lines during a time step, so that fast cars cannot pass through
+each other between two discrete checks. Time is normalized: the cars are at
+their start position at t = 0 and at their end position at t = 1.
+
+The exact tests are analytic: the second shape moving relative to the first
+one, the time interval during which they overlap is the time interval during
+which a point (the relative center) lies inside their Minkowski sum, a circle
+or a rectangle (for circle/rectangle pairs, a rounded rectangle, i.e. the
+union of two rectangles and four circles). Oriented rectangles are handled in
+their own frame against circles, and through the slabs of their separating
+axes against rectangles. As for OverlappingShapesDetector, touching shapes do
+not overlap.
+"""
+
+import math
+from src import broad_phase, kernel_registry, shapes_2d
+
+
+def get_swept_bounding_box(bounding_box, displacement):
+    """
+    :param bounding_box: the bounding box ((min_x, min_y), (max_x, max_y)) at
+                         the start of the step
+    :param displacement: the (x, y) translation over the step
+    :return: the bounding box of the region swept by the given box
+    """
+    return ((bounding_box[0][0] + min(displacement[0], 0),
+             bounding_box[0][1] + min(displacement[1], 0)),
+            (bounding_box[1][0] + max(displacement[0], 0),
+             bounding_box[1][1] + max(displacement[1], 0)))
+
+
+def _get_circle_interval(point, velocity, radius):
+    """
+    :return: the open time interval (start, end) during which the point
+             moving from the given position at the given velocity lies inside
+             the circle of given radius centered at the origin, or None
+    """
+    a = velocity[0] * velocity[0] + velocity[1] * velocity[1]
+    b = point[0] * velocity[0] + point[1] * velocity[1]
+    c = point[0] * point[0] + point[1] * point[1] - radius * radius
+    if a == 0:
+        return (-math.inf, math.inf) if c < 0 else None
+
+    discriminant = b * b - a * c
+    if discriminant <= 0:
+        return None
+    root = math.sqrt(discriminant)
+    return (-b - root) / a, (-b + root) / a
+
+
+def _get_box_interval(point, velocity, half_width, half_height):
+    """
+    :return: the open time interval (start, end) during which the point
+             moving from the given position at the given velocity lies inside
+             the rectangle of given half extents centered at the origin, or
+             None
+    """
+    return _get_slabs_interval(((point[0], velocity[0], half_width),
+                                (point[1], velocity[1], half_height)))
+
+
+def _get_slabs_interval(slabs):
+    """
+    :param slabs: an iterable of (position, speed, half_extent), the
+                  projections on some axes of a moving point and the half
+                  extents along these axes of a convex shape centered at the
+                  origin
+    :return: the open time interval (start, end) during which the point lies
+             strictly inside every slab, or None
+    """
+    start = -math.inf
+    end = math.inf
+    for position, speed, half_extent in slabs:
+        if speed == 0:
+            if abs(position) >= half_extent:
+                return None
+            continue
+        first_time = (-half_extent - position) / speed
+        second_time = (half_extent - position) / speed
+        start = max(start, min(first_time, second_time))
+        end = min(end, max(first_time, second_time))
+    return (start, end) if start < end else None
+
+
+def _get_circles_interval(first_circle, second_circle, offset, velocity):
+    return _get_circle_interval(
+        (second_circle.center[0] + offset[0] - first_circle.center[0],
+         second_circle.center[1] + offset[1] - first_circle.center[1]),
+        velocity, first_circle.radius + second_circle.radius)
+
+
+def _get_rectangles_interval(first_rectangle, second_rectangle, offset,
+                             velocity):
+    return _get_box_interval(
+        (second_rectangle.center[0] + offset[0] - first_rectangle.center[0],
+         second_rectangle.center[1] + offset[1] - first_rectangle.center[1]),
+        velocity, first_rectangle.half_width + second_rectangle.half_width,
+        first_rectangle.half_height + second_rectangle.half_height)
+
+
+def _get_circle_rectangle_interval(circle, rectangle, offset, velocity):
+    # The circle center moves relative to the rectangle center
+    return _get_rounded_box_interval(
+        (circle.center[0] - rectangle.center[0] - offset[0],
+         circle.center[1] - rectangle.center[1] - offset[1]),
+        (-velocity[0], -velocity[1]), rectangle.half_width,
+        rectangle.half_height, circle.radius)
+
+
+def _get_rounded_box_interval(point, velocity, half_width, half_height,
+                              radius):
+    """
+    :return: the open time interval (start, end) during which the point
+             moving from the given position at the given velocity lies inside
+             the rectangle of given half extents centered at the origin,
+             rounded by the given radius, or None
+    """
+    # The rounded rectangle is convex, hence the union of the intervals of its
+    # parts is an interval
+    intervals = [
+        _get_box_interval(point, velocity, half_width + radius, half_height),
+        _get_box_interval(point, velocity, half_width, half_height + radius)]
+    for corner_x, corner_y in ((-half_width, -half_height),
+                               (-half_width, half_height),
+                               (half_width, -half_height),
+                               (half_width, half_height)):
+        intervals.append(_get_circle_interval(
+            (point[0] - corner_x, point[1] - corner_y), velocity, radius))
+
+    intervals = [interval for interval in intervals if interval is not None]
+    if len(intervals) == 0:
+        return None
+    return (min(interval[0] for interval in intervals),
+            max(interval[1] for interval in intervals))
+
+
+def _get_boxes_interval(first_center, first_axes, first_half_extents,
+                        second_center, second_axes, second_half_extents,
+                        velocity):
+    """
+    The boxes are convex and only translate, hence they overlap when their
+    projections overlap on each of the four axes of the boxes (see
+    OverlappingShapesDetector): every axis gives a slab.
+    :param first_axes: the unit vectors along the width and the height of the
+                       first box
+    :param first_half_extents: the (half_width, half_height) of the first box
+    :return: the open time interval (start, end) during which the second box,
+             moving by velocity, overlaps the first one, or None
+    """
+    distance_x = second_center[0] - first_center[0]
+    distance_y = second_center[1] - first_center[1]
+    slabs = []
+    for axis in first_axes + second_axes:
+        slabs.append((distance_x * axis[0] + distance_y * axis[1],
+                      velocity[0] * axis[0] + velocity[1] * axis[1],
+                      shapes_2d.get_projection_radius(
+                          axis, first_axes, first_half_extents) +
+                      shapes_2d.get_projection_radius(
+                          axis, second_axes, second_half_extents)))
+    return _get_slabs_interval(slabs)
+
+
+def _get_oriented_rectangles_interval(first_rectangle, second_rectangle,
+                                      offset, velocity):
+    second_center = second_rectangle.center
+    return _get_boxes_interval(
+        first_rectangle.center, first_rectangle.axes,
+        (first_rectangle.half_width, first_rectangle.half_height),
+        (second_center[0] + offset[0], second_center[1] + offset[1]),
+        second_rectangle.axes,
+        (second_rectangle.half_width, second_rectangle.half_height),
+        velocity)
+
+
+def _get_oriented_rectangle_rectangle_interval(oriented_rectangle, rectangle,
+                                               offset, velocity):
+    rectangle_center = rectangle.center
+    return _get_boxes_interval(
+        oriented_rectangle.center, oriented_rectangle.axes,
+        (oriented_rectangle.half_width, oriented_rectangle.half_height),
+        (rectangle_center[0] + offset[0], rectangle_center[1] + offset[1]),
+        shapes_2d.X_AND_Y_AXES,
+        (rectangle.half_width, rectangle.half_height), velocity)
+
+
+def _get_oriented_rectangle_circle_interval(oriented_rectangle, circle,
+                                            offset, velocity):
+    # In the frame of the oriented rectangle, the circle center moves
+    # relative to an axis aligned rectangle
+    distance_x = circle.center[0] + offset[0] - oriented_rectangle.center[0]
+    distance_y = circle.center[1] + offset[1] - oriented_rectangle.center[1]
+    width_axis, height_axis = oriented_rectangle.axes
+    return _get_rounded_box_interval(
+        (distance_x * width_axis[0] + distance_y * width_axis[1],
+         distance_x * height_axis[0] + distance_y * height_axis[1]),
+        (velocity[0] * width_axis[0] + velocity[1] * width_axis[1],
+         velocity[0] * height_axis[0] + velocity[1] * height_axis[1]),
+        oriented_rectangle.half_width, oriented_rectangle.half_height,
+        circle.radius)
+
+
+def _make_swapped_swept_kernel(kernel):
+    def swapped_kernel(first_shape, second_shape, offset, velocity):
+        return kernel(second_shape, first_shape, (-offset[0], -offset[1]),
+                      (-velocity[0], -velocity[1]))
+    return swapped_kernel
+
+
+# Swept kernels by pair of shape classes; the velocity of a swapped pair is
+# negated as well as its offset
+_swept_kernels = kernel_registry.KernelRegistry("swept",
+                                                _make_swapped_swept_kernel)
+
+
+def register_swept_kernel(first_class, second_class, kernel):
+    """
+    Register the swept kernel of a pair of shape classes. As the overlap
+    kernels of OverlappingShapesDetector, the kernel is also used, with
+    swapped arguments, for the symmetric pair and for the subclasses of the
+    given classes (unless they have their own kernel).
+    :param kernel: function (first_shape, second_shape, offset, velocity)
+                   returning the open time interval (start, end) during which
+                   the shapes overlap, or None, the second one being
+                   translated by offset at t = 0 and moving by velocity
+    """
+    _swept_kernels.register(first_class, second_class, kernel)
+
+
+def resolve_swept_kernel(first_class, second_class):
+    """
+    :return: the swept kernel (first_shape, second_shape, offset, velocity)
+             of the given pair of shape classes
+    """
+    return _swept_kernels.resolve(first_class, second_class)
+
+
+register_swept_kernel(shapes_2d.Circle, shapes_2d.Circle,
+                      _get_circles_interval)
+register_swept_kernel(shapes_2d.Rectangle, shapes_2d.Rectangle,
+                      _get_rectangles_interval)
+register_swept_kernel(shapes_2d.Circle, shapes_2d.Rectangle,
+                      _get_circle_rectangle_interval)
+register_swept_kernel(shapes_2d.OrientedRectangle, shapes_2d.OrientedRectangle,
+                      _get_oriented_rectangles_interval)
+register_swept_kernel(shapes_2d.OrientedRectangle, shapes_2d.Rectangle,
+                      _get_oriented_rectangle_rectangle_interval)
+register_swept_kernel(shapes_2d.OrientedRectangle, shapes_2d.Circle,
+                      _get_oriented_rectangle_circle_interval)
+
+
+def get_shapes_time_of_impact(first_shape, second_shape, offset=(0, 0),
+                              velocity=(0, 0)):
+    """
+    :param first_shape: a circle, a rectangle, an oriented rectangle or a
+                        composite shape of them, standing still
+    :param second_shape: a circle, a rectangle, an oriented rectangle or a
+                         composite shape of them, translated by offset at
+                         t = 0 and moving by velocity over the step
+    :return: the earliest time t in [0, 1] at which the shapes overlap, or
+             None if they do not overlap during the step
+    """
+    if isinstance(first_shape, shapes_2d.CompositeShape) or \
+            isinstance(second_shape, shapes_2d.CompositeShape):
+        return _get_composite_time_of_impact(first_shape, second_shape,
+                                             offset, velocity)
+
+    pair_classes = (type(first_shape), type(second_shape))
+    kernel = _swept_kernels.dispatch_table.get(pair_classes)
+    if kernel is None:
+        kernel = _swept_kernels.resolve(*pair_classes)
+    interval = kernel(first_shape, second_shape, offset, velocity)
+    if interval is None or interval[0] >= 1 or interval[1] <= 0:
+        return None
+    return max(interval[0], 0.0)
+
+
+def _get_composite_time_of_impact(first_shape, second_shape, offset,
+                                  velocity):
+    """
+    :return: the earliest time of impact among the pairs of underlying shapes
+             whose swept bounding boxes overlap, or None
+    """
+    first_shapes = first_shape.shapes \
+        if isinstance(first_shape, shapes_2d.CompositeShape) else \
+        (first_shape,)
+    second_shapes = second_shape.shapes \
+        if isinstance(second_shape, shapes_2d.CompositeShape) else \
+        (second_shape,)
+
+    second_boxes = []
+    for shape in second_shapes:
+        box = shape.get_bounding_box()
+        second_boxes.append(get_swept_bounding_box(
+            ((box[0][0] + offset[0], box[0][1] + offset[1]),
+             (box[1][0] + offset[0], box[1][1] + offset[1])), velocity))
+
+    time_of_impact = None
+    for first in first_shapes:
+        first_box = first.get_bounding_box()
+        for second, second_box in zip(second_shapes, second_boxes):
+            if not broad_phase.do_these_bounding_boxes_overlap(first_box,
+                                                               second_box):
+                continue
+            time = get_shapes_time_of_impact(first, second, offset, velocity)
+            if time is not None and (time_of_impact is None or
+                                     time < time_of_impact):
+                if time == 0:
+                    return time
+                time_of_impact = time
+    return time_of_impact
+
+
+def get_time_of_impact(first_car, second_car, first_displacement=(0, 0),
+                       second_displacement=(0, 0)):
+    """
+    :param first_displacement: the (x, y) translation of the first car over
+                               the step, i.e. its end minus start position
+    :param second_displacement: the (x, y) translation of the second car over
+                                the step
+    :return: the earliest time t in [0, 1] at which the two cars collide, or
+             None if they do not collide during the step
+    """
+    first_offset = first_car.offset
+    second_offset = second_car.offset
+    return get_shapes_time_of_impact(
+        first_car.local_composite, second_car.local_composite,
+        (second_offset[0] - first_offset[0],
+         second_offset[1] - first_offset[1]),
+        (second_displacement[0] - first_displacement[0],
+         second_displacement[1] - first_displacement[1]))
+
+
+def get_swept_intersections(cars, displacements):
+    """
+    The candidate pairs are found by sweep and prune over the swept bounding
+    boxes of the cars.
+    :param cars: the list of cars, at their start position
+    :param displacements: the list of the (x, y) translations of the cars over
+                          the step, in the same order
+    :return: the sorted list of (i, j, time_of_impact), with i < j, of the
+             cars colliding during the step
+    """
+    if len(cars) != len(displacements):
+        raise ValueError("Please provide one displacement per car")
+    swept_boxes = [get_swept_bounding_box(a_car.bounding_box, displacement)
+                   for a_car, displacement in zip(cars, displacements)]
+
+    result = []
+    for i, j in broad_phase.sweep_and_prune(swept_boxes):
+        time_of_impact = get_time_of_impact(cars[i], cars[j],
+                                            displacements[i],
+                                            displacements[j])
+        if time_of_impact is not None:
+            result.append((i, j, time_of_impact))
+    return result
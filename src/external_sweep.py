@@ -0,0 +1,199 @@
+"""
+This module runs the collision detection of scenes larger than the memory,
+stored as scene snapshots (see scene_snapshot; cars specifications files can
+be converted by streaming them through write_snapshot). Only the bounding
+boxes take part in the sweep, and never all at once:
+    1. the bounding boxes are read in chunks, every chunk is sorted by min_x
+       and written to a run file
+    2. the runs are merged lazily, so the boxes come by increasing min_x; as
+       every run keeps a file open, groups of runs are first merged into
+       longer runs when there are too many of them
+    3. the sweep keeps only the active boxes, i.e. those whose x-extent
+       reaches the current box; the memory thus depends on the number of
+       boxes crossing a vertical line, not on the number of cars
+    4. the geometry of a car is built from the memory-mapped snapshot only
+       when the car belongs to a candidate pair; a small cache keeps the
+       cars met recently, which the sweep order makes likely to come again
+"""
+
+import collections
+import heapq
+import os
+import struct
+import tempfile
+from src import overlaps_detection, scene_snapshot
+
+# min_x, min_y, max_x, max_y, car index
+_BOX_RECORD = struct.Struct("<4dq")
+# Number of records read at once from a run file
+_RECORDS_PER_READ = 4096
+# Maximum number of run files open at once while merging, well below the
+# usual file descriptors limits
+MAX_OPEN_RUNS = 64
+
+
+def _sort_key(record):
+    return record[0], record[4]
+
+
+def write_sorted_runs(snapshot, directory, chunk_size):
+    """
+    :param snapshot: an open SceneSnapshot
+    :param directory: the directory of the run files
+    :param chunk_size: the number of bounding boxes sorted in memory at once
+    :return: the list of the paths of the run files, each one sorted by min_x
+    """
+    if chunk_size <= 0:
+        raise ValueError("Please provide a positive chunk_size value")
+
+    paths = []
+    for start in range(0, snapshot.number_of_cars, chunk_size):
+        records = []
+        for car_index in range(start, min(start + chunk_size,
+                                          snapshot.number_of_cars)):
+            box = snapshot.get_car_bounding_box(car_index)
+            records.append((box[0][0], box[0][1], box[1][0], box[1][1],
+                            car_index))
+        records.sort(key=_sort_key)
+
+        path = os.path.join(directory, "run_" + str(len(paths)))
+        _write_run(path, records)
+        paths.append(path)
+    return paths
+
+
+def _write_run(path, records):
+    """
+    Write the given (min_x, min_y, max_x, max_y, car_index) records, sorted
+    by min_x, to a run file
+    """
+    with open(path, "wb") as run_file:
+        for record in records:
+            run_file.write(_BOX_RECORD.pack(*record))
+
+
+def _iter_run(path):
+    """
+    :return: a generator of the records of a run file
+    """
+    with open(path, "rb") as run_file:
+        while True:
+            block = run_file.read(_RECORDS_PER_READ * _BOX_RECORD.size)
+            if len(block) == 0:
+                return
+            yield from _BOX_RECORD.iter_unpack(block)
+
+
+def merge_runs(run_paths, max_open_runs=MAX_OPEN_RUNS):
+    """
+    Merge groups of at most max_open_runs runs into new run files, next to
+    the given ones, until at most max_open_runs runs remain. The merged run
+    files are removed.
+    :return: the list of the paths of the remaining run files
+    """
+    if max_open_runs < 2:
+        raise ValueError("Please provide a max_open_runs value of at least 2")
+
+    run_paths = list(run_paths)
+    merge_pass = 0
+    while len(run_paths) > max_open_runs:
+        merged_paths = []
+        for start in range(0, len(run_paths), max_open_runs):
+            group = run_paths[start:start + max_open_runs]
+            if len(group) == 1:
+                merged_paths.append(group[0])
+                continue
+            path = os.path.join(os.path.dirname(group[0]),
+                                "merged_" + str(merge_pass) + "_" +
+                                str(len(merged_paths)))
+            _write_run(path, heapq.merge(*[_iter_run(run_path)
+                                           for run_path in group],
+                                         key=_sort_key))
+            for run_path in group:
+                os.remove(run_path)
+            merged_paths.append(path)
+        run_paths = merged_paths
+        merge_pass += 1
+    return run_paths
+
+
+def iter_sorted_boxes(run_paths, max_open_runs=MAX_OPEN_RUNS):
+    """
+    :param max_open_runs: the maximum number of run files open at once; if
+                          there are more runs, they are first merged (see
+                          merge_runs)
+    :return: a generator of the (min_x, min_y, max_x, max_y, car_index)
+             records of all the runs, by increasing min_x
+    """
+    return heapq.merge(*[_iter_run(path)
+                         for path in merge_runs(run_paths, max_open_runs)],
+                       key=_sort_key)
+
+
+def iter_candidate_pairs(sorted_boxes):
+    """
+    Sweep-and-prune over bounding boxes coming by increasing min_x, see
+    broad_phase.iter_sweep_and_prune
+    :param sorted_boxes: an iterable of (min_x, min_y, max_x, max_y,
+                         car_index) records sorted by min_x
+    :return: a generator of the car index pairs (i, j), with i < j, whose
+             bounding boxes overlap, in sweep order
+    """
+    active = []
+    for min_x, min_y, max_x, max_y, car_index in sorted_boxes:
+        # Drop the boxes ending before the current one starts
+        active = [other for other in active if other[0] >= min_x]
+        for other_max_x, other_min_y, other_max_y, other_index in active:
+            if min_y <= other_max_y and other_min_y <= max_y:
+                yield (other_index, car_index) if other_index < car_index \
+                    else (car_index, other_index)
+        active.append((max_x, min_y, max_y, car_index))
+
+
+def iter_colliding_pairs(snapshot_path, chunk_size=100000, cache_size=1024,
+                         directory=None, max_open_runs=MAX_OPEN_RUNS):
+    """
+    :param snapshot_path: the path of the scene snapshot
+    :param chunk_size: the number of bounding boxes sorted in memory at once
+    :param cache_size: the number of cars kept built between candidate pairs
+    :param directory: the directory in which the temporary run files are
+                      created; by default, the system temporary directory
+    :param max_open_runs: the maximum number of run files open at once
+    :return: a generator of the index pairs (i, j), with i < j, of the
+             colliding cars, in sweep order
+    """
+    if cache_size <= 0:
+        raise ValueError("Please provide a positive cache_size value")
+
+    with scene_snapshot.SceneSnapshot(snapshot_path) as snapshot, \
+            tempfile.TemporaryDirectory(dir=directory) as runs_directory:
+        run_paths = write_sorted_runs(snapshot, runs_directory, chunk_size)
+
+        cars = collections.OrderedDict()
+
+        def get_car(car_index):
+            a_car = cars.get(car_index)
+            if a_car is None:
+                a_car = snapshot.make_car(car_index)
+                cars[car_index] = a_car
+                if len(cars) > cache_size:
+                    cars.popitem(last=False)
+            else:
+                cars.move_to_end(car_index)
+            return a_car
+
+        for i, j in iter_candidate_pairs(iter_sorted_boxes(run_paths,
+                                                           max_open_runs)):
+            if overlaps_detection.do_these_cars_collide(get_car(i),
+                                                        get_car(j)):
+                yield i, j
+
+
+def find_colliding_pairs(snapshot_path, chunk_size=100000, cache_size=1024,
+                         directory=None, max_open_runs=MAX_OPEN_RUNS):
+    """
+    :return: the sorted list of the index pairs (i, j), with i < j, of the
+             colliding cars of the given snapshot (see iter_colliding_pairs)
+    """
+    return sorted(iter_colliding_pairs(snapshot_path, chunk_size, cache_size,
+                                       directory, max_open_runs))
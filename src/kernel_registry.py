@@ -0,0 +1,97 @@
+"""
+This module provides the registry of the kernels dispatched on a pair of shape
+classes, shared by the overlap and proximity kernels of
+OverlappingShapesDetector and by the swept kernels of continuous_detection.
+Every kernel takes (first_shape, second_shape, offset, ...), the second shape
+being translated by offset.
+"""
+
+
+def make_swapped_kernel(kernel):
+    """
+    :return: the kernel of the symmetric pair of classes: the shapes are
+             swapped and the offset is negated, the other arguments are
+             passed unchanged
+    """
+    def swapped_kernel(first_shape, second_shape, offset, *arguments):
+        return kernel(second_shape, first_shape, (-offset[0], -offset[1]),
+                      *arguments)
+    return swapped_kernel
+
+
+class KernelRegistry:
+    """
+    Class mapping pairs of shape classes to kernels. A kernel registered for a
+    pair is also used, with swapped arguments, for the symmetric pair and for
+    the subclasses of the given classes (unless they have their own kernel).
+    """
+
+    def __init__(self, description, make_swapped=make_swapped_kernel):
+        """
+        :param description: the kind of the kernels, for the error messages
+        :param make_swapped: function turning a kernel into the kernel of the
+                             symmetric pair of classes
+        """
+        self._description = description
+        self._make_swapped = make_swapped
+        self._kernels = {}
+        # Kernels resolved by pair of concrete shape classes, filled on first
+        # use; the hot paths read it directly before calling resolve
+        self.dispatch_table = {}
+
+    def register(self, first_class, second_class, kernel):
+        """
+        Register the kernel of a pair of shape classes
+        """
+        self._kernels[(first_class, second_class)] = kernel
+        self.dispatch_table.clear()
+
+    def unregister(self, first_class, second_class):
+        """
+        Remove the kernel registered for exactly the given pair of shape
+        classes, if any
+        """
+        self._kernels.pop((first_class, second_class), None)
+        self.dispatch_table.clear()
+
+    def get(self, first_class, second_class):
+        """
+        :return: the kernel registered for exactly the given pair of shape
+                 classes, or None
+        """
+        return self._kernels.get((first_class, second_class))
+
+    def resolve(self, first_class, second_class):
+        """
+        Look the kernel up along the classes hierarchies, most derived classes
+        first, and cache the result for the pair of classes
+        :return: the kernel of the given pair of shape classes
+        :raise TypeError: if no kernel applies to the pair
+        """
+        kernel = self.dispatch_table.get((first_class, second_class))
+        if kernel is not None:
+            return kernel
+
+        kernel = self.__look_up(first_class, second_class)
+        if kernel is None:
+            raise TypeError("No " + self._description +
+                            " kernel registered for " + first_class.__name__ +
+                            " and " + second_class.__name__)
+        self.dispatch_table[(first_class, second_class)] = kernel
+        return kernel
+
+    def __look_up(self, first_class, second_class):
+        """
+        :return: the kernel registered for the nearest pair of base classes,
+                 possibly swapped, or None
+        """
+        for first_base in first_class.__mro__:
+            for second_base in second_class.__mro__:
+                kernel = self._kernels.get((first_base, second_base))
+                if kernel is not None:
+                    return kernel
+
+                swapped_kernel = self._kernels.get((second_base, first_base))
+                if swapped_kernel is not None:
+                    return self._make_swapped(swapped_kernel)
+        return None
@@ -3,7 +3,20 @@ This module provides utilities to detect overlapping shapes. Here, a function
 to assess the intersection of two Car objects is also implemented
 """
 
-from src import shapes_2d
+import math
+import threading
+from src import car, kernel_registry, shapes_2d
+
+
+class _Collection(threading.local):
+    """
+    The CollisionStats being collected by the current thread, if any (see
+    collision_stats.collect)
+    """
+    stats = None
+
+
+_collection = _Collection()
 
 
 def do_these_cars_collide(first_car, second_car):
@@ -14,13 +27,57 @@ def do_these_cars_collide(first_car, second_car):
                        determined
     :return: True if self collides with the given car; False otherwise
     """
+    # Cars made from a model are compared through their local shapes and
+    # their relative offset, without building world-space shapes
+    first_offset = first_car.offset
+    second_offset = second_car.offset
+    offset = (second_offset[0] - first_offset[0],
+              second_offset[1] - first_offset[1])
+
+    stats = _collection.stats
+    if stats is not None:
+        # The cars bounding boxes test is counted here, once per car pair;
+        # the composite kernels do not count their own inner tests
+        stats.car_pairs += 1
+        stats.bounding_box_tests += 1
+        if not OverlappingShapesDetector.do_these_two_bounding_boxes_overlap(
+                first_car.local_composite.get_bounding_box(),
+                second_car.local_composite.get_bounding_box(), offset):
+            stats.bounding_box_rejections += 1
+            return False
 
-    shapes_compound = shapes_2d.CompositeShape(first_car.shapes)
-    other_shapes_compound = shapes_2d.CompositeShape(second_car.shapes)
+    if isinstance(first_car, car.ModelCar) and \
+            isinstance(second_car, car.ModelCar):
+        # The bounding circles of the models reject the pairs whose bounding
+        # boxes only meet by their corners, without visiting any shape
+        first_center, first_radius = first_car.model.bounding_circle
+        second_center, second_radius = second_car.model.bounding_circle
+        distance_x = second_center[0] + offset[0] - first_center[0]
+        distance_y = second_center[1] + offset[1] - first_center[1]
+        if distance_x * distance_x + distance_y * distance_y >= \
+                shapes_2d.sqr(first_radius + second_radius):
+            return False
 
     return OverlappingShapesDetector.do_these_two_shapes_overlap(
-        shapes_compound,
-        other_shapes_compound)
+        first_car.local_composite, second_car.local_composite, offset)
+
+
+def get_cars_distance_within(first_car, second_car, margin):
+    """
+    :param margin: the safety distance between the two cars
+    :return: the distance between the first pair of shapes of the two cars
+             found closer than margin (negative if they overlap), or None if
+             the cars are not closer than margin
+    """
+    first_offset = first_car.offset
+    second_offset = second_car.offset
+
+    return OverlappingShapesDetector.get_distance_within(
+        first_car.local_composite,
+        second_car.local_composite,
+        margin,
+        (second_offset[0] - first_offset[0],
+         second_offset[1] - first_offset[1]))
 
 
 class OverlappingShapesDetector:
@@ -28,108 +85,615 @@ class OverlappingShapesDetector:
     Class providing utilities to determine whether 2d-shapes overlap each other
     """
 
+    # Composite shapes pairs with more shapes pairs than this are tested by
+    # descending their bounding volume trees (the trees pay off from about a
+    # dozen shapes per compound)
+    bounding_volume_tree_threshold = 144
+
+    # Overlap and proximity kernels, by pair of shape classes
+    _kernels = kernel_registry.KernelRegistry("overlap")
+    _distance_kernels = kernel_registry.KernelRegistry("proximity")
+
     @staticmethod
-    def do_these_two_shapes_overlap(first_shape, second_shape):
+    def do_these_two_shapes_overlap(first_shape, second_shape,
+                                    offset=(0, 0)):
         """
+        :param offset: the (x, y) translation applied to the second shape
         :return: True if the two given shapes overlap
         """
-        if (type(first_shape) == shapes_2d.CompositeShape or
-                type(second_shape) == shapes_2d.CompositeShape):
-            if type(first_shape) == shapes_2d.CompositeShape:
-                first_composite = first_shape
-                second_composite = shapes_2d.CompositeShape([second_shape])
-            else:
-                first_composite = second_shape
-                second_composite = shapes_2d.CompositeShape([first_shape])
-            return OverlappingShapesDetector.\
-                __do_these_two_composite_shapes_overlap(
-                    first_composite,
-                    second_composite)
-
-        elif type(first_shape) == shapes_2d.Rectangle:
-            if type(second_shape) == shapes_2d.Rectangle:
-                return (OverlappingShapesDetector.
-                        __do_these_two_rectangles_overlap(first_shape,
-                                                          second_shape))
-            if type(second_shape) == shapes_2d.Circle:
-                return (OverlappingShapesDetector.
-                        __does_the_circle_overlap_the_rectangle(second_shape,
-                                                                first_shape))
-        elif type(first_shape) == shapes_2d.Circle:
-            if type(second_shape) == shapes_2d.Circle:
-                return (OverlappingShapesDetector.
-                        __do_these_two_circles_overlap(first_shape,
-                                                       second_shape))
-            if type(second_shape) == shapes_2d.Rectangle:
-                return (OverlappingShapesDetector.
-                        __does_the_circle_overlap_the_rectangle(first_shape,
-                                                                second_shape))
+        pair_classes = (type(first_shape), type(second_shape))
+        kernel = OverlappingShapesDetector._kernels.dispatch_table.get(
+            pair_classes)
+        if kernel is None:
+            kernel = OverlappingShapesDetector._kernels.resolve(*pair_classes)
+        stats = _collection.stats
+        if stats is not None:
+            stats.count_kernel_call(*pair_classes)
+        return kernel(first_shape, second_shape, offset)
+
+    @classmethod
+    def register_kernel(cls, first_class, second_class, kernel):
+        """
+        Register the overlap kernel of a pair of shape classes. The kernel is
+        also used, with swapped arguments, for the symmetric pair and for the
+        subclasses of the given classes (unless they have their own kernel).
+        :param kernel: function (first_shape, second_shape, offset) returning
+                       True if the shapes overlap, the second one being
+                       translated by offset
+        """
+        cls._kernels.register(first_class, second_class, kernel)
+
+    @classmethod
+    def get_kernel(cls, first_class, second_class):
+        """
+        :return: the kernel registered for exactly the given pair of shape
+                 classes, or None
+        """
+        return cls._kernels.get(first_class, second_class)
+
+    @classmethod
+    def resolve_kernel(cls, first_class, second_class):
+        """
+        Look the kernel up along the classes hierarchies, most derived classes
+        first, and cache the result for the pair of classes
+        :return: the kernel (first_shape, second_shape, offset) of the given
+                 pair of shape classes
+        """
+        return cls._kernels.resolve(first_class, second_class)
 
     @staticmethod
-    def __do_these_two_composite_shapes_overlap(first_compound,
-                                                second_compound):
+    def get_distance_within(first_shape, second_shape, margin,
+                            offset=(0, 0)):
         """
-        :return: True if the two given composite shapes overlap
+        The distance is exact for pairs of circles and rectangles; composite
+        shapes stop at the first pair of underlying shapes closer than margin.
+        :param margin: the safety distance between the two shapes
+        :param offset: the (x, y) translation applied to the second shape
+        :return: the distance between the two given shapes (negative if they
+                 overlap, i.e. minus the penetration depth) if it is less than
+                 margin; None otherwise
         """
-        # 1) Check on bounding boxes: if they don't overlap, the two cars don't
-        #    collide.
+        pair_classes = (type(first_shape), type(second_shape))
+        kernels = OverlappingShapesDetector._distance_kernels
+        kernel = kernels.dispatch_table.get(pair_classes)
+        if kernel is None:
+            kernel = kernels.resolve(*pair_classes)
+        return kernel(first_shape, second_shape, offset, margin)
+
+    @classmethod
+    def register_distance_kernel(cls, first_class, second_class, kernel):
+        """
+        Register the proximity kernel of a pair of shape classes, looked up as
+        the overlap kernels are (see register_kernel)
+        :param kernel: function (first_shape, second_shape, offset, margin)
+                       returning the distance between the shapes if it is
+                       less than margin, or None, the second one being
+                       translated by offset
+        """
+        cls._distance_kernels.register(first_class, second_class, kernel)
 
-        bounding_box = first_compound.get_bounding_box()
-        other_bounding_box = second_compound.get_bounding_box()
+    @classmethod
+    def resolve_distance_kernel(cls, first_class, second_class):
+        """
+        :return: the proximity kernel (first_shape, second_shape, offset,
+                 margin) of the given pair of shape classes
+        """
+        return cls._distance_kernels.resolve(first_class, second_class)
 
-        # Make two rectangles to check intersection.
-        box = shapes_2d.Rectangle.from_min_max_points(bounding_box[0],
-                                                      bounding_box[1])
-        other_box = shapes_2d.Rectangle.from_min_max_points(
-            other_bounding_box[0],
-            other_bounding_box[1])
+    @classmethod
+    def _register_default_kernels(cls):
+        cls.register_kernel(shapes_2d.CompositeShape, shapes_2d.Shape2D,
+                            cls.__does_the_composite_shape_overlap_the_shape)
+        cls.register_kernel(shapes_2d.CompositeShape, shapes_2d.CompositeShape,
+                            cls.__do_these_two_composite_shapes_overlap)
+        cls.register_kernel(shapes_2d.Rectangle, shapes_2d.Rectangle,
+                            cls.__do_these_two_rectangles_overlap)
+        cls.register_kernel(shapes_2d.Circle, shapes_2d.Circle,
+                            cls.__do_these_two_circles_overlap)
+        cls.register_kernel(shapes_2d.Circle, shapes_2d.Rectangle,
+                            cls.__does_the_circle_overlap_the_rectangle)
+        cls.register_kernel(shapes_2d.Point, shapes_2d.Circle,
+                            cls.__is_the_point_inside_the_circle)
+        cls.register_kernel(shapes_2d.Point, shapes_2d.Rectangle,
+                            cls.__is_the_point_inside_the_rectangle)
+        cls.register_kernel(shapes_2d.OrientedRectangle,
+                            shapes_2d.OrientedRectangle,
+                            cls.__do_these_two_oriented_rectangles_overlap)
+        cls.register_kernel(
+            shapes_2d.OrientedRectangle, shapes_2d.Rectangle,
+            cls.__does_the_oriented_rectangle_overlap_the_rectangle)
+        cls.register_kernel(
+            shapes_2d.OrientedRectangle, shapes_2d.Circle,
+            cls.__does_the_oriented_rectangle_overlap_the_circle)
+        cls.register_kernel(shapes_2d.Point, shapes_2d.OrientedRectangle,
+                            cls.__is_the_point_inside_the_oriented_rectangle)
 
-        if OverlappingShapesDetector.do_these_two_shapes_overlap(box,
-                                                                 other_box):
+        cls.register_distance_kernel(
+            shapes_2d.CompositeShape, shapes_2d.Shape2D,
+            cls.__get_composite_shape_distance_within)
+        cls.register_distance_kernel(shapes_2d.Rectangle, shapes_2d.Rectangle,
+                                     cls.__get_rectangles_distance_within)
+        cls.register_distance_kernel(shapes_2d.Circle, shapes_2d.Circle,
+                                     cls.__get_circles_distance_within)
+        cls.register_distance_kernel(
+            shapes_2d.Circle, shapes_2d.Rectangle,
+            cls.__get_circle_rectangle_distance_within)
+        cls.register_distance_kernel(
+            shapes_2d.OrientedRectangle, shapes_2d.OrientedRectangle,
+            cls.__get_oriented_rectangles_distance_within)
+        cls.register_distance_kernel(
+            shapes_2d.OrientedRectangle, shapes_2d.Rectangle,
+            cls.__get_oriented_rectangle_rectangle_distance_within)
+        cls.register_distance_kernel(
+            shapes_2d.OrientedRectangle, shapes_2d.Circle,
+            cls.__get_oriented_rectangle_circle_distance_within)
+
+    @staticmethod
+    def __does_the_composite_shape_overlap_the_shape(compound, shape, offset):
+        """
+        :return: True if the given composite shape overlaps the given shape
+                 (possibly composite too), the latter being translated by
+                 offset
+        """
+        # 1) Check on bounding boxes: if they don't overlap, the two cars don't
+        #    collide. The composite shapes cache their bounding boxes.
+        if OverlappingShapesDetector.do_these_two_bounding_boxes_overlap(
+                compound.get_bounding_box(),
+                shape.get_bounding_box(),
+                offset):
             # 2) Check all the underlying shapes.
-            for i in range(len(first_compound.shapes)):
-                for j in range(len(second_compound.shapes)):
-                    if OverlappingShapesDetector.do_these_two_shapes_overlap(
-                            first_compound.shapes[i],
-                            second_compound.shapes[j]):
-                        return True
+            for compound_shape in compound.shapes:
+                if OverlappingShapesDetector.do_these_two_shapes_overlap(
+                        compound_shape,
+                        shape,
+                        offset):
+                    return True
         return False
 
     @staticmethod
-    def __do_these_two_rectangles_overlap(first_rectangle, second_rectangle):
+    def __do_these_two_composite_shapes_overlap(first_compound,
+                                                second_compound, offset):
+        """
+        Small compounds are tested shape by shape; otherwise, the bounding
+        volume trees of the two compounds are descended simultaneously, so
+        that only the shapes whose boxes overlap are tested.
+        :return: True if the two given composite shapes overlap, the second
+                 one being translated by offset
+        """
+        if (len(first_compound.shapes) *
+                len(second_compound.shapes) <=
+                OverlappingShapesDetector.bounding_volume_tree_threshold):
+            return (OverlappingShapesDetector.
+                    __does_the_composite_shape_overlap_the_shape(
+                        first_compound, second_compound, offset))
+
+        first_tree = first_compound.get_bounding_volume_tree()
+        second_tree = second_compound.get_bounding_volume_tree()
+        if first_tree is None or second_tree is None:
+            return False
+
+        nodes_pairs = [(first_tree, second_tree)]
+        while nodes_pairs:
+            first_node, second_node = nodes_pairs.pop()
+            if not OverlappingShapesDetector.\
+                    do_these_two_bounding_boxes_overlap(first_node.box,
+                                                          second_node.box,
+                                                          offset):
+                continue
+
+            if first_node.is_leaf and second_node.is_leaf:
+                if OverlappingShapesDetector.do_these_two_shapes_overlap(
+                        first_node.shape, second_node.shape, offset):
+                    return True
+            # Descend the larger node first
+            elif second_node.is_leaf or (not first_node.is_leaf and
+                                         first_node.area >= second_node.area):
+                nodes_pairs.append((first_node.left, second_node))
+                nodes_pairs.append((first_node.right, second_node))
+            else:
+                nodes_pairs.append((first_node, second_node.left))
+                nodes_pairs.append((first_node, second_node.right))
+        return False
+
+    @staticmethod
+    def do_these_two_bounding_boxes_overlap(box, other_box, offset=(0, 0)):
+        """
+        :return: True if the two given bounding boxes overlap, the second one
+                 being translated by offset
+        """
+        return (box[0][0] < other_box[1][0] + offset[0] and
+                other_box[0][0] + offset[0] < box[1][0] and
+                box[0][1] < other_box[1][1] + offset[1] and
+                other_box[0][1] + offset[1] < box[1][1])
+
+    @staticmethod
+    def __get_axes_distance(distance_x, distance_y):
+        """
+        :param distance_x: the gap between two boxes along the x axis,
+                           negative if their x-extents overlap
+        :param distance_y: the gap between two boxes along the y axis
+        :return: the signed distance between the two boxes
+        """
+        if distance_x < 0 and distance_y < 0:
+            return max(distance_x, distance_y)
+        return math.hypot(max(distance_x, 0), max(distance_y, 0))
+
+    @staticmethod
+    def __get_composite_shape_distance_within(compound, shape, offset,
+                                              margin):
+        """
+        :return: the distance between the first underlying shape of the given
+                 composite shape closer than margin to the given shape, the
+                 latter being translated by offset, or None
+        """
+        # The bounding boxes are at least as close as the shapes
+        box = compound.get_bounding_box()
+        other_box = shape.get_bounding_box()
+        if not OverlappingShapesDetector.__get_axes_distance(
+                max(box[0][0] - other_box[1][0] - offset[0],
+                    other_box[0][0] + offset[0] - box[1][0]),
+                max(box[0][1] - other_box[1][1] - offset[1],
+                    other_box[0][1] + offset[1] - box[1][1])) < margin:
+            return None
+
+        for compound_shape in compound.shapes:
+            distance = OverlappingShapesDetector.get_distance_within(
+                compound_shape, shape, margin, offset)
+            if distance is not None:
+                return distance
+        return None
+
+    @staticmethod
+    def __get_rectangles_distance_within(first_rectangle, second_rectangle,
+                                         offset, margin):
+        """
+        :return: the signed distance between the two given rectangles, the
+                 second one being translated by offset, if less than margin
+        """
+        distance = OverlappingShapesDetector.__get_axes_distance(
+            abs(first_rectangle.center[0] - second_rectangle.center[0] -
+                offset[0]) -
+            first_rectangle.half_width - second_rectangle.half_width,
+            abs(first_rectangle.center[1] - second_rectangle.center[1] -
+                offset[1]) -
+            first_rectangle.half_height - second_rectangle.half_height)
+        return distance if distance < margin else None
+
+    @staticmethod
+    def __get_circles_distance_within(first_circle, second_circle, offset,
+                                      margin):
+        """
+        :return: the signed distance between the two given circles, the
+                 second one being translated by offset, if less than margin
+        """
+        distance = (math.hypot(
+            second_circle.center[0] + offset[0] - first_circle.center[0],
+            second_circle.center[1] + offset[1] - first_circle.center[1]) -
+            first_circle.radius - second_circle.radius)
+        return distance if distance < margin else None
+
+    @staticmethod
+    def __get_circle_rectangle_distance_within(circle, rectangle, offset,
+                                               margin):
+        """
+        :return: the signed distance between the given circle and the given
+                 rectangle, the latter being translated by offset, if less
+                 than margin
+        """
+        # Signed distance between the circle center and the rectangle
+        distance = OverlappingShapesDetector.__get_axes_distance(
+            abs(circle.center[0] - rectangle.center[0] - offset[0]) -
+            rectangle.half_width,
+            abs(circle.center[1] - rectangle.center[1] - offset[1]) -
+            rectangle.half_height) - circle.radius
+        return distance if distance < margin else None
+
+    @staticmethod
+    def __get_point_box_distance(point, center, axes, half_extents):
+        """
+        :return: the signed distance between the given point and the given
+                 box (see __do_these_two_boxes_overlap)
+        """
+        distance_x = point[0] - center[0]
+        distance_y = point[1] - center[1]
+        width_axis, height_axis = axes
+        return OverlappingShapesDetector.__get_axes_distance(
+            abs(distance_x * width_axis[0] + distance_y * width_axis[1]) -
+            half_extents[0],
+            abs(distance_x * height_axis[0] + distance_y * height_axis[1]) -
+            half_extents[1])
+
+    @staticmethod
+    def __get_boxes_distance(first_center, first_axes, first_half_extents,
+                             second_center, second_axes, second_half_extents,
+                             margin):
         """
-        :return: True if the two given rectangles overlap
+        The largest gap between the projections of the boxes on their four
+        axes is minus the penetration depth if they overlap, and a lower bound
+        of their distance otherwise. Separated boxes closer than margin are
+        measured exactly: the closest points of two disjoint convex polygons
+        include a vertex of one of them.
+        :return: the signed distance between the two given boxes (see
+                 __do_these_two_boxes_overlap), or a lower bound of it not
+                 less than margin
         """
-        max_length_width = (first_rectangle.half_width +
-                            second_rectangle.half_width)
-        max_length_height = (first_rectangle.half_height +
-                             second_rectangle.half_height)
+        distance_x = second_center[0] - first_center[0]
+        distance_y = second_center[1] - first_center[1]
 
-        if (abs(first_rectangle.center[0] - second_rectangle.center[0]) <
-                max_length_width and
-                abs(first_rectangle.center[1] - second_rectangle.center[1]) <
-                max_length_height):
+        separation = -math.inf
+        for axis in first_axes + second_axes:
+            separation = max(
+                separation,
+                abs(distance_x * axis[0] + distance_y * axis[1]) -
+                shapes_2d.get_projection_radius(axis, first_axes,
+                                                first_half_extents) -
+                shapes_2d.get_projection_radius(axis, second_axes,
+                                                second_half_extents))
+        if separation < 0 or separation >= margin:
+            return separation
+
+        first_box = (first_center, first_axes, first_half_extents)
+        second_box = (second_center, second_axes, second_half_extents)
+        distance = math.inf
+        for (center, axes, half_extents), other_box in ((first_box,
+                                                         second_box),
+                                                        (second_box,
+                                                         first_box)):
+            width_axis, height_axis = axes
+            for width_sign, height_sign in ((-1, -1), (-1, 1), (1, -1),
+                                            (1, 1)):
+                corner = (center[0] +
+                          width_sign * half_extents[0] * width_axis[0] +
+                          height_sign * half_extents[1] * height_axis[0],
+                          center[1] +
+                          width_sign * half_extents[0] * width_axis[1] +
+                          height_sign * half_extents[1] * height_axis[1])
+                distance = min(
+                    distance,
+                    OverlappingShapesDetector.__get_point_box_distance(
+                        corner, *other_box))
+        return distance
+
+    @staticmethod
+    def __get_oriented_rectangles_distance_within(first_rectangle,
+                                                  second_rectangle, offset,
+                                                  margin):
+        """
+        :return: the signed distance between the two given oriented
+                 rectangles, the second one being translated by offset, if
+                 less than margin
+        """
+        second_center = second_rectangle.center
+        distance = OverlappingShapesDetector.__get_boxes_distance(
+            first_rectangle.center, first_rectangle.axes,
+            (first_rectangle.half_width, first_rectangle.half_height),
+            (second_center[0] + offset[0], second_center[1] + offset[1]),
+            second_rectangle.axes,
+            (second_rectangle.half_width, second_rectangle.half_height),
+            margin)
+        return distance if distance < margin else None
+
+    @staticmethod
+    def __get_oriented_rectangle_rectangle_distance_within(
+            oriented_rectangle, rectangle, offset, margin):
+        """
+        :return: the signed distance between the given oriented rectangle and
+                 the given axis aligned rectangle, the latter being translated
+                 by offset, if less than margin
+        """
+        rectangle_center = rectangle.center
+        distance = OverlappingShapesDetector.__get_boxes_distance(
+            oriented_rectangle.center, oriented_rectangle.axes,
+            (oriented_rectangle.half_width, oriented_rectangle.half_height),
+            (rectangle_center[0] + offset[0], rectangle_center[1] + offset[1]),
+            shapes_2d.X_AND_Y_AXES,
+            (rectangle.half_width, rectangle.half_height), margin)
+        return distance if distance < margin else None
+
+    @staticmethod
+    def __get_oriented_rectangle_circle_distance_within(oriented_rectangle,
+                                                        circle, offset,
+                                                        margin):
+        """
+        :return: the signed distance between the given oriented rectangle and
+                 the given circle, the latter being translated by offset, if
+                 less than margin
+        """
+        circle_center = circle.center
+        distance = OverlappingShapesDetector.__get_point_box_distance(
+            (circle_center[0] + offset[0], circle_center[1] + offset[1]),
+            oriented_rectangle.center, oriented_rectangle.axes,
+            (oriented_rectangle.half_width,
+             oriented_rectangle.half_height)) - circle.radius
+        return distance if distance < margin else None
+
+    @staticmethod
+    def __do_these_two_rectangles_overlap(first_rectangle, second_rectangle,
+                                          offset):
+        """
+        :return: True if the two given rectangles overlap, the second one being
+                 translated by offset
+        """
+        first_center = first_rectangle.center
+        second_center = second_rectangle.center
+
+        if (abs(first_center[0] - second_center[0] - offset[0]) <
+                first_rectangle.half_width + second_rectangle.half_width and
+                abs(first_center[1] - second_center[1] - offset[1]) <
+                first_rectangle.half_height + second_rectangle.half_height):
             return True
 
         return False
 
     @staticmethod
-    def __do_these_two_circles_overlap(first_circle, second_circle):
+    def __do_these_two_circles_overlap(first_circle, second_circle, offset):
         """
-        :return: True if the two given circles overlap
+        :return: True if the two given circles overlap, the second one being
+                 translated by offset
         """
-        if (shapes_2d.sqr(first_circle.center[0] - second_circle.center[0]) +
-                shapes_2d.sqr(first_circle.center[1] - second_circle.center[1])
-                < shapes_2d.sqr(first_circle.radius + second_circle.radius)):
+        first_center = first_circle.center
+        second_center = second_circle.center
+        distance_x = first_center[0] - second_center[0] - offset[0]
+        distance_y = first_center[1] - second_center[1] - offset[1]
+        radii = first_circle.radius + second_circle.radius
+
+        if distance_x * distance_x + distance_y * distance_y < radii * radii:
             return True
 
         return False
 
     @staticmethod
-    def __does_the_circle_overlap_the_rectangle(circle, rectangle):
+    def __does_the_circle_overlap_the_rectangle(circle, rectangle, offset):
+        """
+        :return: True if the given circle overlaps the given rectangle, the
+                 rectangle being translated by offset
+        """
+        # Distance between the circle center and its closest point on the
+        # rectangle (the center clamped to the rectangle), along each axis
+        circle_center = circle.center
+        rectangle_center = rectangle.center
+        distance_x = max(abs(circle_center[0] - rectangle_center[0] -
+                             offset[0]) - rectangle.half_width, 0)
+        distance_y = max(abs(circle_center[1] - rectangle_center[1] -
+                             offset[1]) - rectangle.half_height, 0)
+
+        return (distance_x * distance_x + distance_y * distance_y <
+                circle.squared_radius)
+
+    @staticmethod
+    def __is_the_point_inside_the_circle(point, circle, offset):
         """
-        :return: True if the given circle overlaps the given rectangle
+        :return: True if the given point lies inside the given circle, the
+                 circle being translated by offset
         """
+        return (shapes_2d.sqr(point.center[0] - circle.center[0] - offset[0]) +
+                shapes_2d.sqr(point.center[1] - circle.center[1] - offset[1]) <
+                circle.squared_radius)
+
+    @staticmethod
+    def __is_the_point_inside_the_rectangle(point, rectangle, offset):
+        """
+        :return: True if the given point lies inside the given rectangle, the
+                 rectangle being translated by offset
+        """
+        return (abs(point.center[0] - rectangle.center[0] - offset[0]) <
+                rectangle.half_width and
+                abs(point.center[1] - rectangle.center[1] - offset[1]) <
+                rectangle.half_height)
+
+    @staticmethod
+    def __do_these_two_boxes_overlap(first_center, first_axes,
+                                     first_half_extents, second_center,
+                                     second_axes, second_half_extents):
+        """
+        Separating axis test: two convex shapes do not overlap if their
+        projections on some axis do not overlap; for two boxes, it suffices to
+        try the four axes of the boxes
+        :param first_axes: the unit vectors along the width and the height of
+                           the first box
+        :param first_half_extents: the (half_width, half_height) of the first
+                                   box
+        :return: True if the two given boxes overlap
+        """
+        distance_x = second_center[0] - first_center[0]
+        distance_y = second_center[1] - first_center[1]
+
+        for axis in first_axes + second_axes:
+            if abs(distance_x * axis[0] + distance_y * axis[1]) >= \
+                    shapes_2d.get_projection_radius(axis, first_axes,
+                                                    first_half_extents) + \
+                    shapes_2d.get_projection_radius(axis, second_axes,
+                                                    second_half_extents):
+                return False
+        return True
+
+    @staticmethod
+    def __do_these_two_oriented_rectangles_overlap(first_rectangle,
+                                                   second_rectangle, offset):
+        """
+        :return: True if the two given oriented rectangles overlap, the second
+                 one being translated by offset
+        """
+        second_center = second_rectangle.center
+        return OverlappingShapesDetector.__do_these_two_boxes_overlap(
+            first_rectangle.center, first_rectangle.axes,
+            (first_rectangle.half_width, first_rectangle.half_height),
+            (second_center[0] + offset[0], second_center[1] + offset[1]),
+            second_rectangle.axes,
+            (second_rectangle.half_width, second_rectangle.half_height))
+
+    @staticmethod
+    def __does_the_oriented_rectangle_overlap_the_rectangle(
+            oriented_rectangle, rectangle, offset):
+        """
+        :return: True if the given oriented rectangle overlaps the given axis
+                 aligned rectangle, the latter being translated by offset
+        """
+        rectangle_center = rectangle.center
+        return OverlappingShapesDetector.__do_these_two_boxes_overlap(
+            oriented_rectangle.center, oriented_rectangle.axes,
+            (oriented_rectangle.half_width, oriented_rectangle.half_height),
+            (rectangle_center[0] + offset[0], rectangle_center[1] + offset[1]),
+            shapes_2d.X_AND_Y_AXES,
+            (rectangle.half_width, rectangle.half_height))
+
+    @staticmethod
+    def __does_the_oriented_rectangle_overlap_the_circle(oriented_rectangle,
+                                                         circle, offset):
+        """
+        :return: True if the given oriented rectangle overlaps the given
+                 circle, the latter being translated by offset
+        """
+        # Circle center in the frame of the rectangle, where the test is the
+        # one of an axis aligned rectangle
+        rectangle_center = oriented_rectangle.center
+        circle_center = circle.center
+        distance_x = circle_center[0] + offset[0] - rectangle_center[0]
+        distance_y = circle_center[1] + offset[1] - rectangle_center[1]
+        width_axis, height_axis = oriented_rectangle.axes
+
+        local_x = max(abs(distance_x * width_axis[0] +
+                          distance_y * width_axis[1]) -
+                      oriented_rectangle.half_width, 0)
+        local_y = max(abs(distance_x * height_axis[0] +
+                          distance_y * height_axis[1]) -
+                      oriented_rectangle.half_height, 0)
+        return local_x * local_x + local_y * local_y < circle.squared_radius
+
+    @staticmethod
+    def __is_the_point_inside_the_oriented_rectangle(point,
+                                                     oriented_rectangle,
+                                                     offset):
+        """
+        :return: True if the given point lies inside the given oriented
+                 rectangle, the rectangle being translated by offset
+        """
+        rectangle_center = oriented_rectangle.center
+        distance_x = point.center[0] - rectangle_center[0] - offset[0]
+        distance_y = point.center[1] - rectangle_center[1] - offset[1]
+        width_axis, height_axis = oriented_rectangle.axes
+        return (abs(distance_x * width_axis[0] + distance_y * width_axis[1]) <
+                oriented_rectangle.half_width and
+                abs(distance_x * height_axis[0] +
+                    distance_y * height_axis[1]) <
+                oriented_rectangle.half_height)
+
+    @staticmethod
+    def does_the_circle_overlap_the_rectangle_by_sampling(circle, rectangle,
+                                                          offset=(0, 0)):
+        """
+        Reference implementation testing points along the circle, which can
+        replace the exact kernel through register_kernel(shapes_2d.Circle,
+        shapes_2d.Rectangle, ...). Approximate test: thin overlaps falling
+        between two sampled points are missed
+        :return: True if the given circle overlaps the given rectangle, the
+                 rectangle being translated by offset
+        """
+        if offset[0] != 0 or offset[1] != 0:
+            circle = shapes_2d.Circle((circle.center[0] - offset[0],
+                                       circle.center[1] - offset[1]),
+                                      circle.radius)
+
         # Step 1: point-in-circle test for a set of points composed by the
         #         rectangle corners and the rectangle center
         corners = [(rectangle.center[0] - rectangle.half_width,
@@ -158,3 +722,6 @@ class OverlappingShapesDetector:
                 return True
 
         return False
+
+
+OverlappingShapesDetector._register_default_kernels()
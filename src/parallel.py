@@ -0,0 +1,122 @@
+"""
+This module runs the narrow phase of the collision detection on several
+processes. The cars geometry is packed into compact arrays and shipped once to
+every worker, which rebuilds the cars; afterwards, the tasks only carry chunks
+of candidate pair indices.
+"""
+
+import array
+import concurrent.futures
+from src import car, shapes_2d, overlaps_detection, scene_snapshot
+
+# Cars rebuilt by the worker process initializer
+_worker_cars = None
+
+
+def pack_cars(cars):
+    """
+    Every shape is stored as its kind (see scene_snapshot) and four values:
+    (center_x, center_y, radius, 0) for circles and (center_x, center_y,
+    half_width, half_height) for rectangles.
+    :param cars: the list of cars to be packed
+    :return: the (kinds, values, offsets) arrays; the shapes of car k are found
+             at offsets[k]:offsets[k + 1]
+    """
+    kinds = array.array("b")
+    values = array.array("d")
+    offsets = array.array("q", [0])
+
+    for a_car in cars:
+        for shape in a_car.shapes:
+            if type(shape) == shapes_2d.Circle:
+                kinds.append(scene_snapshot.CIRCLE)
+                values.extend((shape.center[0], shape.center[1],
+                               shape.radius, 0))
+            elif type(shape) == shapes_2d.Rectangle:
+                kinds.append(scene_snapshot.RECTANGLE)
+                values.extend((shape.center[0], shape.center[1],
+                               shape.half_width, shape.half_height))
+            else:
+                raise TypeError("Unsupported shape type: " +
+                                type(shape).__name__)
+        offsets.append(len(kinds))
+
+    return kinds, values, offsets
+
+
+def unpack_cars(kinds, values, offsets):
+    """
+    :return: the list of cars described by the given arrays (see pack_cars);
+             the cars are named after their index
+    """
+    cars = []
+    for car_index in range(len(offsets) - 1):
+        shapes = []
+        for shape_index in range(offsets[car_index], offsets[car_index + 1]):
+            center_x, center_y, first_value, second_value = \
+                values[4 * shape_index:4 * shape_index + 4]
+            if kinds[shape_index] == scene_snapshot.CIRCLE:
+                shapes.append(shapes_2d.Circle((center_x, center_y),
+                                               first_value))
+            else:
+                shapes.append(shapes_2d.Rectangle((center_x, center_y),
+                                                  first_value, second_value))
+        cars.append(car.Car(car_index, shapes))
+    return cars
+
+
+def _initialize_worker(kinds, values, offsets):
+    global _worker_cars
+    _worker_cars = unpack_cars(kinds, values, offsets)
+
+
+def _find_colliding_pairs(flat_pairs):
+    """
+    :param flat_pairs: array of car indices (i0, j0, i1, j1, ...)
+    :return: array with the positions, within the chunk, of colliding pairs
+    """
+    colliding = array.array("q")
+    for position in range(len(flat_pairs) // 2):
+        if overlaps_detection.do_these_cars_collide(
+                _worker_cars[flat_pairs[2 * position]],
+                _worker_cars[flat_pairs[2 * position + 1]]):
+            colliding.append(position)
+    return colliding
+
+
+def find_colliding_pairs(cars, candidate_pairs, workers, chunk_size=None):
+    """
+    :param cars: the list of cars
+    :param candidate_pairs: the list of car index pairs (i, j) to be tested,
+                            e.g. the output of the broad phase
+    :param workers: the number of worker processes
+    :param chunk_size: the number of pairs per task; by default, the pairs are
+                       split in four tasks per worker
+    :return: the colliding pairs, in the same order as candidate_pairs
+    """
+    if workers < 1:
+        raise ValueError("Please provide a positive number of workers")
+    if len(candidate_pairs) == 0:
+        return []
+    if chunk_size is None:
+        chunk_size = -(-len(candidate_pairs) // (4 * workers))
+
+    chunks = []
+    for start in range(0, len(candidate_pairs), chunk_size):
+        flat_pairs = array.array("q")
+        for pair in candidate_pairs[start:start + chunk_size]:
+            flat_pairs.extend(pair)
+        chunks.append(flat_pairs)
+
+    result = []
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, initializer=_initialize_worker,
+            initargs=pack_cars(cars)) as executor:
+        # map yields the results in submission order, so the merge is
+        # deterministic whatever the completion order
+        for chunk_index, colliding in enumerate(executor.map(
+                _find_colliding_pairs, chunks)):
+            for position in colliding:
+                result.append(
+                    candidate_pairs[chunk_index * chunk_size + position])
+    return result
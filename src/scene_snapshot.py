@@ -0,0 +1,236 @@
+"""
+This module provides a compact binary format for scenes of cars, and a loader
+which memory-maps it. The file holds, after a fixed-size header:
+    * the shapes table: one record of six float64 per shape, i.e.
+      (kind, center_x, center_y, radius or half_width, 0 or half_height,
+      0 or angle), grouped by car; kind is CIRCLE, RECTANGLE or
+      ORIENTED_RECTANGLE
+    * the cars table: one record of four uint64 per car, i.e.
+      (first_shape, number_of_shapes, name_offset, name_length)
+    * the names table: the UTF-8 encoded car names, concatenated
+All the values are little-endian. The loader exposes the tables as memory
+views over the mapped file, so no object is allocated per shape until cars are
+explicitly built.
+"""
+
+import mmap
+import struct
+import sys
+from src import car, shapes_2d
+
+MAGIC = b"CARSCN\x00\x01"
+# magic, format version, reserved, cars, shapes, names size
+_HEADER = struct.Struct("<8sIIQQQ")
+_SHAPE_RECORD = struct.Struct("<6d")
+_CAR_RECORD = struct.Struct("<4Q")
+# Version 1 had no angle in the shapes records
+FORMAT_VERSION = 2
+# Kinds of the shapes records, also used by the packed cars of parallel
+CIRCLE = 0
+RECTANGLE = 1
+ORIENTED_RECTANGLE = 2
+
+
+def write_snapshot(path, cars):
+    """
+    :param path: the path of the snapshot file
+    :param cars: an iterable of cars made of circles, rectangles and oriented
+                 rectangles; it is consumed once, so it may be a generator
+    """
+    cars_table = bytearray()
+    names_table = bytearray()
+    number_of_cars = 0
+    number_of_shapes = 0
+
+    with open(path, "wb") as snapshot_file:
+        # The header is rewritten once the tables sizes are known
+        snapshot_file.write(bytes(_HEADER.size))
+        for a_car in cars:
+            first_shape = number_of_shapes
+            for shape in a_car.shapes:
+                if type(shape) == shapes_2d.Circle:
+                    record = (CIRCLE, shape.center[0],
+                              shape.center[1], shape.radius, 0, 0)
+                elif type(shape) == shapes_2d.Rectangle:
+                    record = (RECTANGLE, shape.center[0],
+                              shape.center[1], shape.half_width,
+                              shape.half_height, 0)
+                elif type(shape) == shapes_2d.OrientedRectangle:
+                    record = (ORIENTED_RECTANGLE, shape.center[0],
+                              shape.center[1], shape.half_width,
+                              shape.half_height, shape.angle)
+                else:
+                    raise TypeError("Unsupported shape type: " +
+                                    type(shape).__name__)
+                snapshot_file.write(_SHAPE_RECORD.pack(*record))
+                number_of_shapes += 1
+
+            name = str(a_car.name).encode("utf-8")
+            cars_table += _CAR_RECORD.pack(first_shape,
+                                           number_of_shapes - first_shape,
+                                           len(names_table), len(name))
+            names_table += name
+            number_of_cars += 1
+
+        snapshot_file.write(cars_table)
+        snapshot_file.write(names_table)
+        snapshot_file.seek(0)
+        snapshot_file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0,
+                                         number_of_cars, number_of_shapes,
+                                         len(names_table)))
+
+
+class SceneSnapshot:
+    """
+    Class giving read-only access to a memory-mapped scene snapshot. It may be
+    used as a context manager, which closes the mapping on exit.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: the path of the snapshot file
+        """
+        if sys.byteorder != "little":
+            raise ValueError("Snapshots can only be memory-mapped on "
+                             "little-endian machines")
+        with open(path, "rb") as snapshot_file:
+            self._mmap = mmap.mmap(snapshot_file.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < _HEADER.size:
+            self._mmap.close()
+            raise ValueError("Not a scene snapshot: " + str(path))
+        magic, version, _, number_of_cars, number_of_shapes, names_size = \
+            _HEADER.unpack_from(self._mmap)
+        shapes_end = _HEADER.size + number_of_shapes * _SHAPE_RECORD.size
+        cars_end = shapes_end + number_of_cars * _CAR_RECORD.size
+        if (magic != MAGIC or version != FORMAT_VERSION or
+                len(self._mmap) != cars_end + names_size):
+            self._mmap.close()
+            raise ValueError("Not a valid scene snapshot: " + str(path))
+
+        self._number_of_cars = number_of_cars
+        self._number_of_shapes = number_of_shapes
+        view = memoryview(self._mmap)
+        self._shapes = view[_HEADER.size:shapes_end].cast("d")
+        self._cars = view[shapes_end:cars_end].cast("Q")
+        self._names = view[cars_end:]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Release the memory views and the mapping
+        """
+        self._shapes.release()
+        self._cars.release()
+        self._names.release()
+        self._mmap.close()
+
+    @property
+    def number_of_cars(self):
+        return self._number_of_cars
+
+    @property
+    def number_of_shapes(self):
+        return self._number_of_shapes
+
+    @property
+    def shapes_table(self):
+        """
+        :return: a flat float64 memory view of the shapes records, six values
+                 per shape (see the module documentation)
+        """
+        return self._shapes
+
+    @property
+    def cars_table(self):
+        """
+        :return: a flat uint64 memory view of the cars records, four values
+                 per car (see the module documentation)
+        """
+        return self._cars
+
+    def get_shape_record(self, shape_index):
+        """
+        :return: (kind, center_x, center_y, first_value, second_value,
+                 third_value)
+        """
+        start = 6 * shape_index
+        return (int(self._shapes[start]),) + \
+            tuple(self._shapes[start + 1:start + 6])
+
+    def get_car_shapes_range(self, car_index):
+        """
+        :return: the range of the indices of the shapes of the given car
+        """
+        first_shape = self._cars[4 * car_index]
+        return range(first_shape,
+                     first_shape + self._cars[4 * car_index + 1])
+
+    def get_car_name(self, car_index):
+        name_offset = self._cars[4 * car_index + 2]
+        return bytes(self._names[name_offset:name_offset +
+                                 self._cars[4 * car_index + 3]]).\
+            decode("utf-8")
+
+    def get_car_bounding_box(self, car_index):
+        """
+        :return: the bounding box ((min_x, min_y), (max_x, max_y)) of the
+                 given car, computed from the records
+        """
+        min_x = min_y = float("inf")
+        max_x = max_y = float("-inf")
+        for shape_index in self.get_car_shapes_range(car_index):
+            record = self.get_shape_record(shape_index)
+            if record[0] == ORIENTED_RECTANGLE:
+                box = self.__make_shape(record).get_bounding_box()
+                min_x = min(min_x, box[0][0])
+                min_y = min(min_y, box[0][1])
+                max_x = max(max_x, box[1][0])
+                max_y = max(max_y, box[1][1])
+                continue
+
+            kind, center_x, center_y, first_value, second_value, _ = record
+            if kind == CIRCLE:
+                second_value = first_value
+            min_x = min(min_x, center_x - first_value)
+            min_y = min(min_y, center_y - second_value)
+            max_x = max(max_x, center_x + first_value)
+            max_y = max(max_y, center_y + second_value)
+        return (min_x, min_y), (max_x, max_y)
+
+    def make_car(self, car_index):
+        """
+        :return: the Car object of the given index
+        """
+        shapes = [self.__make_shape(self.get_shape_record(shape_index))
+                  for shape_index in self.get_car_shapes_range(car_index)]
+        return car.Car(self.get_car_name(car_index), shapes)
+
+    def make_cars(self):
+        """
+        :return: the list of all the cars of the snapshot
+        """
+        return [self.make_car(car_index)
+                for car_index in range(self._number_of_cars)]
+
+    @staticmethod
+    def __make_shape(record):
+        """
+        :return: the shape described by the given shape record
+        """
+        kind, center_x, center_y, first_value, second_value, third_value = \
+            record
+        if kind == CIRCLE:
+            return shapes_2d.Circle((center_x, center_y), first_value)
+        if kind == ORIENTED_RECTANGLE:
+            return shapes_2d.OrientedRectangle((center_x, center_y),
+                                               first_value, second_value,
+                                               third_value)
+        return shapes_2d.Rectangle((center_x, center_y), first_value,
+                                   second_value)
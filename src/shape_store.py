@@ -0,0 +1,250 @@
+"""
+This module provides a columnar store packing the circles and rectangles of a
+set of cars into contiguous NumPy arrays, together with batched kernels which
+evaluate thousands of shape pairs in a single call. The kernels follow the same
+conventions of OverlappingShapesDetector: touching shapes do not overlap.
+"""
+
+import numpy
+from src import shapes_2d
+
+
+def do_circles_overlap(first_centers, first_radii, second_centers,
+                       second_radii):
+    """
+    :param first_centers: (n, 2) array of circle centers
+    :param first_radii: (n,) array of circle radii
+    :param second_centers: (n, 2) array of circle centers
+    :param second_radii: (n,) array of circle radii
+    :return: (n,) boolean array, True where the i-th circles overlap
+    """
+    offsets = first_centers - second_centers
+    return (numpy.einsum("ij,ij->i", offsets, offsets) <
+            numpy.square(first_radii + second_radii))
+
+
+def do_rectangles_overlap(first_centers, first_half_extents, second_centers,
+                          second_half_extents):
+    """
+    :param first_centers: (n, 2) array of rectangle centers
+    :param first_half_extents: (n, 2) array of (half_width, half_height)
+    :param second_centers: (n, 2) array of rectangle centers
+    :param second_half_extents: (n, 2) array of (half_width, half_height)
+    :return: (n,) boolean array, True where the i-th rectangles overlap
+    """
+    return numpy.all(numpy.abs(first_centers - second_centers) <
+                     first_half_extents + second_half_extents, axis=1)
+
+
+def do_circles_overlap_rectangles(circle_centers, circle_radii,
+                                  rectangle_centers, rectangle_half_extents):
+    """
+    :param circle_centers: (n, 2) array of circle centers
+    :param circle_radii: (n,) array of circle radii
+    :param rectangle_centers: (n, 2) array of rectangle centers
+    :param rectangle_half_extents: (n, 2) array of (half_width, half_height)
+    :return: (n,) boolean array, True where the i-th circle overlaps the i-th
+             rectangle
+    """
+    # Distance between each circle center and the closest rectangle point
+    distances = numpy.maximum(
+        numpy.abs(circle_centers - rectangle_centers) - rectangle_half_extents,
+        0)
+    return (numpy.einsum("ij,ij->i", distances, distances) <
+            numpy.square(circle_radii))
+
+
+def _expand_pairs(first_offsets, second_offsets, first_cars, second_cars):
+    """
+    Expand car pairs into all the pairs of their shapes of the given kind
+    :param first_offsets: (n_cars + 1,) array; the shapes of car k are found
+                          at first_offsets[k]:first_offsets[k + 1]
+    :param second_offsets: same as first_offsets, for the second shape kind
+    :param first_cars: (n,) array with the first car of each pair
+    :param second_cars: (n,) array with the second car of each pair
+    :return: the pair index, the first shape index and the second shape index
+             of each shape pair
+    """
+    first_starts = first_offsets[first_cars]
+    second_starts = second_offsets[second_cars]
+    first_counts = first_offsets[first_cars + 1] - first_starts
+    second_counts = second_offsets[second_cars + 1] - second_starts
+    totals = first_counts * second_counts
+
+    pair_indices = numpy.repeat(numpy.arange(len(first_cars)), totals)
+    local_indices = (numpy.arange(totals.sum()) -
+                     numpy.repeat(numpy.cumsum(totals) - totals, totals))
+    second_counts = second_counts[pair_indices]
+    return (pair_indices,
+            first_starts[pair_indices] + local_indices // second_counts,
+            second_starts[pair_indices] + local_indices % second_counts)
+
+
+class ShapeStore:
+    """
+    Structure-of-arrays store of the shapes of a set of cars. Shapes are
+    grouped by car: the circles of car k are found at
+    circle_offsets[k]:circle_offsets[k + 1], and likewise for rectangles.
+    """
+
+    def __init__(self, circle_centers, circle_radii, circle_cars,
+                 rectangle_centers, rectangle_half_extents, rectangle_cars,
+                 number_of_cars):
+        """
+        :param circle_centers: (n_circles, 2) array of circle centers
+        :param circle_radii: (n_circles,) array of circle radii
+        :param circle_cars: (n_circles,) array of owning car indices, sorted
+        :param rectangle_centers: (n_rectangles, 2) array of centers
+        :param rectangle_half_extents: (n_rectangles, 2) array of
+                                       (half_width, half_height)
+        :param rectangle_cars: (n_rectangles,) array of owning car indices,
+                               sorted
+        :param number_of_cars: the number of cars
+        """
+        self._circle_centers = numpy.ascontiguousarray(circle_centers,
+                                                       dtype=numpy.float64)
+        self._circle_radii = numpy.ascontiguousarray(circle_radii,
+                                                     dtype=numpy.float64)
+        self._circle_cars = numpy.ascontiguousarray(circle_cars,
+                                                    dtype=numpy.int64)
+        self._rectangle_centers = numpy.ascontiguousarray(
+            rectangle_centers, dtype=numpy.float64)
+        self._rectangle_half_extents = numpy.ascontiguousarray(
+            rectangle_half_extents, dtype=numpy.float64)
+        self._rectangle_cars = numpy.ascontiguousarray(rectangle_cars,
+                                                       dtype=numpy.int64)
+        self._number_of_cars = number_of_cars
+
+        car_indices = numpy.arange(number_of_cars + 1)
+        self._circle_offsets = numpy.searchsorted(self._circle_cars,
+                                                  car_indices)
+        self._rectangle_offsets = numpy.searchsorted(self._rectangle_cars,
+                                                     car_indices)
+
+    @classmethod
+    def from_cars(cls, cars):
+        """
+        Initialize from a list of cars made of circles and rectangles
+        """
+        circle_centers = []
+        circle_radii = []
+        circle_cars = []
+        rectangle_centers = []
+        rectangle_half_extents = []
+        rectangle_cars = []
+
+        for car_index, a_car in enumerate(cars):
+            for shape in a_car.shapes:
+                if type(shape) == shapes_2d.Circle:
+                    circle_centers.append(shape.center)
+                    circle_radii.append(shape.radius)
+                    circle_cars.append(car_index)
+                elif type(shape) == shapes_2d.Rectangle:
+                    rectangle_centers.append(shape.center)
+                    rectangle_half_extents.append((shape.half_width,
+                                                   shape.half_height))
+                    rectangle_cars.append(car_index)
+                else:
+                    raise TypeError("Unsupported shape type: " +
+                                    type(shape).__name__)
+
+        return cls(numpy.reshape(circle_centers, (-1, 2)), circle_radii,
+                   circle_cars, numpy.reshape(rectangle_centers, (-1, 2)),
+                   numpy.reshape(rectangle_half_extents, (-1, 2)),
+                   rectangle_cars, len(cars))
+
+    @property
+    def number_of_cars(self):
+        return self._number_of_cars
+
+    @property
+    def circle_centers(self):
+        return self._circle_centers
+
+    @property
+    def circle_radii(self):
+        return self._circle_radii
+
+    @property
+    def circle_cars(self):
+        return self._circle_cars
+
+    @property
+    def rectangle_centers(self):
+        return self._rectangle_centers
+
+    @property
+    def rectangle_half_extents(self):
+        return self._rectangle_half_extents
+
+    @property
+    def rectangle_cars(self):
+        return self._rectangle_cars
+
+    def do_circles_overlap(self, first_indices, second_indices):
+        """
+        :return: boolean array, True where the circles at the given indices
+                 overlap
+        """
+        return do_circles_overlap(
+            self._circle_centers[first_indices],
+            self._circle_radii[first_indices],
+            self._circle_centers[second_indices],
+            self._circle_radii[second_indices])
+
+    def do_rectangles_overlap(self, first_indices, second_indices):
+        """
+        :return: boolean array, True where the rectangles at the given indices
+                 overlap
+        """
+        return do_rectangles_overlap(
+            self._rectangle_centers[first_indices],
+            self._rectangle_half_extents[first_indices],
+            self._rectangle_centers[second_indices],
+            self._rectangle_half_extents[second_indices])
+
+    def do_circles_overlap_rectangles(self, circle_indices,
+                                      rectangle_indices):
+        """
+        :return: boolean array, True where the circles at the given indices
+                 overlap the rectangles at the given indices
+        """
+        return do_circles_overlap_rectangles(
+            self._circle_centers[circle_indices],
+            self._circle_radii[circle_indices],
+            self._rectangle_centers[rectangle_indices],
+            self._rectangle_half_extents[rectangle_indices])
+
+    def do_these_cars_collide(self, first_cars, second_cars):
+        """
+        :param first_cars: array-like with the first car index of each pair
+        :param second_cars: array-like with the second car index of each pair
+        :return: boolean array, True where the two cars of the pair collide
+        """
+        first_cars = numpy.asarray(first_cars, dtype=numpy.int64)
+        second_cars = numpy.asarray(second_cars, dtype=numpy.int64)
+        collide = numpy.zeros(len(first_cars), dtype=bool)
+
+        pairs, first, second = _expand_pairs(
+            self._circle_offsets, self._circle_offsets, first_cars,
+            second_cars)
+        collide[pairs[self.do_circles_overlap(first, second)]] = True
+
+        pairs, first, second = _expand_pairs(
+            self._rectangle_offsets, self._rectangle_offsets, first_cars,
+            second_cars)
+        collide[pairs[self.do_rectangles_overlap(first, second)]] = True
+
+        pairs, first, second = _expand_pairs(
+            self._circle_offsets, self._rectangle_offsets, first_cars,
+            second_cars)
+        collide[pairs[self.do_circles_overlap_rectangles(first, second)]] = \
+            True
+
+        pairs, first, second = _expand_pairs(
+            self._rectangle_offsets, self._circle_offsets, first_cars,
+            second_cars)
+        collide[pairs[self.do_circles_overlap_rectangles(second, first)]] = \
+            True
+
+        return collide
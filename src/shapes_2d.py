@@ -17,12 +17,46 @@ def sqr(x):
     return x * x
 
 
+def to_point(point):
+    """
+    :param point: a pair of (x, y) coordinates
+    :return: the given point as a tuple of two floats; a tuple of floats is
+             returned as is, so that it is not copied
+    """
+    if type(point) is tuple and len(point) == 2 and \
+            type(point[0]) is float and type(point[1]) is float:
+        return point
+    x, y = point
+    return float(x), float(y)
+
+
+# Unit vectors along the x and y axes, i.e. the axes of the axis aligned
+# rectangles (see OrientedRectangle.axes)
+X_AND_Y_AXES = ((1.0, 0.0), (0.0, 1.0))
+
+
+def get_projection_radius(axis, axes, half_extents):
+    """
+    :param axis: a unit vector
+    :param axes: the unit vectors along the width and the height of a box
+    :param half_extents: the (half_width, half_height) of the box
+    :return: the half length of the projection of the box on the given axis
+    """
+    return (half_extents[0] * abs(axis[0] * axes[0][0] +
+                                  axis[1] * axes[0][1]) +
+            half_extents[1] * abs(axis[0] * axes[1][0] +
+                                  axis[1] * axes[1][1]))
+
+
 class Shape2D:
     """
-    Abstract class defining a generic two-dimensional shape
+    Abstract class defining a generic two-dimensional shape. The shapes are
+    immutable and slotted: they have no per-instance dictionary, which keeps
+    millions of them affordable.
     """
 
     __metaclass__ = ABCMeta
+    __slots__ = ()
 
     @abstractproperty
     def area(self):
@@ -35,18 +69,30 @@ class Shape2D:
         the axis aligned bounding box ((min_x, min_y), (max_x, max_y))
         """
 
+    @abstractmethod
+    def translated(self, offset):
+        """
+        :param offset: the (x, y) translation
+        :return: a copy of this shape translated by offset
+        """
+
 
 class CompositeShape(Shape2D):
     """
     Class defining a 2d-compound
     """
 
+    __slots__ = ("_shapes", "_bounding_box", "_bounding_volume_tree")
+
     def __init__(self, shapes):
         """
         :param shapes: list of 2d-shapes that within this 2d-compound
         """
-        # Check radius positiveness
-        self._shapes = shapes
+        # The shapes are frozen, so that the bounding box and the bounding
+        # volume tree can be cached
+        self._shapes = tuple(shapes)
+        self._bounding_box = None
+        self._bounding_volume_tree = None
 
     @property
     def area(self):
@@ -62,9 +108,30 @@ class CompositeShape(Shape2D):
 
     def get_bounding_box(self):
         """
+        The bounding box is computed on the first call and cached afterwards
         :return: the min and max coordinates points of this shape, which define
         the axis aligned bounding box ((min_x, min_y), (max_x, max_y))
         """
+        if self._bounding_box is None:
+            self._bounding_box = self.__compute_bounding_box()
+        return self._bounding_box
+
+    def translated(self, offset):
+        return CompositeShape([shape.translated(offset)
+                               for shape in self._shapes])
+
+    def get_bounding_volume_tree(self):
+        """
+        The tree is built on the first call and cached afterwards
+        :return: the root BoundingVolumeNode of a binary tree whose leaves are
+                 the shapes of this compound, or None if it has no shapes
+        """
+        if self._bounding_volume_tree is None and len(self._shapes) > 0:
+            self._bounding_volume_tree = BoundingVolumeNode.build(
+                [(shape.get_bounding_box(), shape) for shape in self._shapes])
+        return self._bounding_volume_tree
+
+    def __compute_bounding_box(self):
         min_coordinates = [math.inf, math.inf]
         max_coordinates = [-math.inf, -math.inf]
 
@@ -84,7 +151,62 @@ class CompositeShape(Shape2D):
             if shape_max_coordinates[1] > max_coordinates[1]:
                 max_coordinates[1] = shape_max_coordinates[1]
 
-        return min_coordinates, max_coordinates
+        return tuple(min_coordinates), tuple(max_coordinates)
+
+
+class BoundingVolumeNode:
+    """
+    Class defining a node of a bounding volume tree. A leaf holds one shape
+    (or any other object with a bounding box, e.g. a car); an internal node
+    holds two children and its box encloses both of them.
+    """
+
+    __slots__ = ("box", "shape", "left", "right")
+
+    def __init__(self, box, shape=None, left=None, right=None):
+        """
+        :param box: the bounding box ((min_x, min_y), (max_x, max_y))
+        :param shape: the shape (or object) of a leaf node
+        :param left: the first child of an internal node
+        :param right: the second child of an internal node
+        """
+        self.box = box
+        self.shape = shape
+        self.left = left
+        self.right = right
+
+    @classmethod
+    def build(cls, boxes_and_shapes):
+        """
+        Build the tree top-down, splitting the shapes in two halves along the
+        longest side of the enclosing box
+        :param boxes_and_shapes: non-empty list of (bounding_box, shape)
+        :return: the root node
+        """
+        if len(boxes_and_shapes) == 1:
+            return cls(*boxes_and_shapes[0])
+
+        box = ((min(item[0][0][0] for item in boxes_and_shapes),
+                min(item[0][0][1] for item in boxes_and_shapes)),
+               (max(item[0][1][0] for item in boxes_and_shapes),
+                max(item[0][1][1] for item in boxes_and_shapes)))
+        axis = 0 if box[1][0] - box[0][0] >= box[1][1] - box[0][1] else 1
+
+        boxes_and_shapes = sorted(
+            boxes_and_shapes, key=lambda item: item[0][0][axis] +
+            item[0][1][axis])
+        half = len(boxes_and_shapes) // 2
+        return cls(box, left=cls.build(boxes_and_shapes[:half]),
+                   right=cls.build(boxes_and_shapes[half:]))
+
+    @property
+    def is_leaf(self):
+        return self.shape is not None
+
+    @property
+    def area(self):
+        return (self.box[1][0] - self.box[0][0]) * \
+            (self.box[1][1] - self.box[0][1])
 
 
 class NonPolygon(Shape2D):
@@ -93,12 +215,47 @@ class NonPolygon(Shape2D):
     """
 
     __metaclass__ = ABCMeta
+    __slots__ = ()
 
     @abstractproperty
     def center(self):
         pass
 
 
+class Point(NonPolygon):
+    """
+    Class defining a point, i.e. a shape with no extent. A point overlaps a
+    shape if it lies strictly inside it.
+    """
+
+    __slots__ = ("_center",)
+
+    def __init__(self, center):
+        """
+        :param center: the coordinates of the point
+        """
+        self._center = to_point(center)
+
+    @property
+    def area(self):
+        return 0
+
+    @property
+    def center(self):
+        return self._center
+
+    def get_bounding_box(self):
+        """
+        :return: the min and max coordinates points of this shape, which define
+        the axis aligned bounding box ((min_x, min_y), (max_x, max_y))
+        """
+        return self._center, self._center
+
+    def translated(self, offset):
+        return Point((self._center[0] + offset[0],
+                      self._center[1] + offset[1]))
+
+
 class Polygon(Shape2D):
     """
     Class defining a polygonal 2d shape. These kind of shapes are defined by a
@@ -106,6 +263,7 @@ class Polygon(Shape2D):
     """
 
     __metaclass__ = ABCMeta
+    __slots__ = ()
 
 
 class Circle(NonPolygon):
@@ -113,6 +271,8 @@ class Circle(NonPolygon):
     Class defining a circle
     """
 
+    __slots__ = ("_center", "_radius", "_squared_radius")
+
     def __init__(self, center, radius):
         """
         :param center: the center of the circle
@@ -122,8 +282,9 @@ class Circle(NonPolygon):
         if radius <= 0:
             raise ValueError("Please provide a positive radius value")
         # Initialize attributes
-        self._center = center
-        self._radius = radius
+        self._center = to_point(center)
+        self._radius = float(radius)
+        self._squared_radius = self._radius * self._radius
 
     @property
     def area(self):
@@ -137,6 +298,10 @@ class Circle(NonPolygon):
     def radius(self):
         return self._radius
 
+    @property
+    def squared_radius(self):
+        return self._squared_radius
+
     def get_bounding_box(self):
         """
         :return: the min and max coordinates points of this shape, which define
@@ -146,6 +311,10 @@ class Circle(NonPolygon):
             ((self._center[0] - self._radius, self._center[1] - self._radius),
              (self._center[0] + self._radius, self._center[1] + self._radius))
 
+    def translated(self, offset):
+        return Circle((self._center[0] + offset[0],
+                       self._center[1] + offset[1]), self._radius)
+
     def evenly_distribute_points_along_circumference(self, number_of_points):
         """
         :param number_of_points: The number of points to be distributed along
@@ -175,6 +344,8 @@ class Rectangle(Polygon):
     Class defining a Rectangle
     """
 
+    __slots__ = ("_center", "_half_width", "_half_height")
+
     def __init__(self, center, half_width, half_height):
         # Check rectangle dimensions positiveness
         if half_height <= 0:
@@ -182,9 +353,9 @@ class Rectangle(Polygon):
         elif half_width <= 0:
             raise ValueError("Please provide a positive half_width value")
         # Initialize attributes
-        self._half_width = half_width
-        self._half_height = half_height
-        self._center = center
+        self._half_width = float(half_width)
+        self._half_height = float(half_height)
+        self._center = to_point(center)
 
     @classmethod
     def from_min_max_points(cls, min_point, max_point):
@@ -221,3 +392,103 @@ class Rectangle(Polygon):
                  self._center[1] - self._half_height),
                 (self._center[0] + self._half_width,
                  self._center[1] + self._half_height))
+
+    def translated(self, offset):
+        return Rectangle((self._center[0] + offset[0],
+                          self._center[1] + offset[1]),
+                         self._half_width, self._half_height)
+
+
+class OrientedRectangle(Polygon):
+    """
+    Class defining a rectangle rotated about its center (oriented bounding
+    box). Its axes, i.e. the unit vectors along its width and its height, are
+    computed once; its corners are computed on first use and cached.
+    """
+
+    __slots__ = ("_center", "_half_width", "_half_height", "_angle",
+                 "_axes", "_corners")
+
+    def __init__(self, center, half_width, half_height, angle):
+        """
+        :param center: the center of the rectangle
+        :param half_width: the half extent along the first axis
+        :param half_height: the half extent along the second axis
+        :param angle: the counterclockwise rotation of the first axis from the
+                      x axis, in radians
+        """
+        if half_height <= 0:
+            raise ValueError("Please provide a positive half_height value")
+        elif half_width <= 0:
+            raise ValueError("Please provide a positive half_width value")
+        self._center = to_point(center)
+        self._half_width = float(half_width)
+        self._half_height = float(half_height)
+        self._angle = float(angle)
+        cos_angle = math.cos(self._angle)
+        sin_angle = math.sin(self._angle)
+        self._axes = ((cos_angle, sin_angle), (-sin_angle, cos_angle))
+        self._corners = None
+
+    @property
+    def area(self):
+        return self._half_height * self._half_width * 4
+
+    @property
+    def center(self):
+        return self._center
+
+    @property
+    def half_width(self):
+        return self._half_width
+
+    @property
+    def half_height(self):
+        return self._half_height
+
+    @property
+    def angle(self):
+        return self._angle
+
+    @property
+    def axes(self):
+        """
+        :return: the unit vectors along the width and along the height
+        """
+        return self._axes
+
+    @property
+    def corners(self):
+        """
+        :return: the four corners, counterclockwise
+        """
+        if self._corners is None:
+            width_axis, height_axis = self._axes
+            width_x = width_axis[0] * self._half_width
+            width_y = width_axis[1] * self._half_width
+            height_x = height_axis[0] * self._half_height
+            height_y = height_axis[1] * self._half_height
+            center_x, center_y = self._center
+            self._corners = (
+                (center_x - width_x - height_x, center_y - width_y - height_y),
+                (center_x + width_x - height_x, center_y + width_y - height_y),
+                (center_x + width_x + height_x, center_y + width_y + height_y),
+                (center_x - width_x + height_x, center_y - width_y + height_y))
+        return self._corners
+
+    def get_bounding_box(self):
+        """
+        :return: the min and max coordinates points of this shape, which define
+        the axis aligned bounding box ((min_x, min_y), (max_x, max_y))
+        """
+        corners = self.corners
+        return ((min(corner[0] for corner in corners),
+                 min(corner[1] for corner in corners)),
+                (max(corner[0] for corner in corners),
+                 max(corner[1] for corner in corners)))
+
+    def translated(self, offset):
+        return OrientedRectangle((self._center[0] + offset[0],
+                                  self._center[1] + offset[1]),
+                                 self._half_width, self._half_height,
+                                 self._angle)
@@ -0,0 +1,206 @@
+"""
+This module provides a streaming loader of cars specifications stored in JSON
+Lines or CSV files. The files are read lazily and the cars are built in
+batches, so the memory usage does not depend on the file size.
+
+JSON Lines: one car per line, e.g.
+    {"name": "Fiat", "shapes": [
+        {"type": "rectangle", "center": [2, 2], "half_width": 1,
+         "half_height": 1},
+        {"type": "circle", "center": [0, 0], "radius": 1},
+        {"type": "oriented_rectangle", "center": [4, 2], "half_width": 1,
+         "half_height": 0.5, "angle": 0.3}]}
+
+CSV: one shape per row, after a header row; the rows of a car are contiguous.
+The angle column (in radians, for oriented rectangles) may be omitted:
+    car_name,shape_type,center_x,center_y,radius,half_width,half_height,angle
+    Fiat,rectangle,2,2,,1,1,
+    Fiat,circle,0,0,1,,,
+    Fiat,oriented_rectangle,4,2,,1,0.5,0.3
+"""
+
+import csv
+import itertools
+import json
+import math
+import os
+from src import car, shapes_2d
+
+CSV_COLUMNS = ("car_name", "shape_type", "center_x", "center_y", "radius",
+               "half_width", "half_height")
+CSV_ANGLE_COLUMN = "angle"
+
+
+class CarSpecsError(ValueError):
+    """
+    Error raised when a cars specifications file is not valid
+    """
+
+    def __init__(self, path, line_number, message):
+        """
+        :param path: the path of the file
+        :param line_number: the (1-based) line of the error
+        :param message: the description of the error
+        """
+        super().__init__(str(path) + ":" + str(line_number) + ": " + message)
+        self.path = path
+        self.line_number = line_number
+        self.message = message
+
+
+def _to_number(value, field):
+    """
+    :return: the given value as a finite float
+    """
+    if isinstance(value, bool):
+        raise ValueError(field + " must be a number")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(field + " must be a number, got " + repr(value))
+    if not math.isfinite(number):
+        raise ValueError(field + " must be finite")
+    return number
+
+
+def make_shape(shape_type, center, radius=None, half_width=None,
+               half_height=None, angle=None):
+    """
+    Builds a validated shape
+    :raise ValueError: if the shape type is unknown or a value is invalid
+    """
+    if not isinstance(shape_type, str):
+        raise ValueError("shape type must be a string")
+    if not isinstance(center, (list, tuple)) or len(center) != 2:
+        raise ValueError("center must be a pair of coordinates")
+    center = (_to_number(center[0], "center_x"),
+              _to_number(center[1], "center_y"))
+
+    if shape_type.lower() == "circle":
+        return shapes_2d.Circle(center, _to_number(radius, "radius"))
+    if shape_type.lower() == "rectangle":
+        return shapes_2d.Rectangle(center,
+                                   _to_number(half_width, "half_width"),
+                                   _to_number(half_height, "half_height"))
+    if shape_type.lower() == "oriented_rectangle":
+        return shapes_2d.OrientedRectangle(
+            center, _to_number(half_width, "half_width"),
+            _to_number(half_height, "half_height"),
+            _to_number(angle, "angle"))
+    raise ValueError("unknown shape type " + repr(shape_type))
+
+
+def _iter_json_lines_cars(path, lines):
+    for line_number, line in enumerate(lines, 1):
+        if line.strip() == "":
+            continue
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("expected a JSON object")
+            if "name" not in record:
+                raise ValueError("missing car name")
+            if not isinstance(record.get("shapes"), list):
+                raise ValueError("shapes must be a list")
+            shapes = []
+            for shape in record["shapes"]:
+                if not isinstance(shape, dict):
+                    raise ValueError("every shape must be a JSON object")
+                shapes.append(make_shape(shape.get("type"),
+                                         shape.get("center"),
+                                         shape.get("radius"),
+                                         shape.get("half_width"),
+                                         shape.get("half_height"),
+                                         shape.get("angle")))
+        except ValueError as error:
+            raise CarSpecsError(path, line_number, str(error)) from error
+        yield car.Car(record["name"], shapes)
+
+
+def _iter_csv_cars(path, lines):
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    columns = None if header is None else \
+        tuple(column.strip() for column in header)
+    if columns not in (CSV_COLUMNS, CSV_COLUMNS + (CSV_ANGLE_COLUMN,)):
+        raise CarSpecsError(path, 1, "the header must be " +
+                            ",".join(CSV_COLUMNS) + ", optionally followed "
+                            "by ," + CSV_ANGLE_COLUMN)
+
+    car_name = None
+    shapes = []
+    for row in reader:
+        if len(row) == 0:
+            continue
+        try:
+            if len(row) != len(columns):
+                raise ValueError("expected " + str(len(columns)) +
+                                 " fields, got " + str(len(row)))
+            if row[0] == "":
+                raise ValueError("missing car name")
+            shape = make_shape(row[1], (row[2], row[3]),
+                               *[value if value != "" else None
+                                 for value in row[4:]])
+        except ValueError as error:
+            raise CarSpecsError(path, reader.line_num, str(error)) from error
+
+        if row[0] != car_name:
+            if car_name is not None:
+                yield car.Car(car_name, shapes)
+            car_name = row[0]
+            shapes = []
+        shapes.append(shape)
+
+    if car_name is not None:
+        yield car.Car(car_name, shapes)
+
+
+def _iter_cars(path, specs_file, file_format):
+    with specs_file:
+        if file_format == "jsonl":
+            yield from _iter_json_lines_cars(path, specs_file)
+        else:
+            yield from _iter_csv_cars(path, specs_file)
+
+
+def iter_cars(path, file_format=None):
+    """
+    The format is checked and the file is opened when this function is
+    called; the cars are then read while iterating
+    :param path: the path of the cars specifications file
+    :param file_format: either "jsonl" or "csv"; by default, it is guessed
+                        from the file extension
+    :return: a generator of the validated cars, read lazily
+    :raise ValueError: if the format is unknown
+    :raise OSError: if the file cannot be opened
+    :raise CarSpecsError: on the first invalid line, while iterating
+    """
+    if file_format is None:
+        file_format = os.path.splitext(str(path))[1].lstrip(".").lower()
+        if file_format == "json":
+            file_format = "jsonl"
+    if file_format not in ("jsonl", "csv"):
+        raise ValueError("Unknown cars specifications format: " +
+                         repr(file_format))
+
+    specs_file = open(path, newline="", encoding="utf-8")
+    return _iter_cars(path, specs_file, file_format)
+
+
+def _iter_car_batches(cars, batch_size):
+    while True:
+        batch = list(itertools.islice(cars, batch_size))
+        if len(batch) == 0:
+            return
+        yield batch
+
+
+def iter_car_batches(path, batch_size=1000, file_format=None):
+    """
+    :param batch_size: the maximum number of cars per batch
+    :return: a generator of lists of at most batch_size cars
+    :raise ValueError: if batch_size is not positive or the format is unknown
+    """
+    if batch_size <= 0:
+        raise ValueError("Please provide a positive batch_size value")
+    return _iter_car_batches(iter_cars(path, file_format), batch_size)
@@ -0,0 +1,81 @@
+"""
+This module provides a static scene: the fixed part of a parking lot (walls,
+pillars, parked cars) compiled once into an immutable bounding volume tree.
+Every frame, only the dynamic cars are tested, against the scene and against
+each other; static cars are never tested against each other.
+"""
+
+from src import broad_phase, shapes_2d, overlaps_detection
+
+
+class StaticScene:
+    """
+    Class defining an immutable, query-optimised set of static cars
+    """
+
+    def __init__(self, cars):
+        """
+        :param cars: the static cars; they must not be changed afterwards
+        """
+        self._cars = tuple(cars)
+        # Index of each car, to report the pairs in a deterministic order
+        self._indices = {id(a_car): index
+                         for index, a_car in enumerate(self._cars)}
+        boxes_and_cars = [(a_car.bounding_box, a_car) for a_car in self._cars
+                          if len(a_car.shapes) > 0]
+        self._tree = (shapes_2d.BoundingVolumeNode.build(boxes_and_cars)
+                      if len(boxes_and_cars) > 0 else None)
+
+    @property
+    def cars(self):
+        return self._cars
+
+    def __len__(self):
+        return len(self._cars)
+
+    def query_bounding_box(self, bounding_box):
+        """
+        :return: the static cars whose bounding box overlaps (or touches) the
+                 given one, in scene order
+        """
+        result = []
+        nodes = [self._tree] if self._tree is not None else []
+        while nodes:
+            node = nodes.pop()
+            if not broad_phase.do_these_bounding_boxes_overlap(node.box,
+                                                               bounding_box):
+                continue
+            if node.is_leaf:
+                result.append(node.shape)
+            else:
+                nodes.append(node.left)
+                nodes.append(node.right)
+        result.sort(key=lambda a_car: self._indices[id(a_car)])
+        return result
+
+    def get_colliding_cars(self, a_car):
+        """
+        :return: the static cars colliding with the given car, in scene order
+        """
+        return [static_car for static_car in
+                self.query_bounding_box(a_car.bounding_box)
+                if overlaps_detection.do_these_cars_collide(a_car, static_car)]
+
+    def get_intersections(self, dynamic_cars):
+        """
+        :param dynamic_cars: the list of moving cars
+        :return: the intersecting pairs among the dynamic cars, ordered by
+                 their indices, followed by the (dynamic car, static car)
+                 intersecting pairs, ordered by dynamic then static index
+        """
+        result = []
+        for i, j in broad_phase.sweep_and_prune(
+                [a_car.bounding_box for a_car in dynamic_cars]):
+            if overlaps_detection.do_these_cars_collide(dynamic_cars[i],
+                                                        dynamic_cars[j]):
+                result.append((dynamic_cars[i], dynamic_cars[j]))
+
+        for dynamic_car in dynamic_cars:
+            for static_car in self.get_colliding_cars(dynamic_car):
+                result.append((dynamic_car, static_car))
+        return result
@@ -0,0 +1,206 @@
+"""
+This module splits the collision detection of a large set of cars into
+independent jobs over spatial tiles, e.g. to spread a city-scale scene over
+several machines. The jobs communicate through files only:
+    * the driver writes, for every non-empty tile, the scene snapshot of its
+      cars (tile_<k>.snapshot, see scene_snapshot) and their global indices
+      (tile_<k>.indices, int64)
+    * every job reads its tile, runs the broad and narrow phases and writes the
+      global indices of the colliding pairs (tile_<k>.pairs, int64)
+    * the driver merges the pairs and removes the duplicates found by several
+      tiles
+A car belongs to the tile containing the min corner of its bounding box, and
+to the tiles whose halo (the margin below their min corners, as large as the
+largest car bounding box) contains it. Hence both cars of any colliding pair
+belong to the tile containing the max of their min corners, and no pair is
+missed.
+
+A job runs as:
+    $ python3 -m src.tiling <directory> <tile_index>
+"""
+
+import array
+import math
+import os
+import subprocess
+import sys
+import tempfile
+from src import broad_phase, overlaps_detection, scene_snapshot
+
+# The directory from which "python -m src.tiling" can be run
+_ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def get_halo(bounding_boxes):
+    """
+    :return: the largest side of the given bounding boxes, those of the cars
+             without shapes (with infinite coordinates) left out
+    """
+    return max((max(box[1][0] - box[0][0], box[1][1] - box[0][1])
+                for box in bounding_boxes if math.isfinite(box[0][0])),
+               default=0.0)
+
+
+def _get_tile_range(coordinate, origin, tile_size, halo, tiles_per_side):
+    """
+    :return: the range of the tile coordinates, along one axis, of the tiles
+             whose core or halo contains the given min coordinate
+    """
+    first = math.floor((coordinate - origin) / tile_size)
+    last = math.floor((coordinate + halo - origin) / tile_size)
+    return range(min(max(first, 0), tiles_per_side - 1),
+                 min(max(last, 0), tiles_per_side - 1) + 1)
+
+
+def partition(bounding_boxes, tiles_per_side):
+    """
+    :param bounding_boxes: the list of the cars bounding boxes
+    :param tiles_per_side: the number of tiles along x and along y
+    :return: the list, by tile index (tile_y * tiles_per_side + tile_x), of
+             the sorted indices of the cars of every tile, halos included; the
+             cars without shapes, which cannot collide, belong to no tile
+    """
+    if tiles_per_side < 1:
+        raise ValueError("Please provide a positive number of tiles")
+    tiles = [[] for _ in range(tiles_per_side * tiles_per_side)]
+    finite_boxes = [box for box in bounding_boxes
+                    if math.isfinite(box[0][0])]
+    if len(finite_boxes) == 0:
+        return tiles
+
+    halo = get_halo(finite_boxes)
+    origin_x = min(box[0][0] for box in finite_boxes)
+    origin_y = min(box[0][1] for box in finite_boxes)
+    tile_size = max(max(box[0][0] for box in finite_boxes) - origin_x,
+                    max(box[0][1] for box in finite_boxes) - origin_y) / \
+        tiles_per_side
+    if tile_size == 0:
+        tile_size = 1.0
+
+    for car_index, box in enumerate(bounding_boxes):
+        if not math.isfinite(box[0][0]):
+            continue
+        for tile_y in _get_tile_range(box[0][1], origin_y, tile_size, halo,
+                                      tiles_per_side):
+            for tile_x in _get_tile_range(box[0][0], origin_x, tile_size,
+                                          halo, tiles_per_side):
+                tiles[tile_y * tiles_per_side + tile_x].append(car_index)
+    return tiles
+
+
+def _get_tile_path(directory, tile_index, extension):
+    return os.path.join(directory, "tile_" + str(tile_index) + extension)
+
+
+def write_tile(directory, tile_index, cars, car_indices):
+    """
+    Write the input files of the job of a tile
+    :param cars: the list of all the cars
+    :param car_indices: the indices of the cars of the tile
+    """
+    scene_snapshot.write_snapshot(
+        _get_tile_path(directory, tile_index, ".snapshot"),
+        (cars[car_index] for car_index in car_indices))
+    with open(_get_tile_path(directory, tile_index, ".indices"),
+              "wb") as indices_file:
+        array.array("q", car_indices).tofile(indices_file)
+
+
+def run_tile_job(directory, tile_index):
+    """
+    Find the colliding pairs of the cars of a tile, and write their global
+    indices to the output file of the tile
+    """
+    with scene_snapshot.SceneSnapshot(
+            _get_tile_path(directory, tile_index, ".snapshot")) as snapshot:
+        cars = snapshot.make_cars()
+    car_indices = array.array("q")
+    with open(_get_tile_path(directory, tile_index, ".indices"),
+              "rb") as indices_file:
+        car_indices.frombytes(indices_file.read())
+
+    pairs = array.array("q")
+    for i, j in broad_phase.sweep_and_prune(
+            [a_car.bounding_box for a_car in cars]):
+        if overlaps_detection.do_these_cars_collide(cars[i], cars[j]):
+            pairs.extend((car_indices[i], car_indices[j]))
+
+    # The output appears at once, so that a partial file is never read
+    output_path = _get_tile_path(directory, tile_index, ".pairs")
+    with open(output_path + ".tmp", "wb") as pairs_file:
+        pairs.tofile(pairs_file)
+    os.replace(output_path + ".tmp", output_path)
+
+
+def read_tile_pairs(directory, tile_index):
+    """
+    :return: the list of the global index pairs written by the job of a tile
+    """
+    pairs = array.array("q")
+    with open(_get_tile_path(directory, tile_index, ".pairs"),
+              "rb") as pairs_file:
+        pairs.frombytes(pairs_file.read())
+    return [(pairs[position], pairs[position + 1])
+            for position in range(0, len(pairs), 2)]
+
+
+def _run_jobs(directory, tile_indices, processes):
+    """
+    Run the jobs as local subprocesses, at most processes at a time
+    :raise RuntimeError: if a job fails
+    """
+    running = []
+    tile_indices = list(tile_indices)
+    while tile_indices or running:
+        while tile_indices and len(running) < processes:
+            tile_index = tile_indices.pop(0)
+            running.append((tile_index, subprocess.Popen(
+                [sys.executable, "-m", "src.tiling", directory,
+                 str(tile_index)],
+                cwd=_ROOT_DIRECTORY, stderr=subprocess.PIPE)))
+        tile_index, job = running.pop(0)
+        _, error = job.communicate()
+        if job.returncode != 0:
+            for _, other_job in running:
+                other_job.kill()
+                other_job.wait()
+            raise RuntimeError("The job of tile " + str(tile_index) +
+                               " failed:\n" + error.decode(errors="replace"))
+
+
+def find_colliding_pairs(cars, tiles_per_side=2, directory=None,
+                         processes=None):
+    """
+    :param cars: the list of cars, made of circles, rectangles and oriented
+                 rectangles
+    :param tiles_per_side: the number of tiles along x and along y
+    :param directory: the directory of the jobs files; by default, a
+                      temporary directory removed afterwards
+    :param processes: the maximum number of jobs running at the same time;
+                      by default, the number of processors
+    :return: the sorted list of the index pairs (i, j), with i < j, of the
+             colliding cars
+    """
+    if directory is None:
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            return find_colliding_pairs(cars, tiles_per_side,
+                                        temporary_directory, processes)
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    tiles = partition([a_car.bounding_box for a_car in cars], tiles_per_side)
+    # A tile with less than two cars has no pair
+    tile_indices = [tile_index for tile_index, car_indices in enumerate(tiles)
+                    if len(car_indices) > 1]
+    for tile_index in tile_indices:
+        write_tile(directory, tile_index, cars, tiles[tile_index])
+    _run_jobs(directory, tile_indices, processes)
+
+    pairs = set()
+    for tile_index in tile_indices:
+        pairs.update(read_tile_pairs(directory, tile_index))
+    return sorted(pairs)
+
+
+if __name__ == "__main__":
+    run_tile_job(sys.argv[1], int(sys.argv[2]))
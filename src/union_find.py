@@ -0,0 +1,79 @@
+"""
+This module provides a disjoint-set forest (union-find) over the indices of a
+collection, e.g. cars. It is fed one pair at a time, so that the connected
+components of a stream of colliding pairs are available without storing the
+pairs themselves.
+"""
+
+import array
+
+
+class UnionFind:
+    """
+    Class defining a disjoint-set forest over the indices 0..n-1, with union
+    by size and path halving
+    """
+
+    def __init__(self, number_of_items):
+        """
+        :param number_of_items: the number of indices; every index starts in
+                                its own set
+        """
+        self._parents = array.array("q", range(number_of_items))
+        self._sizes = array.array("q", [1]) * number_of_items
+        self._number_of_sets = number_of_items
+
+    def __len__(self):
+        return len(self._parents)
+
+    @property
+    def number_of_sets(self):
+        return self._number_of_sets
+
+    def find(self, index):
+        """
+        :return: the representative index of the set of the given index
+        """
+        parents = self._parents
+        while parents[index] != index:
+            # Path halving: skip every other ancestor on the way up
+            parents[index] = parents[parents[index]]
+            index = parents[index]
+        return index
+
+    def union(self, first_index, second_index):
+        """
+        Merge the sets of the two given indices
+        :return: True if they were in different sets
+        """
+        first_root = self.find(first_index)
+        second_root = self.find(second_index)
+        if first_root == second_root:
+            return False
+
+        if self._sizes[first_root] < self._sizes[second_root]:
+            first_root, second_root = second_root, first_root
+        self._parents[second_root] = first_root
+        self._sizes[first_root] += self._sizes[second_root]
+        self._number_of_sets -= 1
+        return True
+
+    def get_size(self, index):
+        """
+        :return: the number of indices in the set of the given index
+        """
+        return self._sizes[self.find(index)]
+
+    def get_groups(self, min_size=1):
+        """
+        :param min_size: the minimum number of indices of the returned sets
+        :return: the list of the sets of at least min_size indices, as sorted
+                 lists, ordered by their smallest index
+        """
+        groups = {}
+        for index in range(len(self._parents)):
+            root = self.find(index)
+            if self._sizes[root] >= min_size:
+                groups.setdefault(root, []).append(index)
+        # Dictionaries keep the insertion order, i.e. the smallest indices
+        return list(groups.values())
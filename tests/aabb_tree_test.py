@@ -0,0 +1,120 @@
+"""
+Unit tests for the aabb_tree module
+"""
+
+import random
+import unittest
+from src import aabb_tree, broad_phase
+
+
+def make_random_box(random_generator):
+    min_x = random_generator.uniform(0, 100)
+    min_y = random_generator.uniform(0, 100)
+    return ((min_x, min_y), (min_x + random_generator.uniform(0.1, 5),
+                             min_y + random_generator.uniform(0.1, 5)))
+
+
+class TestDynamicAABBTree(unittest.TestCase):
+    """
+    Tests for the class DynamicAABBTree
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        self.tree = aabb_tree.DynamicAABBTree(margin=0.5)
+        self.box_a = ((0, 0), (2, 2))
+        self.box_b = ((1, 1), (3, 3))
+        self.box_c = ((10, 10), (11, 11))
+        self.random_generator = random.Random(5)
+
+    def assert_tree_is_consistent(self, node, parent=None):
+        """
+        Check parent links, heights, balance and boxes enclosure recursively
+        """
+        self.assertIs(node.parent, parent)
+        if node.is_leaf:
+            self.assertEqual(node.height, 0)
+            return
+        self.assert_tree_is_consistent(node.left, node)
+        self.assert_tree_is_consistent(node.right, node)
+        self.assertEqual(node.height,
+                         1 + max(node.left.height, node.right.height))
+        self.assertLessEqual(abs(node.left.height - node.right.height), 1)
+        self.assertTrue(aabb_tree.does_the_box_contain(node.box,
+                                                       node.left.box))
+        self.assertTrue(aabb_tree.does_the_box_contain(node.box,
+                                                       node.right.box))
+
+    def test_insert_and_query(self):
+        proxy_a = self.tree.insert(self.box_a, "a")
+        proxy_b = self.tree.insert(self.box_b, "b")
+        proxy_c = self.tree.insert(self.box_c, "c")
+
+        self.assertEqual(len(self.tree), 3)
+        self.assertEqual(self.tree.get_item(proxy_b), "b")
+        self.assertEqual(self.tree.get_fat_bounding_box(proxy_a),
+                         ((-0.5, -0.5), (2.5, 2.5)))
+        self.assertEqual(self.tree.query(((1.5, 1.5), (1.6, 1.6))),
+                         [proxy_a, proxy_b])
+        # Fat boxes must not leak into the results
+        self.assertEqual(self.tree.query(((9.6, 9.6), (9.7, 9.7))), [])
+        self.assertEqual(self.tree.query_pairs(), [(proxy_a, proxy_b)])
+        self.assertEqual(self.tree.query_pairs([proxy_c]), [])
+
+    def test_remove(self):
+        proxy_a = self.tree.insert(self.box_a)
+        proxy_b = self.tree.insert(self.box_b)
+        self.tree.remove(proxy_a)
+
+        self.assertNotIn(proxy_a, self.tree)
+        self.assertEqual(self.tree.query(self.box_a), [proxy_b])
+        self.tree.remove(proxy_b)
+        self.assertEqual(self.tree.height, -1)
+        self.assertEqual(self.tree.query_pairs(), [])
+
+    def test_move_within_fat_box(self):
+        proxy_a = self.tree.insert(self.box_a)
+        self.tree.insert(self.box_c)
+
+        self.assertFalse(self.tree.move(proxy_a, ((0.4, 0.4), (2.4, 2.4))))
+        self.assertEqual(self.tree.get_bounding_box(proxy_a),
+                         ((0.4, 0.4), (2.4, 2.4)))
+        self.assertTrue(self.tree.move(proxy_a, ((9, 9), (10.5, 10.5))))
+        self.assertEqual(self.tree.query_pairs(), [(0, 1)])
+
+    def test_tree_stays_balanced(self):
+        # Inserting sorted boxes is the worst case for an unbalanced tree
+        for i in range(1024):
+            self.tree.insert(((i, 0), (i + 0.5, 1)))
+        self.assert_tree_is_consistent(self.tree._root)
+        self.assertLessEqual(self.tree.height, 20)
+
+    def test_same_pairs_as_sweep_and_prune_after_updates(self):
+        boxes = {}
+        for _ in range(300):
+            box = make_random_box(self.random_generator)
+            boxes[self.tree.insert(box)] = box
+        for proxy_id in range(0, 300, 7):
+            self.tree.remove(proxy_id)
+            del boxes[proxy_id]
+        for proxy_id in range(1, 300, 5):
+            if proxy_id in boxes:
+                boxes[proxy_id] = make_random_box(self.random_generator)
+                self.tree.move(proxy_id, boxes[proxy_id])
+
+        self.assert_tree_is_consistent(self.tree._root)
+        proxy_ids = sorted(boxes)
+        expected_pairs = [
+            (proxy_ids[i], proxy_ids[j])
+            for i, j in broad_phase.sweep_and_prune(
+                [boxes[proxy_id] for proxy_id in proxy_ids])]
+        self.assertEqual(self.tree.query_pairs(), expected_pairs)
+        self.assertEqual(self.tree.query_pairs([1, 6]),
+                         [pair for pair in expected_pairs
+                          if 1 in pair or 6 in pair])
+
+
+if __name__ == "__main__":
+    unittest.main()
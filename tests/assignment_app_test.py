@@ -0,0 +1,352 @@
+"""
+Unit tests for the assignment_app module
+"""
+
+import importlib.util
+import math
+import random
+import unittest
+import assignment_app
+from src import car, continuous_detection, overlaps_detection
+
+
+def make_random_cars_specs(number_of_cars, seed):
+    """
+    :return: reproducible specifications of cars scattered over a square lot
+    """
+    random_generator = random.Random(seed)
+    cars_specs = []
+    for car_index in range(number_of_cars):
+        x = random_generator.uniform(0, 60)
+        y = random_generator.uniform(0, 60)
+        cars_specs.append(
+            ("car_" + str(car_index),
+             ("rectangle", ((x, y), random_generator.uniform(0.5, 2.5),
+                            random_generator.uniform(0.5, 1.5))),
+             ("circle", ((x + random_generator.uniform(-2, 2),
+                          y + random_generator.uniform(-1, 1)),
+                         random_generator.uniform(0.3, 1.2)))))
+    return cars_specs
+
+
+def make_random_oriented_cars_specs(number_of_cars, seed):
+    """
+    :return: reproducible specifications of cars made of an oriented
+             rectangle and a circle, scattered over a square lot
+    """
+    random_generator = random.Random(seed)
+    cars_specs = []
+    for car_index in range(number_of_cars):
+        x = random_generator.uniform(0, 40)
+        y = random_generator.uniform(0, 40)
+        cars_specs.append(
+            ("car_" + str(car_index),
+             ("oriented_rectangle",
+              ((x, y), random_generator.uniform(0.5, 2.5),
+               random_generator.uniform(0.5, 1.5),
+               random_generator.uniform(-math.pi, math.pi))),
+             ("circle", ((x + random_generator.uniform(-2, 2),
+                          y + random_generator.uniform(-1, 1)),
+                         random_generator.uniform(0.3, 1.2)))))
+    return cars_specs
+
+
+def get_intersections_exhaustively(cars):
+    """
+    :return: the intersecting pairs found testing every pair of cars
+    """
+    return [(cars[i], cars[j])
+            for i in range(len(cars)) for j in range(i + 1, len(cars))
+            if overlaps_detection.do_these_cars_collide(cars[i], cars[j])]
+
+
+class TestGetIntersections(unittest.TestCase):
+    """
+    Tests for the function get_intersections
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        self.cars = assignment_app.make_cars([
+            ("Fiat",
+             ("rectangle", ((2, 2), 1, 1)),
+             ("circle", ((0, 0), 1))),
+            ("Maserati",
+             ("rectangle", ((10, 2), 1, 1)),
+             ("circle", ((8, 0), 1))),
+            ("Ferrari",
+             ("rectangle", ((11, 2), 1, 1)),
+             ("circle", ((13, 0), 1))),
+            ("Lamborghini",
+             ("rectangle", ((3.5, 2), 1, 1)),)])
+        self.random_cars = assignment_app.make_cars(
+            make_random_cars_specs(150, seed=3))
+
+    def test_no_cars(self):
+        self.assertEqual(assignment_app.get_intersections([]), [])
+
+    def test_intersecting_pairs(self):
+        pairs = assignment_app.get_intersections(self.cars)
+        self.assertEqual([(first.name, second.name) for first, second in pairs],
+                         [("Fiat", "Lamborghini"), ("Maserati", "Ferrari")])
+
+    def test_same_pairs_as_exhaustive_search(self):
+        self.assertEqual(assignment_app.get_intersections(self.random_cars),
+                         get_intersections_exhaustively(self.random_cars))
+
+    def test_oriented_rectangles(self):
+        cars = assignment_app.make_cars([
+            ("Fiat", ("oriented_rectangle", ((0, 0), 3, 1, math.pi / 4))),
+            ("Ferrari", ("rectangle", ((3, -1), 1, 1))),
+            ("Maserati", ("circle", ((-2, -2), 0.5)))])
+        pairs = assignment_app.get_intersections(cars)
+        self.assertEqual([(first.name, second.name) for first, second in pairs],
+                         [("Fiat", "Maserati")])
+
+    def test_spatial_hash_grid_method(self):
+        self.assertEqual(
+            assignment_app.get_intersections(self.random_cars,
+                                             method="spatial_hash_grid"),
+            get_intersections_exhaustively(self.random_cars))
+        self.assertEqual(
+            assignment_app.get_intersections(self.random_cars,
+                                             method="spatial_hash_grid",
+                                             cell_size=0.5),
+            get_intersections_exhaustively(self.random_cars))
+
+    def test_aabb_tree_method(self):
+        self.assertEqual(
+            assignment_app.get_intersections(self.random_cars,
+                                             method="aabb_tree"),
+            get_intersections_exhaustively(self.random_cars))
+
+    @unittest.skipIf(importlib.util.find_spec("numpy") is None,
+                     "NumPy is not installed")
+    def test_vectorized_narrow_phase(self):
+        self.assertEqual(
+            assignment_app.get_intersections(self.random_cars,
+                                             vectorized=True),
+            get_intersections_exhaustively(self.random_cars))
+
+    def test_worker_processes(self):
+        self.assertEqual(
+            assignment_app.get_intersections(self.random_cars, workers=3),
+            get_intersections_exhaustively(self.random_cars))
+        with self.assertRaises(ValueError):
+            assignment_app.get_intersections(self.random_cars, workers=2,
+                                             vectorized=True)
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            assignment_app.get_intersections(self.cars, method="octree")
+
+
+class TestMakeModelCars(unittest.TestCase):
+    """
+    Tests for the function make_model_cars
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        self.models_specs = [
+            ("sedan",
+             ("rectangle", ((0, 0), 2, 1)),
+             ("circle", ((-1.5, -1), 0.5)),
+             ("circle", ((1.5, -1), 0.5))),
+            ("van",
+             ("rectangle", ((0, 0.5), 2.5, 1.5)),)]
+        random_generator = random.Random(17)
+        self.cars_placements = [
+            ("car_" + str(i), random_generator.choice(["sedan", "van"]),
+             (random_generator.uniform(0, 40), random_generator.uniform(0, 40)))
+            for i in range(120)]
+
+    def test_cars_share_the_model_shapes(self):
+        cars = assignment_app.make_model_cars(self.models_specs,
+                                              self.cars_placements)
+        sedans = [a_car for a_car in cars if a_car.model.name == "sedan"]
+        self.assertIs(sedans[0].model, sedans[1].model)
+
+    def test_same_pairs_as_world_space_cars(self):
+        cars = assignment_app.make_model_cars(self.models_specs,
+                                              self.cars_placements)
+        world_space_cars = [car.Car(a_car.name, a_car.shapes)
+                            for a_car in cars]
+
+        pairs = [(first.name, second.name) for first, second in
+                 assignment_app.get_intersections(cars)]
+        self.assertEqual(
+            pairs, [(first.name, second.name) for first, second in
+                    get_intersections_exhaustively(world_space_cars)])
+        self.assertTrue(len(pairs) > 0)
+
+
+class TestIterIntersections(unittest.TestCase):
+    """
+    Tests for the functions iter_intersections and any_collision
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        self.random_cars = assignment_app.make_cars(
+            make_random_cars_specs(150, seed=3))
+        self.far_apart_cars = assignment_app.make_cars(
+            [("car_" + str(i), ("circle", ((3 * i, 0), 1))) for i in range(20)])
+
+    def test_same_pairs_as_get_intersections(self):
+        pairs = assignment_app.iter_intersections(self.random_cars)
+        self.assertFalse(isinstance(pairs, list))
+        self.assertEqual(
+            sorted(pairs, key=lambda pair: (self.random_cars.index(pair[0]),
+                                            self.random_cars.index(pair[1]))),
+            assignment_app.get_intersections(self.random_cars))
+
+    def test_max_pairs(self):
+        all_pairs = list(assignment_app.iter_intersections(self.random_cars))
+        self.assertEqual(
+            list(assignment_app.iter_intersections(self.random_cars,
+                                                   max_pairs=5)),
+            all_pairs[:5])
+        self.assertEqual(
+            list(assignment_app.iter_intersections(self.random_cars,
+                                                   max_pairs=0)), [])
+
+    def test_any_collision(self):
+        self.assertTrue(assignment_app.any_collision(self.random_cars))
+        self.assertFalse(assignment_app.any_collision(self.far_apart_cars))
+        self.assertFalse(assignment_app.any_collision([]))
+
+
+class TestGetCollisionClusters(unittest.TestCase):
+    """
+    Tests for the function get_collision_clusters
+    """
+
+    def test_pile_ups(self):
+        cars = assignment_app.make_cars(
+            [("car_" + str(i), ("circle", ((x, 0), 1)))
+             for i, x in enumerate([0, 10, 1.5, 20, 3, 11.5, 30])])
+        clusters = assignment_app.get_collision_clusters(cars)
+        self.assertEqual([[a_car.name for a_car in cluster]
+                          for cluster in clusters],
+                         [["car_0", "car_2", "car_4"], ["car_1", "car_5"]])
+        self.assertEqual(len(assignment_app.get_collision_clusters(
+            cars, min_size=1)), 4)
+        self.assertEqual(assignment_app.get_collision_clusters([]), [])
+
+    def test_clusters_of_random_cars(self):
+        cars = assignment_app.make_cars(make_random_cars_specs(150, seed=3))
+        clusters = assignment_app.get_collision_clusters(cars, min_size=1)
+        self.assertEqual(sorted(a_car.name for cluster in clusters
+                                for a_car in cluster),
+                         sorted(a_car.name for a_car in cars))
+        cluster_of_car = {id(a_car): cluster_index
+                          for cluster_index, cluster in enumerate(clusters)
+                          for a_car in cluster}
+        for first_car, second_car in assignment_app.get_intersections(cars):
+            self.assertEqual(cluster_of_car[id(first_car)],
+                             cluster_of_car[id(second_car)])
+
+
+class TestGetProximities(unittest.TestCase):
+    """
+    Tests for the function get_proximities
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        self.random_cars = assignment_app.make_cars(
+            make_random_cars_specs(150, seed=3))
+
+    def test_zero_margin_matches_get_intersections(self):
+        self.assertEqual(
+            [(first, second) for first, second, _ in
+             assignment_app.get_proximities(self.random_cars, 0)],
+            assignment_app.get_intersections(self.random_cars))
+
+    def test_near_misses(self):
+        cars = assignment_app.make_cars([
+            ("Fiat", ("circle", ((0, 0), 1))),
+            ("Ferrari", ("rectangle", ((3, 3), 1, 1))),
+            ("Maserati", ("circle", ((10, 0), 1)))])
+        proximities = assignment_app.get_proximities(cars, 2)
+        self.assertEqual([(first.name, second.name)
+                          for first, second, _ in proximities],
+                         [("Fiat", "Ferrari")])
+        self.assertAlmostEqual(proximities[0][2], math.sqrt(8) - 1)
+        self.assertRaises(ValueError, assignment_app.get_proximities, cars,
+                          -1)
+
+    def test_same_pairs_as_exhaustive_search(self):
+        margin = 1.5
+        oriented_cars = assignment_app.make_cars(
+            make_random_oriented_cars_specs(100, seed=4))
+        for cars in (self.random_cars, oriented_cars):
+            self.assertEqual(
+                [(first, second) for first, second, _ in
+                 assignment_app.get_proximities(cars, margin)],
+                [(first, second)
+                 for i, first in enumerate(cars) for second in cars[i + 1:]
+                 if overlaps_detection.get_cars_distance_within(
+                     first, second, margin) is not None])
+            self.assertEqual(
+                [(first, second) for first, second, _ in
+                 assignment_app.get_proximities(cars, 0)],
+                assignment_app.get_intersections(cars))
+
+
+class TestGetSweptIntersections(unittest.TestCase):
+    """
+    Tests for the function get_swept_intersections
+    """
+
+    def test_still_cars_collide_at_the_start(self):
+        cars = assignment_app.make_cars(make_random_cars_specs(150, seed=3))
+        self.assertEqual(
+            assignment_app.get_swept_intersections(cars, [(0, 0)] * 150),
+            [(first, second, 0)
+             for first, second in assignment_app.get_intersections(cars)])
+
+    def test_tunnelling_cars(self):
+        cars = assignment_app.make_cars([("Fiat", ("circle", ((0, 0), 1))),
+                                         ("Ferrari", ("circle", ((10, 0), 1)))])
+        displacements = [(0, 0), (-20, 0)]
+        self.assertEqual(assignment_app.get_intersections(cars), [])
+        self.assertEqual(
+            assignment_app.get_swept_intersections(cars, displacements),
+            [(cars[0], cars[1], 0.4)])
+
+    def test_oriented_rectangles(self):
+        cars = assignment_app.make_cars(
+            make_random_oriented_cars_specs(100, seed=4))
+        random_generator = random.Random(5)
+        displacements = [(random_generator.uniform(-5, 5),
+                          random_generator.uniform(-5, 5))
+                         for _ in cars]
+        self.assertEqual(
+            assignment_app.get_swept_intersections(cars, [(0, 0)] * 100),
+            [(first, second, 0)
+             for first, second in assignment_app.get_intersections(cars)])
+        swept_intersections = assignment_app.get_swept_intersections(
+            cars, displacements)
+        self.assertGreater(len(swept_intersections),
+                           len(assignment_app.get_intersections(cars)))
+        self.assertEqual(
+            [(first, second) for first, second, _ in swept_intersections],
+            [(cars[i], cars[j])
+             for i in range(100) for j in range(i + 1, 100)
+             if continuous_detection.get_time_of_impact(
+                 cars[i], cars[j], displacements[i], displacements[j])
+             is not None])
+
+
+if __name__ == "__main__":
+    unittest.main()
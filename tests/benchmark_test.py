@@ -0,0 +1,53 @@
+"""
+Unit tests for the benchmarks harness
+"""
+
+import json
+import unittest
+import assignment_app
+from benchmarks import benchmark
+
+
+class TestBenchmark(unittest.TestCase):
+    """
+    Tests for the scene generator and the benchmark runner
+    """
+
+    def test_scene_is_reproducible(self):
+        self.assertEqual(benchmark.generate_scene_specs(50, seed=4),
+                         benchmark.generate_scene_specs(50, seed=4))
+        self.assertNotEqual(benchmark.generate_scene_specs(50, seed=4),
+                            benchmark.generate_scene_specs(50, seed=5))
+
+    def test_scene_specs_format(self):
+        cars_specs = benchmark.generate_scene_specs(30, shapes_per_car=3,
+                                                    circle_fraction=1)
+        cars = assignment_app.make_cars(cars_specs)
+        self.assertEqual(len(cars), 30)
+        self.assertTrue(all(len(a_car.shapes) == 3 for a_car in cars))
+        self.assertTrue(all(spec[0] == "circle"
+                            for car_specs in cars_specs
+                            for spec in car_specs[1:]))
+
+    def test_invalid_density(self):
+        with self.assertRaises(ValueError):
+            benchmark.generate_scene_specs(10, density=0)
+
+    def test_run_benchmarks(self):
+        results = benchmark.run_benchmarks(
+            60, density=0.5, repeat=1,
+            methods=("exhaustive", "sweep_and_prune"), kernel_pairs=10)
+
+        json.dumps(results)
+        self.assertEqual(results["scene"]["cars"], 60)
+        self.assertEqual(results["get_intersections"]["exhaustive"]["pairs"],
+                         results["get_intersections"]["sweep_and_prune"]
+                         ["pairs"])
+        self.assertGreater(results["memory"]["bytes_per_shape"], 0)
+        self.assertEqual(set(results["kernels"]["seconds_per_call"]),
+                         {"circle/circle", "rectangle/rectangle",
+                          "circle/rectangle"})
+
+
+if __name__ == "__main__":
+    unittest.main()
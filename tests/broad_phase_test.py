@@ -0,0 +1,129 @@
+"""
+Unit tests for the broad_phase module
+"""
+
+import random
+import unittest
+from src import broad_phase, car, shapes_2d
+
+
+class TestSweepAndPrune(unittest.TestCase):
+    """
+    Tests for the function sweep_and_prune
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        self.box_a = ((0, 0), (2, 2))
+        self.box_b = ((1, 1), (3, 3))
+        self.box_c = ((2, 0), (4, 1))
+        self.box_d = ((10, 10), (11, 11))
+        self.box_e = ((0, 5), (4, 6))
+
+    def test_no_boxes(self):
+        self.assertEqual(broad_phase.sweep_and_prune([]), [])
+
+    def test_overlapping_and_touching_boxes(self):
+        """
+        Touching boxes are kept as candidates: the narrow phase decides.
+        """
+        pairs = broad_phase.sweep_and_prune([self.box_a, self.box_b,
+                                             self.box_c, self.box_d])
+        self.assertEqual(pairs, [(0, 1), (0, 2), (1, 2)])
+
+    def test_boxes_overlapping_along_x_only(self):
+        """
+        Boxes overlapping on the sweep axis but apart along y are discarded
+        """
+        pairs = broad_phase.sweep_and_prune([self.box_a, self.box_e])
+        self.assertEqual(pairs, [])
+
+    def test_pairs_ordered_by_indices(self):
+        pairs = broad_phase.sweep_and_prune([self.box_c, self.box_b,
+                                             self.box_a])
+        self.assertEqual(pairs, [(0, 1), (0, 2), (1, 2)])
+
+    def test_same_pairs_as_exhaustive_search(self):
+        random_generator = random.Random(7)
+        boxes = []
+        for _ in range(200):
+            min_x = random_generator.uniform(0, 100)
+            min_y = random_generator.uniform(0, 100)
+            boxes.append(((min_x, min_y),
+                          (min_x + random_generator.uniform(0.1, 8),
+                           min_y + random_generator.uniform(0.1, 8))))
+
+        expected_pairs = [
+            (i, j) for i in range(len(boxes)) for j in range(i + 1, len(boxes))
+            if broad_phase.do_these_bounding_boxes_overlap(boxes[i], boxes[j])]
+
+        self.assertEqual(broad_phase.sweep_and_prune(boxes), expected_pairs)
+
+
+class TestSpatialHashGrid(unittest.TestCase):
+    """
+    Tests for the class SpatialHashGrid
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        self.car_a = car.Car("a", [shapes_2d.Rectangle((1, 1), 1, 1)])
+        self.car_b = car.Car("b", [shapes_2d.Circle((3, 1), 1)])
+        self.car_c = car.Car("c", [shapes_2d.Rectangle((9, 9), 1, 1)])
+        self.car_d = car.Car("d", [shapes_2d.Rectangle((3, 3), 4, 0.5)])
+
+    def test_automatic_cell_size(self):
+        grid = broad_phase.SpatialHashGrid([self.car_a, self.car_b,
+                                            self.car_d])
+        self.assertEqual(grid.cell_size, 2)
+
+    def test_invalid_cell_size(self):
+        with self.assertRaises(ValueError):
+            broad_phase.SpatialHashGrid([self.car_a], cell_size=0)
+
+    def test_cells_covered_by_bounding_box(self):
+        grid = broad_phase.SpatialHashGrid(cell_size=2)
+        self.assertEqual(grid.get_cells(((-1, 0), (2, 1))),
+                         [(-1, 0), (0, 0), (1, 0)])
+
+    def test_candidate_pairs(self):
+        grid = broad_phase.SpatialHashGrid([self.car_a, self.car_b,
+                                            self.car_c], cell_size=2)
+        self.assertEqual(grid.candidate_pairs(), [(0, 1)])
+        self.assertEqual(grid.insert(self.car_d), 3)
+        self.assertEqual(grid.candidate_pairs(), [(0, 1), (0, 3), (1, 3)])
+        self.assertEqual(grid.get_cars_in_cell((4, 4)), [2])
+
+    def test_candidate_pairs_include_sweep_and_prune_pairs(self):
+        random_generator = random.Random(11)
+        cars = [car.Car(str(i), [shapes_2d.Circle(
+            (random_generator.uniform(0, 50), random_generator.uniform(0, 50)),
+            random_generator.uniform(0.2, 3))]) for i in range(150)]
+        bounding_boxes = [a_car.shapes[0].get_bounding_box() for a_car in cars]
+
+        grid_pairs = broad_phase.SpatialHashGrid(cars).candidate_pairs()
+        self.assertTrue(
+            set(broad_phase.sweep_and_prune(bounding_boxes)) <= set(grid_pairs))
+
+    def test_oversized_car(self):
+        ground = car.Car("ground", [shapes_2d.Rectangle((0, 0), 5000, 5000)])
+        far_car = car.Car("far", [shapes_2d.Circle((6000, 0), 1)])
+        grid = broad_phase.SpatialHashGrid(
+            [self.car_a, self.car_b, ground, self.car_c, far_car], cell_size=2)
+
+        self.assertEqual(grid.oversized_cars, [2])
+        self.assertEqual(grid.get_cars_in_cell((0, 0)), [0])
+        self.assertEqual(grid.candidate_pairs(),
+                         [(0, 1), (0, 2), (1, 2), (2, 3)])
+        self.assertEqual(grid.insert(self.car_d), 5)
+        self.assertEqual(grid.candidate_pairs(),
+                         [(0, 1), (0, 2), (0, 5), (1, 2), (1, 5), (2, 3),
+                          (2, 5)])
+
+
+if __name__ == "__main__":
+    unittest.main()
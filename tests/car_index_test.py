@@ -0,0 +1,85 @@
+"""
+Unit tests for the car_index module
+"""
+
+import random
+import unittest
+from src import car, shapes_2d, overlaps_detection, car_index
+
+
+class TestCarIndex(unittest.TestCase):
+    """
+    Tests for the class CarIndex
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        self.car_a = car.Car("a", [shapes_2d.Rectangle((0, 0), 2, 1),
+                                   shapes_2d.Circle((2, 1), 1)])
+        self.car_b = car.Car("b", [shapes_2d.Circle((6, 0), 1.5)])
+        model = car.CarModel("m", [shapes_2d.Rectangle((0, 0), 1, 1)])
+        self.car_c = car.ModelCar("c", model, (10, 10))
+        self.index = car_index.CarIndex([self.car_a, self.car_b, self.car_c])
+
+    def test_query_point(self):
+        self.assertEqual(self.index.query_point((0, 0)), [self.car_a])
+        # Inside the bounding box of car a, but outside its shapes
+        self.assertEqual(self.index.query_point((2.9, -0.9)), [])
+        self.assertEqual(self.index.query_point((10.5, 9.5)), [self.car_c])
+        # Points on the boundary are not contained
+        self.assertEqual(self.index.query_point((11, 10)), [])
+
+    def test_query_radius(self):
+        self.assertEqual(self.index.query_radius((4, 0), 0.6),
+                         [self.car_b])
+        self.assertEqual(self.index.query_radius((4, 0), 2.1),
+                         [self.car_a, self.car_b])
+
+    def test_query_rectangle(self):
+        self.assertEqual(self.index.query_rectangle((5, 5), (9.5, 9.5)),
+                         [self.car_c])
+        self.assertEqual(self.index.query_rectangle((3, 3), (8, 8)), [])
+
+    def test_query_composite_shape(self):
+        query = shapes_2d.CompositeShape([shapes_2d.Circle((-3, 0), 1.1),
+                                          shapes_2d.Circle((8, 8), 0.5)])
+        self.assertEqual(self.index.query_shape(query), [self.car_a])
+
+    def test_add_remove_and_update(self):
+        self.index.remove(self.car_a)
+        self.assertEqual(len(self.index), 2)
+        self.assertNotIn(self.car_a, self.index)
+        self.assertEqual(self.index.query_point((0, 0)), [])
+
+        self.car_c.move_to((0, 0))
+        self.index.update(self.car_c)
+        self.assertEqual(self.index.query_point((0, 0)), [self.car_c])
+
+        self.index.add(self.car_a)
+        with self.assertRaises(ValueError):
+            self.index.add(self.car_a)
+
+    def test_same_results_as_exhaustive_search(self):
+        random_generator = random.Random(23)
+        cars = [car.Car(str(i), [
+            shapes_2d.Rectangle((random_generator.uniform(0, 50),
+                                 random_generator.uniform(0, 50)),
+                                random_generator.uniform(0.5, 2),
+                                random_generator.uniform(0.5, 2))])
+            for i in range(200)]
+        index = car_index.CarIndex(cars)
+
+        for _ in range(20):
+            query = shapes_2d.Circle((random_generator.uniform(0, 50),
+                                      random_generator.uniform(0, 50)),
+                                     random_generator.uniform(0.5, 6))
+            expected = [a_car for a_car in cars
+                        if overlaps_detection.OverlappingShapesDetector.
+                        do_these_two_shapes_overlap(query, a_car.composite)]
+            self.assertEqual(index.query_shape(query), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
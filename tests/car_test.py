@@ -0,0 +1,128 @@
+"""
+Unit tests for the car module
+"""
+
+import math
+import unittest
+from src import car, shapes_2d, parallel
+from src import collision_stats, overlaps_detection
+
+
+class TestCar(unittest.TestCase):
+    """
+    Tests for the class Car
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        self.car_a = car.Car("Fiat", [shapes_2d.Rectangle((2, 2), 1, 1),
+                                      shapes_2d.Circle((0, 0), 1)])
+
+    def test_bounding_box(self):
+        self.assertEqual(self.car_a.bounding_box, ((-1, -1), (3, 3)))
+
+    def test_bounding_box_is_cached(self):
+        composite = self.car_a.composite
+        self.assertIs(self.car_a.composite, composite)
+        self.assertIs(self.car_a.bounding_box, self.car_a.bounding_box)
+        self.assertEqual(self.car_a.version, 0)
+
+    def test_add_shape_invalidates_bounding_box(self):
+        composite = self.car_a.composite
+        self.car_a.add_shape(shapes_2d.Circle((5, 0), 1))
+
+        self.assertEqual(self.car_a.version, 1)
+        self.assertIsNot(self.car_a.composite, composite)
+        self.assertEqual(len(self.car_a.shapes), 3)
+        self.assertEqual(self.car_a.bounding_box, ((-1, -1), (6, 3)))
+
+    def test_set_shapes_invalidates_bounding_box(self):
+        self.car_a.bounding_box
+        self.car_a.set_shapes([shapes_2d.Circle((10, 10), 2)])
+
+        self.assertEqual(self.car_a.version, 1)
+        self.assertEqual(self.car_a.bounding_box, ((8, 8), (12, 12)))
+
+    def test_shapes_cannot_be_mutated_in_place(self):
+        with self.assertRaises(AttributeError):
+            self.car_a.shapes.append(shapes_2d.Circle((5, 0), 1))
+
+    def test_cars_are_slotted(self):
+        with self.assertRaises(AttributeError):
+            self.car_a.color = "red"
+
+
+class TestModelCar(unittest.TestCase):
+    """
+    Tests for the classes CarModel and ModelCar
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        self.model = car.CarModel("Panda", [shapes_2d.Rectangle((0, 0), 2, 1),
+                                            shapes_2d.Circle((2, 0), 1)])
+        self.car_a = car.ModelCar("a", self.model, (10, 5))
+        self.car_b = car.ModelCar("b", self.model, (-3, 0))
+
+    def test_model_bounding_volumes(self):
+        self.assertEqual(self.model.bounding_box, ((-2, -1), (3, 1)))
+        center, radius = self.model.bounding_circle
+        self.assertEqual(center, (0.5, 0))
+        # The farthest point is the rectangle corner (-2, -1)
+        self.assertAlmostEqual(radius, math.hypot(2.5, 1))
+
+    def test_bounding_circles_reject_corner_pairs(self):
+        model = car.CarModel("Wheel", [shapes_2d.Circle((0, 0), 1)])
+        stats = collision_stats.CollisionStats()
+        with collision_stats.collect(stats):
+            self.assertFalse(overlaps_detection.do_these_cars_collide(
+                car.ModelCar("a", model, (0, 0)),
+                car.ModelCar("b", model, (1.5, 1.5))))
+            self.assertTrue(overlaps_detection.do_these_cars_collide(
+                car.ModelCar("a", model, (0, 0)),
+                car.ModelCar("b", model, (1.4, 1.4))))
+        # The bounding boxes overlap in both cases, the bounding circles only
+        # in the second one
+        self.assertEqual(stats.bounding_box_rejections, 0)
+        self.assertEqual(stats.kernel_calls["circle/circle"], 1)
+
+    def test_shapes_are_shared(self):
+        self.assertIs(self.car_a.local_composite, self.car_b.local_composite)
+        self.assertEqual(self.car_a.bounding_box, ((8, 4), (13, 6)))
+
+    def test_world_space_shapes(self):
+        self.assertEqual([shape.center for shape in self.car_a.shapes],
+                         [(10, 5), (12, 5)])
+        self.assertEqual(self.car_a.composite.get_bounding_box(),
+                         self.car_a.bounding_box)
+
+    def test_world_space_shapes_are_not_kept(self):
+        self.assertIsNot(self.car_a.shapes, self.car_a.shapes)
+        parallel.pack_cars([self.car_a, self.car_b])
+        self.assertEqual(self.car_a._shapes, ())
+
+    def test_move_to(self):
+        self.car_a.bounding_box
+        self.car_a.shapes
+        self.car_a.move_to((0, 0))
+
+        self.assertEqual(self.car_a.version, 1)
+        self.assertEqual(self.car_a.offset, (0, 0))
+        self.assertEqual(self.car_a.bounding_box, ((-2, -1), (3, 1)))
+        self.assertEqual(self.car_a.shapes[1].center, (2, 0))
+
+    def test_cars_are_slotted(self):
+        self.assertFalse(hasattr(self.car_a, "__dict__"))
+        self.assertFalse(hasattr(self.model, "__dict__"))
+
+    def test_shapes_cannot_be_changed(self):
+        with self.assertRaises(TypeError):
+            self.car_a.add_shape(shapes_2d.Circle((5, 0), 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
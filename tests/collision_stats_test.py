@@ -0,0 +1,90 @@
+"""
+Unit tests for the collision_stats module
+"""
+
+import threading
+import unittest
+import assignment_app
+from benchmarks import benchmark
+from src import car, shapes_2d, overlaps_detection, collision_stats
+
+
+class TestCollisionStats(unittest.TestCase):
+    """
+    Tests for the class CollisionStats and the function collect
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        self.cars = [
+            car.Car("a", [shapes_2d.Rectangle((0, 0), 1, 1),
+                          shapes_2d.Circle((2, 0), 1)]),
+            car.Car("b", [shapes_2d.Circle((3.5, 0), 1)]),
+            car.Car("c", [shapes_2d.Rectangle((30, 0), 1, 1)])]
+        self.stats = collision_stats.CollisionStats()
+
+    def test_collect_counters(self):
+        with collision_stats.collect(self.stats):
+            self.assertTrue(overlaps_detection.do_these_cars_collide(
+                self.cars[0], self.cars[1]))
+            self.assertFalse(overlaps_detection.do_these_cars_collide(
+                self.cars[0], self.cars[2]))
+
+        self.assertEqual(self.stats.car_pairs, 2)
+        # Only the bounding boxes of the cars are counted, once per car pair
+        self.assertEqual(self.stats.bounding_box_tests, 2)
+        self.assertEqual(self.stats.bounding_box_rejections, 1)
+        self.assertEqual(self.stats.kernel_calls,
+                         {"circle/circle": 1, "rectangle/rectangle": 0,
+                          "circle/rectangle": 0})
+
+    def test_rejections_within_car_pairs(self):
+        cars = assignment_app.make_cars(benchmark.generate_scene_specs(
+            200, density=0.5, shapes_per_car=4, seed=3))
+        with collision_stats.collect(self.stats):
+            for first_index, first_car in enumerate(cars):
+                for second_car in cars[first_index + 1:]:
+                    overlaps_detection.do_these_cars_collide(first_car,
+                                                             second_car)
+
+        self.assertEqual(self.stats.car_pairs, 200 * 199 // 2)
+        self.assertEqual(self.stats.bounding_box_tests, self.stats.car_pairs)
+        self.assertGreater(self.stats.bounding_box_rejections, 0)
+        self.assertLessEqual(self.stats.bounding_box_rejections,
+                             self.stats.car_pairs)
+
+    def test_collection_is_stopped(self):
+        with self.assertRaises(RuntimeError):
+            with collision_stats.collect(self.stats):
+                raise RuntimeError()
+
+        overlaps_detection.do_these_cars_collide(self.cars[0], self.cars[1])
+        self.assertEqual(self.stats.car_pairs, 0)
+        self.assertEqual(self.stats.kernel_calls["circle/circle"], 0)
+
+    def test_other_threads_are_not_counted(self):
+        thread = threading.Thread(
+            target=overlaps_detection.do_these_cars_collide,
+            args=(self.cars[0], self.cars[1]))
+        with collision_stats.collect(self.stats):
+            thread.start()
+            thread.join()
+
+        self.assertEqual(self.stats.car_pairs, 0)
+
+    def test_get_intersections_stats(self):
+        pairs = assignment_app.get_intersections(self.cars, stats=self.stats)
+
+        self.assertEqual(pairs, [(self.cars[0], self.cars[1])])
+        # Only the candidate pair left by the broad phase is tested
+        self.assertEqual(self.stats.car_pairs, 1)
+        self.assertGreater(self.stats.bounding_box_seconds, 0)
+        self.assertGreater(self.stats.narrow_phase_seconds, 0)
+        self.assertEqual(self.stats.as_dict()["kernel_calls"]
+                         ["circle/circle"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
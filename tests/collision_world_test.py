@@ -0,0 +1,116 @@
+"""
+Unit tests for the collision_world module
+"""
+
+import random
+import unittest
+from src import car, shapes_2d, overlaps_detection, collision_world
+
+
+def get_colliding_pairs(cars):
+    """
+    :return: the colliding pairs found testing every pair of cars
+    """
+    return [(cars[i], cars[j])
+            for i in range(len(cars)) for j in range(i + 1, len(cars))
+            if overlaps_detection.do_these_cars_collide(cars[i], cars[j])]
+
+
+class TestCollisionWorld(unittest.TestCase):
+    """
+    Tests for the class CollisionWorld
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        self.car_a = car.Car("a", [shapes_2d.Rectangle((0, 0), 1, 1)])
+        self.car_b = car.Car("b", [shapes_2d.Circle((1.5, 0), 1)])
+        model = car.CarModel("m", [shapes_2d.Rectangle((0, 0), 1, 1)])
+        self.car_c = car.ModelCar("c", model, (10, 0))
+        self.world = collision_world.CollisionWorld(
+            [self.car_a, self.car_b, self.car_c])
+
+    def test_first_step_reports_all_the_collisions(self):
+        started, ended = self.world.step()
+        self.assertEqual(started, [(self.car_a, self.car_b)])
+        self.assertEqual(ended, [])
+        self.assertEqual(self.world.colliding_pairs,
+                         [(self.car_a, self.car_b)])
+
+    def test_step_reports_only_changes(self):
+        self.world.step()
+        self.assertEqual(self.world.step(), ([], []))
+
+        started, ended = self.world.step({self.car_c: (-8, 0)})
+        self.assertEqual(started, [(self.car_b, self.car_c)])
+        self.assertEqual(ended, [])
+        self.assertEqual(self.car_c.offset, (2, 0))
+
+        started, ended = self.world.step([(self.car_b, (0, 5))])
+        self.assertEqual(started, [])
+        self.assertEqual(ended, [(self.car_a, self.car_b),
+                                 (self.car_b, self.car_c)])
+        self.assertEqual(self.car_b.shapes[0].center, (1.5, 5))
+        self.assertEqual(self.world.colliding_pairs, [])
+
+    def test_unchanged_pairs_are_not_evaluated_again(self):
+        self.world.step()
+        tested_pairs = []
+        do_these_cars_collide = overlaps_detection.do_these_cars_collide
+
+        def counting_do_these_cars_collide(first_car, second_car):
+            tested_pairs.append((first_car, second_car))
+            return do_these_cars_collide(first_car, second_car)
+
+        overlaps_detection.do_these_cars_collide = \
+            counting_do_these_cars_collide
+        try:
+            self.world.step({self.car_c: (0, 0.1)})
+        finally:
+            overlaps_detection.do_these_cars_collide = do_these_cars_collide
+        self.assertEqual(tested_pairs, [])
+
+    def test_add_and_remove_cars(self):
+        self.world.step()
+        car_d = car.Car("d", [shapes_2d.Circle((10, 1), 0.5)])
+        self.world.add_car(car_d)
+        self.assertRaises(ValueError, self.world.add_car, car_d)
+        self.assertEqual(self.world.step(), ([(self.car_c, car_d)], []))
+
+        self.world.remove_car(self.car_a)
+        self.assertNotIn(self.car_a, self.world)
+        self.assertEqual(len(self.world), 3)
+        self.assertEqual(self.world.step(), ([], [(self.car_a, self.car_b)]))
+        self.assertEqual(self.world.cars, [self.car_b, self.car_c, car_d])
+
+    def test_random_moves_match_the_exhaustive_search(self):
+        random_generator = random.Random(18)
+        cars = []
+        for car_index in range(60):
+            x = random_generator.uniform(0, 30)
+            y = random_generator.uniform(0, 30)
+            cars.append(car.Car(car_index, [
+                shapes_2d.Rectangle((x, y), random_generator.uniform(0.5, 2),
+                                    random_generator.uniform(0.5, 1)),
+                shapes_2d.Circle((x + 1, y), random_generator.uniform(0.3, 1))
+            ]))
+        world = collision_world.CollisionWorld(cars, margin=0.3)
+
+        colliding_pairs = set()
+        for _ in range(20):
+            deltas = {a_car: (random_generator.uniform(-0.5, 0.5),
+                              random_generator.uniform(-0.5, 0.5))
+                      for a_car in random_generator.sample(cars, 20)}
+            started, ended = world.step(deltas)
+            self.assertFalse(set(started) & colliding_pairs)
+            self.assertTrue(set(ended) <= colliding_pairs)
+            colliding_pairs = (colliding_pairs - set(ended)) | set(started)
+            self.assertEqual(world.colliding_pairs, get_colliding_pairs(cars))
+            self.assertEqual(sorted(colliding_pairs, key=lambda pair: (
+                pair[0].name, pair[1].name)), get_colliding_pairs(cars))
+
+
+if __name__ == "__main__":
+    unittest.main()
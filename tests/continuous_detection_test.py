@@ -0,0 +1,193 @@
+"""
+Unit tests for the continuous_detection module
+"""
+
+import math
+import random
+import unittest
+from src import car, shapes_2d, overlaps_detection, continuous_detection
+
+
+class TestTimeOfImpact(unittest.TestCase):
+    """
+    Tests for the swept kernels of the shapes
+    """
+
+    def test_swept_bounding_box(self):
+        self.assertEqual(continuous_detection.get_swept_bounding_box(
+            ((0, 0), (1, 2)), (3, -1)), ((0, -1), (4, 2)))
+
+    def test_circles_tunnelling(self):
+        circle = shapes_2d.Circle((0, 0), 1)
+        # Overlapping neither at the start nor at the end of the step
+        self.assertAlmostEqual(continuous_detection.get_shapes_time_of_impact(
+            circle, circle, (10, 0), (-20, 0)), 0.4)
+        self.assertIsNone(continuous_detection.get_shapes_time_of_impact(
+            circle, circle, (10, 0), (20, 0)))
+        self.assertIsNone(continuous_detection.get_shapes_time_of_impact(
+            circle, circle, (10, 2), (-20, 0)))
+        self.assertEqual(continuous_detection.get_shapes_time_of_impact(
+            circle, circle, (1, 0), (0, 0)), 0)
+
+    def test_rectangles(self):
+        rectangle = shapes_2d.Rectangle((0, 0), 1, 1)
+        self.assertAlmostEqual(continuous_detection.get_shapes_time_of_impact(
+            rectangle, rectangle, (10, 1), (-20, 0)), 0.4)
+        # Touching rectangles do not overlap
+        self.assertIsNone(continuous_detection.get_shapes_time_of_impact(
+            rectangle, rectangle, (10, 2), (-20, 0)))
+        self.assertIsNone(continuous_detection.get_shapes_time_of_impact(
+            rectangle, rectangle, (10, 0), (-7.5, 0)))
+
+    def test_circle_and_rectangle_corner(self):
+        circle = shapes_2d.Circle((0, 0), 1)
+        rectangle = shapes_2d.Rectangle((5, 5), 1, 1)
+        expected = (4 - 1 / math.sqrt(2)) / 10
+        self.assertAlmostEqual(continuous_detection.get_shapes_time_of_impact(
+            circle, rectangle, (0, 0), (-10, -10)), expected)
+        self.assertAlmostEqual(continuous_detection.get_shapes_time_of_impact(
+            rectangle, circle, (0, 0), (10, 10)), expected)
+
+        # The corner passes about 1.13 away from the circle center, although
+        # the enlarged box alone would report a hit
+        rectangle = shapes_2d.Rectangle((11.8, 8.2), 1, 1)
+        self.assertIsNone(continuous_detection.get_shapes_time_of_impact(
+            circle, rectangle, (0, 0), (-20, -20)))
+
+    def test_rectangle_subclass(self):
+        square = Square((0, 0), 1)
+        circle = shapes_2d.Circle((0, 0), 1)
+        self.assertAlmostEqual(continuous_detection.get_shapes_time_of_impact(
+            square, square, (10, 1), (-20, 0)), 0.4)
+        self.assertAlmostEqual(continuous_detection.get_shapes_time_of_impact(
+            square, circle, (10, 0), (-20, 0)), 0.4)
+        self.assertAlmostEqual(continuous_detection.get_shapes_time_of_impact(
+            circle, square, (-10, 0), (20, 0)), 0.4)
+        self.assertRaises(TypeError,
+                          continuous_detection.get_shapes_time_of_impact,
+                          square, shapes_2d.Point((0, 0)), (0, 0), (1, 0))
+
+    def assert_matches_discrete_sampling(self, make_shape, seed):
+        random_generator = random.Random(seed)
+        detector = overlaps_detection.OverlappingShapesDetector
+
+        for _ in range(300):
+            first_shape = make_shape(random_generator)
+            second_shape = make_shape(random_generator)
+            offset = (random_generator.uniform(-6, 6),
+                      random_generator.uniform(-6, 6))
+            velocity = (random_generator.uniform(-12, 12),
+                        random_generator.uniform(-12, 12))
+            time_of_impact = continuous_detection.get_shapes_time_of_impact(
+                first_shape, second_shape, offset, velocity)
+
+            def overlap_at(time):
+                return detector.do_these_two_shapes_overlap(
+                    first_shape, second_shape,
+                    (offset[0] + time * velocity[0],
+                     offset[1] + time * velocity[1]))
+
+            if time_of_impact == 0:
+                self.assertTrue(overlap_at(0))
+                continue
+            end = 1 if time_of_impact is None else time_of_impact
+            for step in range(200):
+                self.assertFalse(overlap_at(end * step / 200))
+            if time_of_impact is not None:
+                self.assertTrue(overlap_at(time_of_impact + 1e-6))
+
+    def test_against_discrete_sampling(self):
+        def make_shape(random_generator):
+            center = (random_generator.uniform(-3, 3),
+                      random_generator.uniform(-3, 3))
+            if random_generator.random() < 0.5:
+                return shapes_2d.Circle(center,
+                                        random_generator.uniform(0.2, 1.5))
+            return shapes_2d.Rectangle(center,
+                                       random_generator.uniform(0.2, 1.5),
+                                       random_generator.uniform(0.2, 1.5))
+
+        self.assert_matches_discrete_sampling(make_shape, 19)
+
+    def test_oriented_rectangles(self):
+        diamond = shapes_2d.OrientedRectangle((0, 0), 1, 1, math.pi / 4)
+        rectangle = shapes_2d.Rectangle((0, 0), 1, 1)
+        # The corner of the diamond is at sqrt(2) from its center
+        self.assertAlmostEqual(continuous_detection.get_shapes_time_of_impact(
+            rectangle, diamond, (10, 0), (-10, 0)),
+            (9 - math.sqrt(2)) / 10)
+        self.assertAlmostEqual(continuous_detection.get_shapes_time_of_impact(
+            diamond, shapes_2d.Circle((0, 0), 1), (0, 10), (0, -10)),
+            (9 - math.sqrt(2)) / 10)
+        self.assertAlmostEqual(continuous_detection.get_shapes_time_of_impact(
+            diamond, diamond, (10, 0), (-10, 0)),
+            (10 - 2 * math.sqrt(2)) / 10)
+
+    def test_oriented_rectangles_against_discrete_sampling(self):
+        def make_shape(random_generator):
+            center = (random_generator.uniform(-3, 3),
+                      random_generator.uniform(-3, 3))
+            kind = random_generator.randrange(3)
+            if kind == 0:
+                return shapes_2d.Circle(center,
+                                        random_generator.uniform(0.2, 1.5))
+            if kind == 1:
+                return shapes_2d.Rectangle(center,
+                                           random_generator.uniform(0.2, 1.5),
+                                           random_generator.uniform(0.2, 1.5))
+            return shapes_2d.OrientedRectangle(
+                center, random_generator.uniform(0.2, 1.5),
+                random_generator.uniform(0.2, 1.5),
+                random_generator.uniform(-math.pi, math.pi))
+
+        self.assert_matches_discrete_sampling(make_shape, 23)
+
+class TestSweptIntersections(unittest.TestCase):
+    """
+    Tests for the swept detection of cars
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        model = car.CarModel("m", [shapes_2d.Rectangle((0, 0), 2, 1),
+                                   shapes_2d.Circle((2, 0), 1)])
+        self.cars = [car.ModelCar("a", model, (0, 0)),
+                     car.ModelCar("b", model, (30, 0)),
+                     car.Car("c", [shapes_2d.Circle((0, 30), 1)])]
+
+    def test_time_of_impact_of_cars(self):
+        # b moves through a: its rectangle hits the circle of a first
+        self.assertAlmostEqual(continuous_detection.get_time_of_impact(
+            self.cars[0], self.cars[1], (0, 0), (-60, 0)), 25 / 60)
+        self.assertAlmostEqual(continuous_detection.get_time_of_impact(
+            self.cars[0], self.cars[1], (30, 0), (-30, 0)), 25 / 60)
+        self.assertIsNone(continuous_detection.get_time_of_impact(
+            self.cars[0], self.cars[1], (0, 0), (0, 0)))
+
+    def test_get_swept_intersections(self):
+        result = continuous_detection.get_swept_intersections(
+            self.cars, [(0, 0), (-60, 0), (0, -60)])
+        self.assertEqual([(i, j) for i, j, _ in result],
+                         [(0, 1), (0, 2), (1, 2)])
+        self.assertAlmostEqual(result[0][2], 25 / 60)
+        self.assertAlmostEqual(result[1][2], 28 / 60)
+        # c meets the rectangle corner of b on the way
+        self.assertAlmostEqual(result[2][2], 28 / 60)
+        self.assertRaises(ValueError,
+                          continuous_detection.get_swept_intersections,
+                          self.cars, [(0, 0)])
+
+
+class Square(shapes_2d.Rectangle):
+    """
+    Rectangle subclass without swept kernels of its own
+    """
+
+    def __init__(self, center, half_side):
+        super().__init__(center, half_side, half_side)
+
+
+if __name__ == "__main__":
+    unittest.main()
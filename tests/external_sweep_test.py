@@ -0,0 +1,129 @@
+"""
+Unit tests for the external_sweep module
+"""
+
+import os
+import tempfile
+import unittest
+import assignment_app
+from benchmarks import benchmark
+from src import broad_phase, scene_snapshot, external_sweep
+
+
+class TestExternalSweep(unittest.TestCase):
+    """
+    Tests for the out-of-core sweep over scene snapshots
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        self.cars = assignment_app.make_cars(
+            benchmark.generate_scene_specs(400, density=0.1, seed=25))
+        directory = tempfile.mkdtemp()
+        self.path = os.path.join(directory, "scene.bin")
+        self.addCleanup(os.rmdir, directory)
+        self.addCleanup(os.remove, self.path)
+        scene_snapshot.write_snapshot(self.path, self.cars)
+
+    def get_expected_pairs(self):
+        car_indices = {id(a_car): index
+                       for index, a_car in enumerate(self.cars)}
+        return [(car_indices[id(first_car)], car_indices[id(second_car)])
+                for first_car, second_car in
+                assignment_app.get_intersections(self.cars)]
+
+    def test_same_pairs_as_get_intersections(self):
+        expected_pairs = self.get_expected_pairs()
+        self.assertGreater(len(expected_pairs), 0)
+        # Small chunks and cache, so that many runs are merged and the cars
+        # are rebuilt
+        for chunk_size, cache_size in ((7, 2), (1000, 1024)):
+            self.assertEqual(external_sweep.find_colliding_pairs(
+                self.path, chunk_size, cache_size), expected_pairs)
+
+    def test_oriented_rectangles(self):
+        self.cars = assignment_app.make_cars([
+            ("car_" + str(index),
+             ("oriented_rectangle", ((index % 20 * 3, index // 20 * 3),
+                                     1.5, 0.5, index * 0.4)))
+            for index in range(400)])
+        scene_snapshot.write_snapshot(self.path, self.cars)
+        expected_pairs = self.get_expected_pairs()
+        self.assertGreater(len(expected_pairs), 0)
+        self.assertEqual(external_sweep.find_colliding_pairs(self.path, 50),
+                         expected_pairs)
+
+    def test_sorted_runs(self):
+        with scene_snapshot.SceneSnapshot(self.path) as snapshot, \
+                tempfile.TemporaryDirectory() as directory:
+            run_paths = external_sweep.write_sorted_runs(snapshot, directory,
+                                                         150)
+            self.assertEqual(len(run_paths), 3)
+            records = list(external_sweep.iter_sorted_boxes(run_paths))
+        self.assertEqual(sorted(record[4] for record in records),
+                         list(range(400)))
+        self.assertEqual([record[0] for record in records],
+                         sorted(a_car.bounding_box[0][0]
+                                for a_car in self.cars))
+
+    def test_bounded_merge_fan_in(self):
+        with scene_snapshot.SceneSnapshot(self.path) as snapshot, \
+                tempfile.TemporaryDirectory() as directory:
+            run_paths = external_sweep.write_sorted_runs(snapshot, directory,
+                                                         9)
+            self.assertEqual(len(run_paths), 45)
+            # 45 runs, then 12, then 3
+            merged_paths = external_sweep.merge_runs(run_paths, 4)
+            self.assertEqual(len(merged_paths), 3)
+            self.assertEqual(sorted(os.listdir(directory)),
+                             sorted(os.path.basename(path)
+                                    for path in merged_paths))
+            records = list(external_sweep.iter_sorted_boxes(merged_paths, 4))
+        self.assertEqual(sorted(record[4] for record in records),
+                         list(range(400)))
+        self.assertEqual([record[0] for record in records],
+                         sorted(a_car.bounding_box[0][0]
+                                for a_car in self.cars))
+        self.assertRaises(ValueError, external_sweep.merge_runs, [], 1)
+        self.assertEqual(external_sweep.find_colliding_pairs(
+            self.path, chunk_size=7, max_open_runs=3),
+            self.get_expected_pairs())
+
+    def test_candidate_pairs_match_the_sweep_and_prune(self):
+        boxes = [a_car.bounding_box for a_car in self.cars]
+        records = sorted((box[0][0], box[0][1], box[1][0], box[1][1], index)
+                         for index, box in enumerate(boxes))
+        self.assertEqual(
+            sorted(external_sweep.iter_candidate_pairs(records)),
+            broad_phase.sweep_and_prune(boxes))
+
+    def test_geometry_is_loaded_for_candidates_only(self):
+        built_cars = []
+        make_car = scene_snapshot.SceneSnapshot.make_car
+
+        def counting_make_car(snapshot, car_index):
+            built_cars.append(car_index)
+            return make_car(snapshot, car_index)
+
+        scene_snapshot.SceneSnapshot.make_car = counting_make_car
+        try:
+            external_sweep.find_colliding_pairs(self.path)
+        finally:
+            scene_snapshot.SceneSnapshot.make_car = make_car
+
+        candidates = {index for pair in broad_phase.sweep_and_prune(
+            [a_car.bounding_box for a_car in self.cars]) for index in pair}
+        self.assertEqual(set(built_cars), candidates)
+        self.assertLess(len(candidates), len(self.cars))
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            external_sweep.find_colliding_pairs(self.path, chunk_size=0)
+        with self.assertRaises(ValueError):
+            external_sweep.find_colliding_pairs(self.path, cache_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+Unit tests for the kernel_registry module
+"""
+
+import unittest
+from src import shapes_2d, kernel_registry
+
+
+class Square(shapes_2d.Rectangle):
+    """
+    Rectangle subclass without kernels of its own
+    """
+
+    def __init__(self, center, half_side):
+        super().__init__(center, half_side, half_side)
+
+
+def get_arguments(first_shape, second_shape, offset, *arguments):
+    return (type(first_shape), type(second_shape), offset) + arguments
+
+
+class TestKernelRegistry(unittest.TestCase):
+    """
+    Tests for the class KernelRegistry
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        self.registry = kernel_registry.KernelRegistry("test")
+        self.registry.register(shapes_2d.Circle, shapes_2d.Rectangle,
+                               get_arguments)
+        self.circle = shapes_2d.Circle((0, 0), 1)
+        self.square = Square((0, 0), 1)
+
+    def test_subclasses_and_swapped_pairs(self):
+        kernel = self.registry.resolve(Square, shapes_2d.Circle)
+        self.assertEqual(kernel(self.square, self.circle, (1, 2), 0.5),
+                         (shapes_2d.Circle, Square, (-1, -2), 0.5))
+        self.assertIs(self.registry.dispatch_table[(Square,
+                                                    shapes_2d.Circle)],
+                      kernel)
+        self.assertIsNone(self.registry.get(Square, shapes_2d.Circle))
+
+    def test_most_derived_classes_first(self):
+        def get_square_arguments(first_shape, second_shape, offset):
+            return "square"
+
+        self.registry.resolve(shapes_2d.Circle, Square)
+        self.registry.register(shapes_2d.Circle, Square, get_square_arguments)
+        self.assertIs(self.registry.resolve(shapes_2d.Circle, Square),
+                      get_square_arguments)
+
+        self.registry.unregister(shapes_2d.Circle, Square)
+        self.assertIs(self.registry.resolve(shapes_2d.Circle, Square),
+                      get_arguments)
+
+    def test_custom_swapped_kernel(self):
+        registry = kernel_registry.KernelRegistry(
+            "test", lambda kernel: lambda first_shape, second_shape, offset:
+            "swapped")
+        registry.register(shapes_2d.Circle, shapes_2d.Rectangle,
+                          get_arguments)
+        self.assertEqual(registry.resolve(shapes_2d.Rectangle,
+                                          shapes_2d.Circle)(
+            self.square, self.circle, (0, 0)), "swapped")
+
+    def test_missing_kernel(self):
+        with self.assertRaises(TypeError) as context:
+            self.registry.resolve(shapes_2d.Circle, shapes_2d.Circle)
+        self.assertEqual(str(context.exception),
+                         "No test kernel registered for Circle and Circle")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,7 @@ Unit tests for overlaps_detection module
 """
 
 import math
+import random
 import unittest
 from src import shapes_2d, overlaps_detection
 
@@ -249,6 +250,427 @@ class TestOverlappingShapesDetector(unittest.TestCase):
                         do_these_two_shapes_overlap(self.circle_m,
                                                     self.rectangle_i))
 
+    def test_intersection_thin_rectangle_crossing_circle_top(self):
+        """
+        Test do_these_two_shapes_overlap method with a very thin rectangle
+        crossing the circle just below its top point. The overlap falls between
+        two of the points sampled along the circumference, so only the
+        analytic kernel detects it.
+        """
+        thin_rectangle = shapes_2d.Rectangle((8, 4.9995), 10, 0.0001)
+        self.assertTrue(overlaps_detection.OverlappingShapesDetector.
+                        do_these_two_shapes_overlap(self.circle_a,
+                                                    thin_rectangle))
+
+        self.assertFalse(overlaps_detection.OverlappingShapesDetector.
+                         does_the_circle_overlap_the_rectangle_by_sampling(
+                             self.circle_a, thin_rectangle))
+        self.assertFalse(overlaps_detection.OverlappingShapesDetector.
+                         does_the_circle_overlap_the_rectangle_by_sampling(
+                             self.circle_a,
+                             thin_rectangle.translated((-1, 1)), (1, -1)))
+
+    def test_intersection_circle_near_rectangle_corner(self):
+        """
+        Test do_these_two_shapes_overlap method with circles close to a
+        rectangle corner, inside and outside the corner rounding
+        """
+        self.assertTrue(overlaps_detection.OverlappingShapesDetector.
+                        do_these_two_shapes_overlap(
+                            shapes_2d.Circle((4.2, 4.6), 1.0),
+                            self.rectangle_a))
+        self.assertFalse(overlaps_detection.OverlappingShapesDetector.
+                         do_these_two_shapes_overlap(
+                             shapes_2d.Circle((4.3, 4.7), 1.0),
+                             self.rectangle_a))
+
+
+    #
+    # Tests using translated shapes -------------------------------------------
+
+    def test_intersection_translated_shapes(self):
+        """
+        Test do_these_two_shapes_overlap method with the second shape
+        translated by an offset
+        """
+        self.assertFalse(overlaps_detection.OverlappingShapesDetector.
+                         do_these_two_shapes_overlap(self.circle_m,
+                                                     self.rectangle_h,
+                                                     (-0.5, 0)))
+        self.assertTrue(overlaps_detection.OverlappingShapesDetector.
+                        do_these_two_shapes_overlap(self.rectangle_h,
+                                                    self.circle_m,
+                                                    (-0.5, 0)))
+        self.assertTrue(overlaps_detection.OverlappingShapesDetector.
+                        do_these_two_shapes_overlap(self.circle_a,
+                                                    self.circle_f, (1, 0)))
+        self.assertTrue(overlaps_detection.OverlappingShapesDetector.
+                        do_these_two_shapes_overlap(self.rectangle_c,
+                                                    self.rectangle_f,
+                                                    (3.9, 0)))
+        self.assertTrue(overlaps_detection.OverlappingShapesDetector.
+                        do_these_two_shapes_overlap(
+                            self.circle_m,
+                            shapes_2d.CompositeShape([self.rectangle_h]),
+                            (0.1, 0)))
+
+
+class TestCompositeShapesOverlap(unittest.TestCase):
+    """
+    Tests for the overlap of composite shapes made of many shapes, which are
+    tested by descending their bounding volume trees
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        self.detector = overlaps_detection.OverlappingShapesDetector
+        random_generator = random.Random(19)
+        self.compounds = []
+        for _ in range(30):
+            x = random_generator.uniform(0, 30)
+            y = random_generator.uniform(0, 30)
+            shapes = []
+            # An articulated bus: a chain of small shapes
+            for k in range(40):
+                center = (x + 0.4 * k, y + random_generator.uniform(-0.2, 0.2))
+                if k % 3 == 0:
+                    shapes.append(shapes_2d.Circle(center, 0.3))
+                else:
+                    shapes.append(shapes_2d.Rectangle(center, 0.2, 0.3))
+            self.compounds.append(shapes_2d.CompositeShape(shapes))
+
+    def tearDown(self):
+        self.detector.bounding_volume_tree_threshold = 144
+
+    def get_overlapping_pairs(self):
+        return [(i, j) for i in range(len(self.compounds))
+                for j in range(i + 1, len(self.compounds))
+                if self.detector.do_these_two_shapes_overlap(
+                    self.compounds[i], self.compounds[j])]
+
+    def test_same_result_as_shape_by_shape_test(self):
+        pairs = self.get_overlapping_pairs()
+        self.detector.bounding_volume_tree_threshold = math.inf
+        self.assertEqual(pairs, self.get_overlapping_pairs())
+        self.assertTrue(len(pairs) > 0)
+
+    def test_translated_compound(self):
+        compound = self.compounds[0]
+        self.assertTrue(self.detector.do_these_two_shapes_overlap(
+            compound, compound, (15.9, 0)))
+        self.assertFalse(self.detector.do_these_two_shapes_overlap(
+            compound, compound, (16.2, 0)))
+
+
+class TestOrientedRectanglesOverlap(unittest.TestCase):
+    """
+    Tests for the separating axis kernels of the oriented rectangles
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        self.detector = overlaps_detection.OverlappingShapesDetector
+        # A square standing on a corner: |x| + |y| < sqrt(2)
+        self.diamond = shapes_2d.OrientedRectangle((0, 0), 1, 1, math.pi / 4)
+
+    def test_oriented_rectangles(self):
+        self.assertTrue(self.detector.do_these_two_shapes_overlap(
+            self.diamond, self.diamond, (2.8, 0)))
+        self.assertFalse(self.detector.do_these_two_shapes_overlap(
+            self.diamond, self.diamond, (2.9, 0)))
+
+    def test_oriented_rectangle_and_rectangle(self):
+        rectangle = shapes_2d.Rectangle((2, 2), 1, 1)
+        # The bounding boxes overlap, but not the shapes
+        self.assertFalse(self.detector.do_these_two_shapes_overlap(
+            self.diamond, rectangle))
+        self.assertFalse(self.detector.do_these_two_shapes_overlap(
+            rectangle, self.diamond))
+        self.assertTrue(self.detector.do_these_two_shapes_overlap(
+            self.diamond, rectangle, (-0.5, -0.5)))
+        self.assertTrue(self.detector.do_these_two_shapes_overlap(
+            rectangle, self.diamond, (0.5, 0.5)))
+
+    def test_oriented_rectangle_and_circle(self):
+        self.assertFalse(self.detector.do_these_two_shapes_overlap(
+            self.diamond, shapes_2d.Circle((1.5, 1.5), 0.7)))
+        self.assertTrue(self.detector.do_these_two_shapes_overlap(
+            shapes_2d.Circle((1.5, 1.5), 1.2), self.diamond))
+        self.assertTrue(self.detector.do_these_two_shapes_overlap(
+            shapes_2d.Circle((0, 0), 0.1), self.diamond, (1.4, 0)))
+
+    def test_point_inside_oriented_rectangle(self):
+        self.assertTrue(self.detector.do_these_two_shapes_overlap(
+            shapes_2d.Point((0.9, 0.4)), self.diamond))
+        self.assertFalse(self.detector.do_these_two_shapes_overlap(
+            shapes_2d.Point((1, 0.5)), self.diamond))
+
+    def test_same_result_as_axis_aligned_rectangles(self):
+        random_generator = random.Random(23)
+        for _ in range(300):
+            rectangles = []
+            oriented_rectangles = []
+            for _ in range(2):
+                center = (random_generator.uniform(-3, 3),
+                          random_generator.uniform(-3, 3))
+                half_width = random_generator.uniform(0.2, 2)
+                half_height = random_generator.uniform(0.2, 2)
+                rectangles.append(shapes_2d.Rectangle(center, half_width,
+                                                      half_height))
+                # A quarter turn swaps the width and the height
+                quarter_turns = random_generator.randrange(4)
+                if quarter_turns % 2 == 1:
+                    half_width, half_height = half_height, half_width
+                oriented_rectangles.append(shapes_2d.OrientedRectangle(
+                    center, half_width, half_height,
+                    quarter_turns * math.pi / 2))
+            circle = shapes_2d.Circle(rectangles[1].center,
+                                      random_generator.uniform(0.2, 2))
+
+            expected = self.detector.do_these_two_shapes_overlap(
+                rectangles[0], rectangles[1])
+            self.assertEqual(self.detector.do_these_two_shapes_overlap(
+                oriented_rectangles[0], oriented_rectangles[1]), expected)
+            self.assertEqual(self.detector.do_these_two_shapes_overlap(
+                oriented_rectangles[0], rectangles[1]), expected)
+            self.assertEqual(self.detector.do_these_two_shapes_overlap(
+                oriented_rectangles[0], circle),
+                self.detector.do_these_two_shapes_overlap(rectangles[0],
+                                                          circle))
+
+
+class TestDistanceWithin(unittest.TestCase):
+    """
+    Tests for the proximity kernels of OverlappingShapesDetector
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        self.detector = overlaps_detection.OverlappingShapesDetector
+        self.circle = shapes_2d.Circle((0, 0), 1)
+        self.rectangle = shapes_2d.Rectangle((0, 0), 2, 1)
+
+    def test_circles(self):
+        self.assertAlmostEqual(self.detector.get_distance_within(
+            self.circle, shapes_2d.Circle((3, 4), 2), 3), 2)
+        self.assertIsNone(self.detector.get_distance_within(
+            self.circle, shapes_2d.Circle((3, 4), 2), 2))
+        self.assertAlmostEqual(self.detector.get_distance_within(
+            self.circle, self.circle, 0, (1, 0)), -1)
+
+    def test_rectangles(self):
+        # Separated along a diagonal
+        self.assertAlmostEqual(self.detector.get_distance_within(
+            self.rectangle, self.rectangle, 10, (7, 6)), 5)
+        self.assertAlmostEqual(self.detector.get_distance_within(
+            self.rectangle, self.rectangle, 10, (3.5, 0.5)), -0.5)
+        # Touching rectangles are not closer than a zero margin
+        self.assertIsNone(self.detector.get_distance_within(
+            self.rectangle, self.rectangle, 0, (4, 0)))
+
+    def test_circle_and_rectangle(self):
+        self.assertAlmostEqual(self.detector.get_distance_within(
+            self.circle, self.rectangle, 10, (5, 5)), math.sqrt(25) - 1)
+        self.assertAlmostEqual(self.detector.get_distance_within(
+            self.rectangle, self.circle, 10, (0, 4)), 2)
+        # The circle center lies inside the rectangle
+        self.assertAlmostEqual(self.detector.get_distance_within(
+            self.rectangle, self.circle, 10, (1.5, 0)), -1.5)
+
+    def test_zero_margin_matches_overlap(self):
+        random_generator = random.Random(20)
+        for _ in range(500):
+            shapes = []
+            for _ in range(2):
+                center = (random_generator.uniform(-3, 3),
+                          random_generator.uniform(-3, 3))
+                if random_generator.random() < 0.5:
+                    shapes.append(shapes_2d.Circle(
+                        center, random_generator.uniform(0.2, 2)))
+                else:
+                    shapes.append(shapes_2d.Rectangle(
+                        center, random_generator.uniform(0.2, 2),
+                        random_generator.uniform(0.2, 2)))
+            self.assertEqual(
+                self.detector.get_distance_within(shapes[0], shapes[1], 0)
+                is not None,
+                self.detector.do_these_two_shapes_overlap(shapes[0],
+                                                          shapes[1]))
+
+    def test_oriented_rectangles(self):
+        diamond = shapes_2d.OrientedRectangle((0, 0), 1, 1, math.pi / 4)
+        # Facing edges
+        self.assertAlmostEqual(self.detector.get_distance_within(
+            diamond, diamond, 10, (3, 3)), 3 * math.sqrt(2) - 2)
+        # Facing corners, farther apart than their projections on the axes
+        self.assertAlmostEqual(self.detector.get_distance_within(
+            diamond, diamond, 10, (4, 0)), 4 - 2 * math.sqrt(2))
+        self.assertIsNone(self.detector.get_distance_within(
+            diamond, diamond, 1, (4, 0)))
+        self.assertAlmostEqual(self.detector.get_distance_within(
+            diamond, diamond, 0, (1, 0)), math.sqrt(0.5) - 2)
+
+        self.assertAlmostEqual(self.detector.get_distance_within(
+            self.rectangle, diamond, 10, (5, 0)), 3 - math.sqrt(2))
+        self.assertAlmostEqual(self.detector.get_distance_within(
+            diamond, self.circle, 10, (4, 0)), 3 - math.sqrt(2))
+        self.assertAlmostEqual(self.detector.get_distance_within(
+            self.circle, diamond, 10, (0, -4)), 3 - math.sqrt(2))
+
+    def test_oriented_rectangles_zero_margin_matches_overlap(self):
+        random_generator = random.Random(23)
+        for _ in range(500):
+            shapes = [shapes_2d.OrientedRectangle(
+                (random_generator.uniform(-3, 3),
+                 random_generator.uniform(-3, 3)),
+                random_generator.uniform(0.2, 2),
+                random_generator.uniform(0.2, 2),
+                random_generator.uniform(-math.pi, math.pi))]
+            center = (random_generator.uniform(-3, 3),
+                      random_generator.uniform(-3, 3))
+            if random_generator.random() < 0.5:
+                shapes.append(shapes_2d.Circle(
+                    center, random_generator.uniform(0.2, 2)))
+            else:
+                shapes.append(shapes_2d.Rectangle(
+                    center, random_generator.uniform(0.2, 2),
+                    random_generator.uniform(0.2, 2)))
+            for first_shape, second_shape in ((shapes[0], shapes[1]),
+                                              (shapes[0], shapes[0]),
+                                              (shapes[1], shapes[0])):
+                offset = (random_generator.uniform(-3, 3),
+                          random_generator.uniform(-3, 3))
+                self.assertEqual(
+                    self.detector.get_distance_within(
+                        first_shape, second_shape, 0, offset) is not None,
+                    self.detector.do_these_two_shapes_overlap(
+                        first_shape, second_shape, offset))
+
+    def test_composite_shapes_stop_at_first_close_pair(self):
+        compound = shapes_2d.CompositeShape([shapes_2d.Circle((10, 0), 1),
+                                             shapes_2d.Circle((0, 0), 1)])
+        other = shapes_2d.CompositeShape([shapes_2d.Circle((4, 0), 1)])
+        self.assertAlmostEqual(self.detector.get_distance_within(
+            compound, other, 5), 4)
+        self.assertAlmostEqual(self.detector.get_distance_within(
+            compound, other, 3), 2)
+        self.assertAlmostEqual(self.detector.get_distance_within(
+            other, compound, 3, (-10, 0)), 2)
+        # Far apart bounding boxes
+        self.assertIsNone(self.detector.get_distance_within(
+            compound, other, 2, (0, 5)))
+
+
+class Point(shapes_2d.Shape2D):
+    """
+    A point shape, used to test the registration of new overlap kernels
+    """
+
+    def __init__(self, position):
+        self.position = position
+
+    @property
+    def area(self):
+        return 0
+
+    def get_bounding_box(self):
+        return self.position, self.position
+
+
+class Square(shapes_2d.Rectangle):
+    """
+    A Rectangle subclass without kernels of its own
+    """
+
+    def __init__(self, center, half_side):
+        super().__init__(center, half_side, half_side)
+
+
+class TestOverlapKernelsRegistry(unittest.TestCase):
+    """
+    Tests for the overlap kernels registry of OverlappingShapesDetector
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        self.detector = overlaps_detection.OverlappingShapesDetector
+        self.circle = shapes_2d.Circle((0, 0), 1)
+        self.point_inside = Point((0.5, 0.5))
+        self.point_outside = Point((1, 1))
+
+    def tearDown(self):
+        self.detector._kernels.unregister(Point, shapes_2d.Circle)
+
+    def register_point_circle_kernel(self):
+        def does_the_point_overlap_the_circle(point, circle, offset):
+            return (shapes_2d.sqr(point.position[0] - circle.center[0] -
+                                  offset[0]) +
+                    shapes_2d.sqr(point.position[1] - circle.center[1] -
+                                  offset[1]) < shapes_2d.sqr(circle.radius))
+        self.detector.register_kernel(Point, shapes_2d.Circle,
+                                      does_the_point_overlap_the_circle)
+
+    def test_unregistered_pair(self):
+        with self.assertRaises(TypeError):
+            self.detector.do_these_two_shapes_overlap(self.point_inside,
+                                                      self.circle)
+
+    def test_registered_kernel_is_symmetric(self):
+        self.register_point_circle_kernel()
+
+        self.assertTrue(self.detector.do_these_two_shapes_overlap(
+            self.point_inside, self.circle))
+        self.assertTrue(self.detector.do_these_two_shapes_overlap(
+            self.circle, self.point_inside))
+        self.assertFalse(self.detector.do_these_two_shapes_overlap(
+            self.circle, self.point_outside))
+        self.assertTrue(self.detector.do_these_two_shapes_overlap(
+            self.circle, self.point_outside, (-0.5, -0.5)))
+
+    def test_registered_kernel_within_composite_shapes(self):
+        self.register_point_circle_kernel()
+        compound = shapes_2d.CompositeShape([self.point_outside,
+                                             self.point_inside])
+
+        self.assertTrue(self.detector.do_these_two_shapes_overlap(
+            self.circle, compound))
+        self.assertFalse(self.detector.do_these_two_shapes_overlap(
+            compound, self.circle, (5, 0)))
+
+    def test_subclass_uses_base_class_kernels(self):
+        square = Square((1.5, 0), 1)
+
+        self.assertTrue(self.detector.do_these_two_shapes_overlap(
+            square, self.circle))
+        self.assertFalse(self.detector.do_these_two_shapes_overlap(
+            square, shapes_2d.Rectangle((3, 0), 0.5, 0.5)))
+
+    def test_sampling_circle_rectangle_kernel(self):
+        thin_rectangle = shapes_2d.Rectangle((5, 0.9995), 10, 0.0001)
+        kernel = self.detector.get_kernel(shapes_2d.Circle,
+                                          shapes_2d.Rectangle)
+        self.detector.register_kernel(
+            shapes_2d.Circle, shapes_2d.Rectangle,
+            self.detector.does_the_circle_overlap_the_rectangle_by_sampling)
+        try:
+            self.assertFalse(self.detector.do_these_two_shapes_overlap(
+                thin_rectangle, self.circle))
+            self.assertTrue(self.detector.do_these_two_shapes_overlap(
+                self.circle, shapes_2d.Rectangle((0, 0), 1, 1), (1.5, 0)))
+        finally:
+            self.detector.register_kernel(shapes_2d.Circle,
+                                          shapes_2d.Rectangle, kernel)
+        self.assertTrue(self.detector.do_these_two_shapes_overlap(
+            thin_rectangle, self.circle))
+
 
 if __name__ == "__main__":
     unittest.main()
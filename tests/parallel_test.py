@@ -0,0 +1,57 @@
+"""
+Unit tests for the parallel module
+"""
+
+import unittest
+from src import car, shapes_2d, parallel, scene_snapshot
+
+
+class TestParallel(unittest.TestCase):
+    """
+    Tests for the parallel narrow phase
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        self.cars = [
+            car.Car("a", [shapes_2d.Rectangle((0, 0), 1, 1),
+                          shapes_2d.Circle((2, 0), 1)]),
+            car.Car("b", [shapes_2d.Circle((3.5, 0), 1)]),
+            car.Car("c", [shapes_2d.Rectangle((3, 1.5), 1, 1)]),
+            car.Car("d", [shapes_2d.Circle((20, 20), 1)])]
+        self.candidate_pairs = [(0, 1), (0, 2), (0, 3), (1, 2), (1, 3),
+                                (2, 3)]
+
+    def test_pack_and_unpack_cars(self):
+        kinds, values, offsets = parallel.pack_cars(self.cars)
+        self.assertEqual(list(kinds),
+                         [scene_snapshot.RECTANGLE, scene_snapshot.CIRCLE,
+                          scene_snapshot.CIRCLE, scene_snapshot.RECTANGLE,
+                          scene_snapshot.CIRCLE])
+        self.assertEqual(list(offsets), [0, 2, 3, 4, 5])
+
+        cars = parallel.unpack_cars(kinds, values, offsets)
+        self.assertEqual([a_car.bounding_box for a_car in cars],
+                         [a_car.bounding_box for a_car in self.cars])
+
+    def test_unsupported_shape(self):
+        with self.assertRaises(TypeError):
+            parallel.pack_cars([car.Car("x", [shapes_2d.CompositeShape([])])])
+
+    def test_find_colliding_pairs(self):
+        for chunk_size in (None, 1, 4):
+            self.assertEqual(
+                parallel.find_colliding_pairs(self.cars, self.candidate_pairs,
+                                              workers=2,
+                                              chunk_size=chunk_size),
+                [(0, 1), (0, 2), (1, 2)])
+
+    def test_invalid_number_of_workers(self):
+        with self.assertRaises(ValueError):
+            parallel.find_colliding_pairs(self.cars, self.candidate_pairs, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
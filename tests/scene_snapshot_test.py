@@ -0,0 +1,103 @@
+"""
+Unit tests for the scene_snapshot module
+"""
+
+import os
+import tempfile
+import unittest
+import assignment_app
+from src import car, shapes_2d, scene_snapshot
+
+
+class TestSceneSnapshot(unittest.TestCase):
+    """
+    Tests for the snapshot writer and the class SceneSnapshot
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        self.cars = assignment_app.make_cars([
+            ("Fiat",
+             ("rectangle", ((2, 2), 1, 1)),
+             ("circle", ((0, 0), 1))),
+            ("Maserati",
+             ("rectangle", ((2.5, 2), 1, 1)),),
+            ("Citroën",
+             ("circle", ((20, 0), 0.5)),
+             ("circle", ((21, 0), 0.5)),
+             ("rectangle", ((20.5, 1), 1, 0.25)))])
+        directory = tempfile.mkdtemp()
+        self.path = os.path.join(directory, "scene.bin")
+        self.addCleanup(os.rmdir, directory)
+        self.addCleanup(os.remove, self.path)
+        scene_snapshot.write_snapshot(self.path, iter(self.cars))
+
+    def test_tables(self):
+        with scene_snapshot.SceneSnapshot(self.path) as snapshot:
+            self.assertEqual(snapshot.number_of_cars, 3)
+            self.assertEqual(snapshot.number_of_shapes, 6)
+            self.assertEqual(len(snapshot.shapes_table), 36)
+            self.assertEqual(snapshot.get_shape_record(1),
+                             (scene_snapshot.CIRCLE, 0, 0, 1, 0, 0))
+            self.assertEqual(snapshot.get_car_shapes_range(2), range(3, 6))
+            self.assertEqual(snapshot.get_car_name(2), "Citroën")
+            self.assertEqual(snapshot.get_car_bounding_box(0),
+                             ((-1, -1), (3, 3)))
+
+    def test_make_cars(self):
+        with scene_snapshot.SceneSnapshot(self.path) as snapshot:
+            cars = snapshot.make_cars()
+
+        self.assertEqual([a_car.name for a_car in cars],
+                         ["Fiat", "Maserati", "Citroën"])
+        self.assertEqual([a_car.bounding_box for a_car in cars],
+                         [a_car.bounding_box for a_car in self.cars])
+        self.assertEqual(
+            [(first.name, second.name) for first, second in
+             assignment_app.get_intersections(cars)],
+            [("Fiat", "Maserati")])
+
+    def test_oriented_rectangles(self):
+        cars = [car.Car("Fiat", [shapes_2d.OrientedRectangle((2, 2), 2, 1,
+                                                             0.5),
+                                 shapes_2d.Circle((0, 0), 1)]),
+                car.Car("Maserati", [shapes_2d.OrientedRectangle(
+                    (4.5, 2), 1, 1, -1)])]
+        scene_snapshot.write_snapshot(self.path, cars)
+
+        with scene_snapshot.SceneSnapshot(self.path) as snapshot:
+            self.assertEqual(snapshot.get_shape_record(0),
+                             (scene_snapshot.ORIENTED_RECTANGLE, 2, 2, 2, 1,
+                              0.5))
+            self.assertEqual([snapshot.get_car_bounding_box(car_index)
+                              for car_index in range(2)],
+                             [a_car.bounding_box for a_car in cars])
+            snapshot_cars = snapshot.make_cars()
+
+        self.assertEqual([[shape.corners for shape in a_car.shapes
+                           if isinstance(shape, shapes_2d.OrientedRectangle)]
+                          for a_car in snapshot_cars],
+                         [[shape.corners for shape in a_car.shapes
+                           if isinstance(shape, shapes_2d.OrientedRectangle)]
+                          for a_car in cars])
+        self.assertEqual(
+            [(first.name, second.name) for first, second in
+             assignment_app.get_intersections(snapshot_cars)],
+            [("Fiat", "Maserati")])
+
+    def test_invalid_file(self):
+        with open(self.path, "r+b") as snapshot_file:
+            snapshot_file.write(b"NOTASCENE")
+        with self.assertRaises(ValueError):
+            scene_snapshot.SceneSnapshot(self.path)
+
+    def test_unsupported_shape(self):
+        with self.assertRaises(TypeError):
+            scene_snapshot.write_snapshot(
+                self.path, [car.Car("x", [shapes_2d.Point((0, 0))])])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -32,6 +32,21 @@ class TestCircle(unittest.TestCase):
         center_d = self.circle_d.center
         self.assertEqual(center_d, (0, -2))
 
+    def test_float_only_and_immutable(self):
+        self.assertEqual(self.circle_d.center, (0.0, -2.0))
+        self.assertIs(type(self.circle_d.center[0]), float)
+        self.assertIs(type(self.circle_b.radius), float)
+        self.assertAlmostEqual(self.circle_b.squared_radius, 3.24)
+        self.assertFalse(hasattr(self.circle_a, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.circle_a.radius = 2
+        with self.assertRaises(AttributeError):
+            self.circle_a.color = "red"
+        # A center given as a tuple of floats is not copied
+        center = (1.5, 2.5)
+        self.assertIs(shapes_2d.Circle(center, 1).center, center)
+        self.assertRaises(ValueError, shapes_2d.Circle, (0, 0, 0), 1)
+
     def get_bounding_box(self):
         bounding_box_b = self.circle_b.get_bounding_box
         self.assertEqual(bounding_box_b, ((1.2, -1.8), (4.8, 1.8)))
@@ -75,10 +90,135 @@ class TestRectangle(unittest.TestCase):
         center_b = self.rectangle_b.center
         self.assertEqual(center_b, (3, 0))
 
+    def test_float_only_and_immutable(self):
+        self.assertIs(type(self.rectangle_b.center[0]), float)
+        self.assertIs(type(self.rectangle_b.half_width), float)
+        self.assertFalse(hasattr(self.rectangle_b, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.rectangle_b.half_width = 2
+
     def get_bounding_box(self):
         bounding_box_a = self.rectangle_a.get_bounding_box()
         self.assertEqual(bounding_box_a, ((-3.16, -1.2), (3.16, 1.2)))
 
 
+class TestOrientedRectangle(unittest.TestCase):
+    """
+    Tests for the class OrientedRectangle
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        self.rectangle = shapes_2d.OrientedRectangle((1, 2), 2, 1,
+                                                     math.pi / 2)
+        self.diamond = shapes_2d.OrientedRectangle((0, 0), 1, 1, math.pi / 4)
+
+    def test_area(self):
+        self.assertEqual(self.rectangle.area, 8)
+
+    def test_axes_and_corners(self):
+        width_axis, height_axis = self.rectangle.axes
+        self.assertAlmostEqual(width_axis[0], 0)
+        self.assertAlmostEqual(width_axis[1], 1)
+        self.assertAlmostEqual(height_axis[0], -1)
+        self.assertAlmostEqual(height_axis[1], 0)
+        self.assertIs(self.rectangle.corners, self.rectangle.corners)
+        for corner, expected in zip(self.diamond.corners,
+                                    [(0, -math.sqrt(2)), (math.sqrt(2), 0),
+                                     (0, math.sqrt(2)), (-math.sqrt(2), 0)]):
+            self.assertAlmostEqual(corner[0], expected[0])
+            self.assertAlmostEqual(corner[1], expected[1])
+
+    def test_projection_radius(self):
+        half_extents = (self.rectangle.half_width, self.rectangle.half_height)
+        self.assertAlmostEqual(shapes_2d.get_projection_radius(
+            shapes_2d.X_AND_Y_AXES[0], self.rectangle.axes, half_extents), 1)
+        self.assertAlmostEqual(shapes_2d.get_projection_radius(
+            shapes_2d.X_AND_Y_AXES[1], self.rectangle.axes, half_extents), 2)
+        self.assertAlmostEqual(shapes_2d.get_projection_radius(
+            shapes_2d.X_AND_Y_AXES[0], self.diamond.axes, (1, 1)),
+            math.sqrt(2))
+
+    def test_bounding_box(self):
+        bounding_box = self.rectangle.get_bounding_box()
+        for value, expected in zip(bounding_box[0] + bounding_box[1],
+                                   (0, 0, 2, 4)):
+            self.assertAlmostEqual(value, expected)
+        self.assertAlmostEqual(self.diamond.get_bounding_box()[1][0],
+                               math.sqrt(2))
+
+    def test_translated(self):
+        translated = self.rectangle.translated((1, -2))
+        self.assertEqual(translated.center, (2, 0))
+        self.assertEqual(translated.angle, self.rectangle.angle)
+
+
+class TestPoint(unittest.TestCase):
+    """
+    Tests for the class Point
+    """
+
+    def test_point(self):
+        point = shapes_2d.Point((2, -1))
+        self.assertEqual(point.area, 0)
+        self.assertEqual(point.center, (2, -1))
+        self.assertEqual(point.get_bounding_box(), ((2, -1), (2, -1)))
+
+
+class TestCompositeShape(unittest.TestCase):
+    """
+    Tests for the class CompositeShape
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        self.shapes = [shapes_2d.Rectangle((i * 2, 0), 1, 0.5)
+                       for i in range(5)] + [shapes_2d.Circle((4, 3), 1)]
+        self.compound = shapes_2d.CompositeShape(self.shapes)
+
+    def get_leaves(self, node):
+        if node.is_leaf:
+            return [node.shape]
+        return self.get_leaves(node.left) + self.get_leaves(node.right)
+
+    def assert_boxes_are_nested(self, node):
+        if node.is_leaf:
+            self.assertEqual(node.box, node.shape.get_bounding_box())
+            return
+        for child in (node.left, node.right):
+            self.assertTrue(node.box[0][0] <= child.box[0][0] and
+                            node.box[0][1] <= child.box[0][1] and
+                            child.box[1][0] <= node.box[1][0] and
+                            child.box[1][1] <= node.box[1][1])
+            self.assert_boxes_are_nested(child)
+
+    def test_bounding_box(self):
+        self.assertEqual(self.compound.get_bounding_box(),
+                         ((-1, -0.5), (9, 4)))
+
+    def test_bounding_volume_tree(self):
+        tree = self.compound.get_bounding_volume_tree()
+
+        self.assertIs(self.compound.get_bounding_volume_tree(), tree)
+        self.assertEqual(tree.box, self.compound.get_bounding_box())
+        self.assertEqual(set(map(id, self.get_leaves(tree))),
+                         set(map(id, self.shapes)))
+        self.assert_boxes_are_nested(tree)
+
+    def test_translated(self):
+        translated = self.compound.translated((1, -2))
+        self.assertEqual(translated.get_bounding_box(), ((0, -2.5), (10, 2)))
+        self.assertEqual(translated.shapes[5].radius, 1)
+        self.assertEqual(self.shapes[0].center, (0, 0))
+
+    def test_empty_compound_has_no_tree(self):
+        self.assertIsNone(
+            shapes_2d.CompositeShape([]).get_bounding_volume_tree())
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,92 @@
+"""
+Unit tests for the shape_store module
+"""
+
+import importlib.util
+import random
+import unittest
+from src import car, shapes_2d, overlaps_detection
+
+if importlib.util.find_spec("numpy") is not None:
+    import numpy
+    from src import shape_store
+
+
+@unittest.skipIf(importlib.util.find_spec("numpy") is None,
+                 "NumPy is not installed")
+class TestShapeStore(unittest.TestCase):
+    """
+    Tests for the class ShapeStore
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        self.cars = [
+            car.Car("a", [shapes_2d.Rectangle((0, 0), 1, 1),
+                          shapes_2d.Circle((1.5, 0), 1)]),
+            car.Car("b", [shapes_2d.Circle((3.2, 0), 1)]),
+            car.Car("c", [shapes_2d.Rectangle((2, 3), 1, 1)]),
+            car.Car("d", [])]
+        self.store = shape_store.ShapeStore.from_cars(self.cars)
+
+    def test_columns(self):
+        self.assertEqual(self.store.number_of_cars, 4)
+        self.assertEqual(self.store.circle_centers.tolist(),
+                         [[1.5, 0], [3.2, 0]])
+        self.assertEqual(self.store.circle_cars.tolist(), [0, 1])
+        self.assertEqual(self.store.rectangle_half_extents.tolist(),
+                         [[1, 1], [1, 1]])
+        self.assertEqual(self.store.rectangle_cars.tolist(), [0, 2])
+
+    def test_unsupported_shape(self):
+        with self.assertRaises(TypeError):
+            shape_store.ShapeStore.from_cars(
+                [car.Car("x", [shapes_2d.CompositeShape([])])])
+
+    def test_kernels(self):
+        self.assertEqual(self.store.do_circles_overlap([0], [1]).tolist(),
+                         [True])
+        # The rectangles share one edge: no overlap
+        self.assertEqual(self.store.do_rectangles_overlap([0], [1]).tolist(),
+                         [False])
+        self.assertEqual(
+            self.store.do_circles_overlap_rectangles([0, 1, 1],
+                                                     [0, 0, 1]).tolist(),
+            [True, False, False])
+
+    def test_do_these_cars_collide(self):
+        collide = self.store.do_these_cars_collide([0, 0, 1, 1, 0],
+                                                   [1, 2, 2, 3, 3])
+        self.assertEqual(collide.tolist(), [True, False, False, False, False])
+
+    def test_same_results_as_overlapping_shapes_detector(self):
+        random_generator = random.Random(13)
+        cars = []
+        for car_index in range(80):
+            shapes = []
+            for _ in range(random_generator.randint(1, 4)):
+                center = (random_generator.uniform(0, 30),
+                          random_generator.uniform(0, 30))
+                if random_generator.random() < 0.5:
+                    shapes.append(shapes_2d.Circle(
+                        center, random_generator.uniform(0.2, 2)))
+                else:
+                    shapes.append(shapes_2d.Rectangle(
+                        center, random_generator.uniform(0.2, 2),
+                        random_generator.uniform(0.2, 2)))
+            cars.append(car.Car(str(car_index), shapes))
+
+        first_cars, second_cars = numpy.triu_indices(len(cars), 1)
+        collide = shape_store.ShapeStore.from_cars(cars).\
+            do_these_cars_collide(first_cars, second_cars)
+
+        expected = [overlaps_detection.do_these_cars_collide(cars[i], cars[j])
+                    for i, j in zip(first_cars, second_cars)]
+        self.assertEqual(collide.tolist(), expected)
+        self.assertTrue(any(expected))
+
+
+if __name__ == "__main__":
+    unittest.main()
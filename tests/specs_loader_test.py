@@ -0,0 +1,144 @@
+"""
+Unit tests for the specs_loader module
+"""
+
+import os
+import tempfile
+import unittest
+from src import shapes_2d, specs_loader
+
+
+class TestSpecsLoader(unittest.TestCase):
+    """
+    Tests for the streaming cars specifications loader
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write_file(self, file_name, content):
+        path = os.path.join(self.directory.name, file_name)
+        with open(path, "w", encoding="utf-8") as specs_file:
+            specs_file.write(content)
+        return path
+
+    def test_json_lines(self):
+        path = self.write_file("cars.jsonl", (
+            '{"name": "Fiat", "shapes": [{"type": "rectangle", '
+            '"center": [2, 2], "half_width": 1, "half_height": 1}, '
+            '{"type": "Circle", "center": [0, 0], "radius": 1}]}\n'
+            '\n'
+            '{"name": "Maserati", "shapes": []}\n'))
+        cars = list(specs_loader.iter_cars(path))
+
+        self.assertEqual([a_car.name for a_car in cars], ["Fiat", "Maserati"])
+        self.assertEqual(cars[0].bounding_box, ((-1, -1), (3, 3)))
+        self.assertEqual(cars[1].shapes, ())
+
+    def test_csv(self):
+        path = self.write_file("cars.csv", (
+            ",".join(specs_loader.CSV_COLUMNS) + "\n"
+            "Fiat,rectangle,2,2,,1,1\n"
+            "Fiat,circle,0,0,1,,\n"
+            "Maserati,circle,10,0,2,,\n"))
+        cars = list(specs_loader.iter_cars(path))
+
+        self.assertEqual([len(a_car.shapes) for a_car in cars], [2, 1])
+        self.assertEqual(cars[1].bounding_box, ((8, -2), (12, 2)))
+
+    def test_oriented_rectangles(self):
+        path = self.write_file("cars.jsonl", (
+            '{"name": "Fiat", "shapes": [{"type": "oriented_rectangle", '
+            '"center": [4, 2], "half_width": 1, "half_height": 0.5, '
+            '"angle": 0.3}]}\n'))
+        shape = list(specs_loader.iter_cars(path))[0].shapes[0]
+        self.assertIsInstance(shape, shapes_2d.OrientedRectangle)
+        self.assertEqual((shape.center, shape.half_width, shape.half_height,
+                          shape.angle), ((4, 2), 1, 0.5, 0.3))
+
+        path = self.write_file("cars.csv", (
+            ",".join(specs_loader.CSV_COLUMNS) + ",angle\n"
+            "Fiat,oriented_rectangle,4,2,,1,0.5,0.3\n"
+            "Fiat,circle,0,0,1,,,\n"))
+        cars = list(specs_loader.iter_cars(path))
+        self.assertEqual(cars[0].shapes[0].angle, 0.3)
+        self.assertEqual(len(cars[0].shapes), 2)
+
+        path = self.write_file("cars.csv", (
+            ",".join(specs_loader.CSV_COLUMNS) + "\n"
+            "Fiat,oriented_rectangle,4,2,,1,0.5\n"))
+        with self.assertRaises(specs_loader.CarSpecsError) as context:
+            list(specs_loader.iter_cars(path))
+        self.assertIn("angle", context.exception.message)
+
+    def test_batches(self):
+        path = self.write_file("cars.jsonl", "".join(
+            '{"name": "car_%d", "shapes": [{"type": "circle", '
+            '"center": [%d, 0], "radius": 1}]}\n' % (i, 3 * i)
+            for i in range(7)))
+        batches = list(specs_loader.iter_car_batches(path, batch_size=3))
+
+        self.assertEqual([len(batch) for batch in batches], [3, 3, 1])
+        self.assertEqual(batches[2][0].name, "car_6")
+
+    def test_errors_report_line_numbers(self):
+        invalid_json_lines = [
+            ('{"name": "a", "shapes": [{"type": "triangle", '
+             '"center": [0, 0]}]}', "unknown shape type"),
+            ('{"name": "a", "shapes": [{"type": "circle", '
+             '"center": [0, 0], "radius": -1}]}', "positive radius"),
+            ('{"name": "a", "shapes": [{"type": "circle", '
+             '"center": [0], "radius": 1}]}', "center"),
+            ('{"shapes": []}', "missing car name"),
+            ('{"name": "a", "shapes": [', "Expecting")]
+        for line, message in invalid_json_lines:
+            path = self.write_file("cars.jsonl", '{"name": "ok", "shapes": []}'
+                                   '\n' + line + '\n')
+            with self.assertRaises(specs_loader.CarSpecsError) as context:
+                list(specs_loader.iter_cars(path))
+            self.assertEqual(context.exception.line_number, 2)
+            self.assertIn(message, context.exception.message)
+            self.assertTrue(str(context.exception).startswith(path + ":2: "))
+
+    def test_csv_errors(self):
+        path = self.write_file("cars.csv", "name,type\n")
+        with self.assertRaises(specs_loader.CarSpecsError) as context:
+            list(specs_loader.iter_cars(path))
+        self.assertEqual(context.exception.line_number, 1)
+
+        path = self.write_file("cars.csv", (
+            ",".join(specs_loader.CSV_COLUMNS) + "\n"
+            "Fiat,circle,0,0,1,,\n"
+            "Fiat,rectangle,2,x,,1,1\n"))
+        cars = specs_loader.iter_cars(path)
+        with self.assertRaises(specs_loader.CarSpecsError) as context:
+            list(cars)
+        self.assertEqual(context.exception.line_number, 3)
+        self.assertIn("center_y", context.exception.message)
+
+    def test_unknown_format(self):
+        path = self.write_file("cars.txt",
+                               ",".join(specs_loader.CSV_COLUMNS) + "\n")
+        with self.assertRaises(ValueError):
+            specs_loader.iter_cars(path)
+        self.assertEqual(list(specs_loader.iter_cars(path, "csv")), [])
+
+    def test_errors_raised_on_call(self):
+        path = self.write_file("cars.jsonl", "")
+        with self.assertRaises(ValueError):
+            specs_loader.iter_car_batches(path, batch_size=0)
+        with self.assertRaises(ValueError):
+            specs_loader.iter_car_batches(path, file_format="xml")
+        missing_path = os.path.join(self.directory.name, "missing.jsonl")
+        with self.assertRaises(FileNotFoundError):
+            specs_loader.iter_cars(missing_path)
+        with self.assertRaises(FileNotFoundError):
+            specs_loader.iter_car_batches(missing_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
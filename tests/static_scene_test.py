@@ -0,0 +1,75 @@
+"""
+Unit tests for the static_scene module
+"""
+
+import random
+import unittest
+import assignment_app
+from src import car, shapes_2d, collision_stats, static_scene
+
+
+class TestStaticScene(unittest.TestCase):
+    """
+    Tests for the class StaticScene
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        random_generator = random.Random(29)
+        walls_specs = [("wall_" + str(i), ("rectangle", ((10 * i, 0), 5, 0.5)))
+                       for i in range(10)]
+        pillars_specs = [
+            ("pillar_" + str(i),
+             ("circle", ((random_generator.uniform(0, 100),
+                          random_generator.uniform(0, 20)), 0.5)))
+            for i in range(40)]
+        self.scene = assignment_app.make_static_scene(walls_specs +
+                                                      pillars_specs)
+        self.dynamic_cars = [
+            car.Car("car_" + str(i), [shapes_2d.Rectangle(
+                (random_generator.uniform(0, 100),
+                 random_generator.uniform(0, 20)), 2, 1)])
+            for i in range(60)]
+
+    def test_scene_is_immutable(self):
+        self.assertEqual(len(self.scene), 50)
+        self.assertIsInstance(self.scene.cars, tuple)
+
+    def test_query_bounding_box(self):
+        self.assertEqual([a_car.name for a_car in
+                          self.scene.query_bounding_box(((14, -1), (16, 0)))],
+                         ["wall_1", "wall_2"])
+
+    def test_same_pairs_as_get_intersections(self):
+        all_cars = list(self.scene.cars) + self.dynamic_cars
+        expected = set(
+            (first.name, second.name) for first, second in
+            assignment_app.get_intersections(all_cars)
+            if not (first in self.scene.cars and second in self.scene.cars))
+
+        # get_intersections reports the static car first, as it comes first
+        # in all_cars
+        pairs = self.scene.get_intersections(self.dynamic_cars)
+        self.assertEqual(set((second.name, first.name)
+                             if second in self.scene.cars
+                             else (first.name, second.name)
+                             for first, second in pairs), expected)
+        self.assertEqual(len(pairs), len(expected))
+        self.assertTrue(any(second in self.scene.cars
+                            for _, second in pairs))
+
+    def test_static_cars_are_not_tested_against_each_other(self):
+        stats = collision_stats.CollisionStats()
+        with collision_stats.collect(stats):
+            self.assertEqual(self.scene.get_intersections([]), [])
+        self.assertEqual(stats.car_pairs, 0)
+
+    def test_empty_scene(self):
+        scene = static_scene.StaticScene([])
+        self.assertEqual(scene.get_colliding_cars(self.dynamic_cars[0]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Unit tests for the tiling module
+"""
+
+import os
+import tempfile
+import unittest
+import assignment_app
+from src import car, shapes_2d, tiling
+from benchmarks import benchmark
+
+
+class TestPartition(unittest.TestCase):
+    """
+    Tests for the function partition
+    """
+
+    def test_halo(self):
+        self.assertEqual(tiling.get_halo([((0, 0), (1, 3)),
+                                          ((5, 5), (7, 6))]), 3)
+        self.assertEqual(tiling.get_halo([]), 0)
+
+    def test_cars_of_the_halo_are_shared(self):
+        # Min corners at x = 0, 5.5 and 10; tiles of size 5 along x, halo 2
+        boxes = [((0, 0), (2, 2)), ((5.5, 0), (7, 1)), ((10, 0), (11, 1))]
+        self.assertEqual(tiling.partition(boxes, 2),
+                         [[0], [1, 2], [], []])
+        boxes[1] = ((4, 0), (5.5, 1))
+        self.assertEqual(tiling.partition(boxes, 2),
+                         [[0, 1], [1, 2], [], []])
+
+    def test_cars_without_shapes(self):
+        boxes = [((0, 0), (2, 2)), car.Car("empty", []).bounding_box,
+                 ((10, 0), (11, 1))]
+        self.assertEqual(tiling.get_halo(boxes), 2)
+        self.assertEqual(tiling.partition(boxes, 2), [[0], [2], [], []])
+        self.assertEqual(tiling.partition(boxes[1:2], 2), [[], [], [], []])
+
+    def test_invalid_number_of_tiles(self):
+        self.assertRaises(ValueError, tiling.partition, [], 0)
+
+
+class TestTiledIntersections(unittest.TestCase):
+    """
+    Tests for the tiled collision detection run as subprocesses
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        self.cars = assignment_app.make_cars(
+            benchmark.generate_scene_specs(300, density=0.1, seed=24))
+
+    def test_same_pairs_as_single_process(self):
+        expected = assignment_app.get_intersections(self.cars)
+        for tiles_per_side in (1, 3, 5):
+            self.assertEqual(assignment_app.get_tiled_intersections(
+                self.cars, tiles_per_side, processes=4, verify=True),
+                expected)
+
+    def test_oriented_rectangles(self):
+        cars = assignment_app.make_cars([
+            ("Fiat", ("oriented_rectangle", ((0, 0), 3, 1, 0.8))),
+            ("Ferrari", ("oriented_rectangle", ((3, 3), 1, 1, 0.2)),
+             ("circle", ((30, 0), 1))),
+            ("Maserati", ("circle", ((31, 1), 1)))])
+        self.assertEqual(assignment_app.get_tiled_intersections(
+            cars, 2, processes=2, verify=True),
+            [(cars[0], cars[1]), (cars[1], cars[2])])
+
+    def test_car_without_shapes(self):
+        cars = self.cars[:50] + [car.Car("empty", [])] + self.cars[50:]
+        self.assertEqual(assignment_app.get_tiled_intersections(
+            cars, 3, processes=4, verify=True),
+            assignment_app.get_intersections(cars))
+
+    def test_jobs_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            pairs = tiling.find_colliding_pairs(self.cars, 2, directory,
+                                                processes=2)
+            self.assertTrue(os.path.exists(os.path.join(directory,
+                                                        "tile_0.pairs")))
+            merged = set()
+            for tile_index in range(4):
+                merged.update(tiling.read_tile_pairs(directory, tile_index))
+        self.assertEqual(sorted(merged), pairs)
+
+    def test_failing_job(self):
+        cars = [car.Car("a", [shapes_2d.Circle((0, 0), 1)]),
+                car.Car("b", [shapes_2d.Circle((1, 0), 1)])]
+        with tempfile.TemporaryDirectory() as directory:
+            tiling.write_tile(directory, 0, cars, [0, 1])
+            with open(os.path.join(directory, "tile_0.snapshot"),
+                      "wb") as snapshot_file:
+                snapshot_file.write(b"garbage")
+            with self.assertRaises(RuntimeError):
+                tiling._run_jobs(directory, [0], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+Unit tests for the union_find module
+"""
+
+import random
+import unittest
+from src import union_find
+
+
+class TestUnionFind(unittest.TestCase):
+    """
+    Tests for the class UnionFind
+    """
+
+    def setUp(self):
+        """
+        Define a fixture for the tests
+        """
+        self.sets = union_find.UnionFind(7)
+        for first_index, second_index in ((0, 3), (5, 6), (3, 4), (4, 0)):
+            self.sets.union(first_index, second_index)
+
+    def test_find_and_union(self):
+        self.assertEqual(self.sets.find(3), self.sets.find(4))
+        self.assertNotEqual(self.sets.find(0), self.sets.find(5))
+        self.assertFalse(self.sets.union(0, 4))
+        self.assertTrue(self.sets.union(1, 2))
+        self.assertEqual(self.sets.number_of_sets, 3)
+        self.assertEqual(self.sets.get_size(4), 3)
+
+    def test_groups(self):
+        self.assertEqual(self.sets.get_groups(),
+                         [[0, 3, 4], [1], [2], [5, 6]])
+        self.assertEqual(self.sets.get_groups(min_size=2),
+                         [[0, 3, 4], [5, 6]])
+        self.assertEqual(union_find.UnionFind(0).get_groups(), [])
+
+    def test_same_groups_as_graph_search(self):
+        random_generator = random.Random(22)
+        number_of_items = 300
+        pairs = [(random_generator.randrange(number_of_items),
+                  random_generator.randrange(number_of_items))
+                 for _ in range(200)]
+        sets = union_find.UnionFind(number_of_items)
+        for pair in pairs:
+            sets.union(*pair)
+
+        neighbours = {index: set() for index in range(number_of_items)}
+        for first_index, second_index in pairs:
+            neighbours[first_index].add(second_index)
+            neighbours[second_index].add(first_index)
+        groups = []
+        visited = set()
+        for index in range(number_of_items):
+            if index in visited:
+                continue
+            group = []
+            stack = [index]
+            visited.add(index)
+            while stack:
+                current = stack.pop()
+                group.append(current)
+                for neighbour in neighbours[current] - visited:
+                    visited.add(neighbour)
+                    stack.append(neighbour)
+            groups.append(sorted(group))
+
+        self.assertEqual(sets.get_groups(), groups)
+        self.assertEqual(sets.number_of_sets, len(groups))
+
+
+if __name__ == "__main__":
+    unittest.main()